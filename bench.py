@@ -0,0 +1,173 @@
+"""
+Runs the benchmarks.py workloads of every lab and compares runs.
+
+    python bench.py run [--seed 15] [--repeat 3] [--metrics] [--memory] [--output results.json] [lfa2 lfa6 ...]
+    python bench.py compare old.json new.json [--threshold 0.1]
+
+Each lab imports its modules by bare name, so every lab runs in its own
+process from its own directory. A workload is a function of a seeded
+random.Random that prepares its input and returns the function to time; that
+function returns the amounts of work it did, the first one giving the rate.
+The best of the repeats is kept. An implementation is compared with the one
+it replaced by timing both as workloads of the same run; workloads made by
+the same factory function get the same random input. With --metrics, the
+metrics registry of each lab is saved along with its results, and with
+--memory the peak memory traced during one more, untimed call.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def lab_directories(labs):
+    directories = sorted(os.path.dirname(path) for path in glob.glob(os.path.join(ROOT, 'lfa*', 'public', 'benchmarks.py')))
+    if labs:
+        directories = [directory for directory in directories if directory.split(os.sep)[-2] in labs]
+    return directories
+
+
+def run_lab(seed, repeat, with_metrics, with_memory):
+    """Runs the workloads of the lab in the current directory and prints their results as JSON."""
+    sys.path.insert(0, os.getcwd())
+    import metrics
+
+    # Before the workloads import the lab modules, so that the functions
+    # they import by name are the instrumented ones
+    if with_metrics:
+        metrics.enable()
+    import benchmarks
+
+    results = {}
+    for name, workload in benchmarks.WORKLOADS.items():
+        function = workload(random.Random(f'{seed}:{workload.__qualname__}'))
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            amounts = function()
+            seconds = time.perf_counter() - started
+            best = seconds if best is None else min(best, seconds)
+        unit, amount = next(iter(amounts.items()))
+        results[name] = {'seconds': best, 'rate': amount / best if best else None, 'unit': f'{unit}/s',
+                         'amounts': amounts}
+        if with_memory:
+            tracemalloc.start()
+            function()
+            results[name]['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    json.dump({'results': results, 'metrics': metrics.snapshot()}, sys.stdout)
+
+
+def run(args):
+    report = {
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': {},
+    }
+    if args.metrics:
+        report['metrics'] = {}
+    for directory in lab_directories(args.labs):
+        lab = directory.split(os.sep)[-2]
+        print(f'{lab}...', file=sys.stderr)
+        command = [sys.executable, os.path.abspath(__file__), 'lab', '--seed', str(args.seed),
+                   '--repeat', str(args.repeat)]
+        if args.metrics:
+            command.append('--metrics')
+        if args.memory:
+            command.append('--memory')
+        output = json.loads(subprocess.run(command, cwd=directory, check=True, stdout=subprocess.PIPE,
+                                           text=True).stdout)
+        if args.metrics:
+            report['metrics'][lab] = output['metrics']
+        for name, result in output['results'].items():
+            report['results'][f'{lab}.{name}'] = result
+            memory = f' {result["peak_bytes"] / 2 ** 20:>9.1f} MB' if 'peak_bytes' in result else ''
+            print(f'{lab + "." + name:<32} {result["seconds"]:>9.4f} s {result["rate"]:>14.0f} {result["unit"]}'
+                  f'{memory}', file=sys.stderr)
+
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+
+
+def compare(args):
+    """Prints the change of every benchmark; exits with 1 if any got slower than the threshold allows."""
+    with open(args.old) as file:
+        old = json.load(file)
+    with open(args.new) as file:
+        new = json.load(file)
+    if old['seed'] != new['seed']:
+        print(f'warning: seeds differ ({old["seed"]} and {new["seed"]}), workloads are not the same')
+
+    regressions = 0
+    for name in sorted(old['results'].keys() | new['results'].keys()):
+        if name not in new['results']:
+            print(f'{name:<32} removed')
+            continue
+        if name not in old['results']:
+            print(f'{name:<32} new')
+            continue
+        before, after = old['results'][name], new['results'][name]
+        change = after['seconds'] / before['seconds'] - 1
+        flags = []
+        if change > args.threshold:
+            flags.append('REGRESSION')
+            regressions += 1
+        elif change < -args.threshold:
+            flags.append('faster')
+        if before.get('peak_bytes') and 'peak_bytes' in after:
+            flags.append(f'memory {after["peak_bytes"] / before["peak_bytes"] - 1:+.1%}')
+        if before['amounts'] != after['amounts']:
+            flags.append(f'output changed: {before["amounts"]} -> {after["amounts"]}')
+        print(f'{name:<32} {before["seconds"]:>9.4f} s {after["seconds"]:>9.4f} s {change:>+8.1%} {" ".join(flags)}')
+
+    if regressions:
+        print(f'{regressions} regression(s) above {args.threshold:.0%}')
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks of every lab.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks and save the results as JSON')
+    run_parser.add_argument('labs', nargs='*', help='labs to run, all by default')
+    run_parser.add_argument('--seed', type=int, default=15)
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--metrics', action='store_true', help='also record the metrics registry')
+    run_parser.add_argument('--memory', action='store_true', help='also record the peak memory of every workload')
+    run_parser.add_argument('--output', default='results.json')
+
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='relative slowdown reported as a regression (default 0.1)')
+
+    # Used by run, inside the directory of a lab
+    lab_parser = commands.add_parser('lab')
+    lab_parser.add_argument('--seed', type=int, required=True)
+    lab_parser.add_argument('--repeat', type=int, required=True)
+    lab_parser.add_argument('--metrics', action='store_true')
+    lab_parser.add_argument('--memory', action='store_true')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args)
+    elif args.command == 'compare':
+        compare(args)
+    else:
+        run_lab(args.seed, args.repeat, args.metrics, args.memory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Graph algorithms shared by the labs."""
+
+
+def strongly_connected_components(successors):
+    """
+    Strongly connected components of the graph {node: successor nodes}, by
+    Tarjan's algorithm without recursion. Components come in reverse
+    topological order: every component comes after all the components it
+    leads to. Successors missing from the graph are nodes without edges.
+    """
+    index_of = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+
+    for root in successors:
+        if root in index_of:
+            continue
+        index_of[root] = low[root] = len(index_of)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors[root]))]
+        while work:
+            node, pending = work[-1]
+            for successor in pending:
+                if successor not in index_of:
+                    index_of[successor] = low[successor] = len(index_of)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(successors.get(successor, ()))))
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], index_of[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
@@ -13,6 +13,8 @@
 
 import random
 
+import metrics
+
 class Grammar:
     def __init__(self):
         self.nonterminal = {'S', 'A', 'B'}
@@ -67,6 +69,7 @@ class FiniteAutomaton:
         self.initial_state = initial_state
         self.final_states = set(final_states)
 
+    @metrics.instrumented(symbols=lambda result, self, input_string: len(input_string))
     def string_belong_to_language(self, input_string):
         # Start from initial state
         current_state = self.initial_state
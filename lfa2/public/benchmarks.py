@@ -0,0 +1,187 @@
+"""Workloads of this lab for the benchmark runner at the root of the repository."""
+import io
+import re
+
+from fixtures import random_dfa
+from main import FiniteAutomaton, Grammar, NFAtoDFAConverter, classify_many, write_dot, write_json
+from multimatcher import MultiMatcher
+from search import Searcher
+from thompson import regex_to_nfa
+
+NON_TERMINALS = 'SABCDEFGH'
+TERMINALS = 'abcd'
+DIGITS = '0123456789'
+
+
+def dfa_match(rng):
+    fa = random_dfa(50, rng)
+    words = [''.join(rng.choice('ab') for _ in range(20)) for _ in range(20000)]
+
+    def run():
+        accepted = sum(map(fa.string_belong_to_language, words))
+        return {'words': len(words), 'accepted': accepted}
+
+    return run
+
+
+def subset_construction(n):
+    def workload(rng):
+        nfa = regex_to_nfa('(a|b)*a' + '(a|b)' * n)
+
+        def run():
+            converter = NFAtoDFAConverter(nfa)
+            return {'dfa_states': len(converter.states), 'nfa_states': len(nfa.states)}
+
+        return run
+
+    return workload
+
+
+class SearchingConverter(NFAtoDFAConverter):
+    """Converter searching the ε-moves again for every closure, as before the cache."""
+
+    def epsilon_closure(self, states):
+        return self.nfa.epsilon_closure(states)
+
+
+def closure(converter):
+    def workload(rng):
+        nfas = [regex_to_nfa('(a|b)*a' + '(a|b)' * 7), regex_to_nfa('(a*|b*|c)*' * 20 + 'c')]
+
+        def run():
+            states = [len(converter(nfa).states) for nfa in nfas]
+            return {'dfa_states': sum(states), 'nfa_states': sum(len(nfa.states) for nfa in nfas)}
+
+        return run
+
+    return workload
+
+
+def random_grammar(rng):
+    """Random grammar, mostly regular, sometimes context-free or worse."""
+    non_terminals = list(NON_TERMINALS[:rng.randint(2, len(NON_TERMINALS))])
+    rules = {}
+    for left in non_terminals:
+        rights = []
+        for _ in range(rng.randint(1, 6)):
+            kind = rng.random()
+            if kind < 0.8:
+                rights.append(rng.choice(TERMINALS) * rng.randint(1, 3) + rng.choice(non_terminals))
+            elif kind < 0.9:
+                rights.append(rng.choice(TERMINALS))
+            else:
+                rights.append(''.join(rng.choice(TERMINALS + ''.join(non_terminals)) for _ in range(4)))
+        rules[left] = rights
+    if rng.random() < 0.05:
+        rules[rng.choice(TERMINALS) + non_terminals[1]] = [rng.choice(TERMINALS)]
+    return Grammar(non_terminals, list(TERMINALS), rules, 'S', [])
+
+
+def classify(processes):
+    def workload(rng):
+        grammars = [random_grammar(rng) for _ in range(20000)]
+
+        def run():
+            results = classify_many(grammars, processes=processes, chunksize=1024)
+            return {'grammars': len(grammars), 'regular': sum(1 for result in results if result.type == 3)}
+
+        return run
+
+    return workload
+
+
+def export(write):
+    def workload(rng):
+        fa = random_dfa(10000, rng, 'abcd', shared=0.5)
+
+        def run():
+            file = io.StringIO()
+            write(fa, file)
+            return {'states': len(fa.states), 'characters': len(file.getvalue())}
+
+        return run
+
+    return workload
+
+
+def random_pattern(size, rng):
+    """Random partial DFA over abc; about a third of the transitions are missing."""
+    states = [f'q{i}' for i in range(size)]
+    transitions = {state: {symbol: rng.choice(states) for symbol in 'abc' if rng.random() < 0.7}
+                   for state in states}
+    return FiniteAutomaton(states, 'abc', transitions, states[0], set(rng.sample(states, 2)))
+
+
+def multimatch(one_by_one):
+    def workload(rng):
+        patterns = [random_pattern(5, rng) for _ in range(100)]
+        words = [''.join(rng.choice('abc') for _ in range(rng.randint(1, 8))) for _ in range(2000)]
+
+        def run():
+            if one_by_one:
+                matches = [[i for i, fa in enumerate(patterns) if fa.string_belong_to_language(word)]
+                           for word in words]
+            else:
+                matcher = MultiMatcher(patterns)
+                matches = [matcher.matches(word) for word in words]
+            return {'words': len(words), 'matches': sum(map(len, matches))}
+
+        return run
+
+    return workload
+
+
+def error_code():
+    """Automaton for ERROR followed by digits, as in 'ERROR 4041'."""
+    word = 'ERROR '
+    transitions = {i: {char: i + 1} for i, char in enumerate(word)}
+    transitions[len(word)] = {digit: len(word) + 1 for digit in DIGITS}
+    transitions[len(word) + 1] = {digit: len(word) + 1 for digit in DIGITS}
+    return FiniteAutomaton(range(len(word) + 2), set(word) | set(DIGITS), transitions, 0, {len(word) + 1})
+
+
+def random_log(lines, rng):
+    levels = ['INFO', 'INFO', 'INFO', 'DEBUG', 'WARN', 'ERROR']
+    messages = ['request served', 'cache miss', 'retrying connection', 'user logged in', 'queue drained']
+    return ''.join(f'{rng.randint(0, 10 ** 9):>10} {rng.choice(levels)} {rng.randint(0, 9999)} '
+                   f'{rng.choice(messages)}\n' for _ in range(lines))
+
+
+def search(method):
+    """Finds the error codes of a log with the literal prefix filter, the DFAs only, or re."""
+    def workload(rng):
+        text = random_log(20000, rng)
+        searcher = Searcher(error_code())
+        if method == 'dfa':
+            searcher.prefix = ''
+
+        def run():
+            if method == 're':
+                spans = [match.span() for match in re.finditer('ERROR [0-9]+', text)]
+            else:
+                spans = list(searcher.finditer(text))
+            return {'characters': len(text), 'matches': len(spans)}
+
+        return run
+
+    return workload
+
+
+# Instrumentation overhead is measured by comparing a run with --metrics to one without
+WORKLOADS = {
+    'dfa_match': dfa_match,
+    'subset_construction_4': subset_construction(4),
+    'subset_construction_8': subset_construction(8),
+    'subset_construction_11': subset_construction(11),
+    'closure': closure(NFAtoDFAConverter),
+    'closure_searching': closure(SearchingConverter),
+    'classify': classify(None),
+    'classify_4_processes': classify(4),
+    'write_dot': export(write_dot),
+    'write_json': export(write_json),
+    'multimatch': multimatch(False),
+    'multimatch_one_by_one': multimatch(True),
+    'search': search('prefix'),
+    'search_dfa': search('dfa'),
+    'search_re': search('re'),
+}
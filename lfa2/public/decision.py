@@ -0,0 +1,140 @@
+from collections import deque, namedtuple
+
+# holds: whether the property is true; counterexample: a string showing why not
+Decision = namedtuple('Decision', ['holds', 'counterexample'])
+
+
+def _word(parents, key):
+    """String spelled by the parent links leading to key."""
+    symbols = []
+    while parents[key] is not None:
+        key, symbol = parents[key]
+        symbols.append(symbol)
+    return ''.join(reversed(symbols))
+
+
+def _subset_view(fa):
+    """
+    (initial, step, is_final) of the automaton seen as a DFA. An NFA is
+    determinized lazily, one closed set of states at a time; a missing
+    transition leads to None.
+    """
+    if fa.is_deterministic():
+        return fa.initial_state, fa.step, fa.final_states.__contains__
+
+    def step(states, symbol):
+        next_states = set()
+        for state in states:
+            next_states.update(fa.transitions.targets(state, symbol))
+        return frozenset(fa.epsilon_closure(next_states)) if next_states else None
+
+    def is_final(states):
+        return not fa.final_states.isdisjoint(states)
+
+    return frozenset(fa.epsilon_closure({fa.initial_state})), step, is_final
+
+
+def equivalent(a, b):
+    """
+    Whether both automata accept the same language, by Hopcroft and Karp's
+    union-find algorithm. States of both sides are merged pair by pair from
+    the initial states, so only reachable pairs are visited; the first pair
+    that disagrees on acceptance gives a shortest counterexample.
+    """
+    a_initial, a_step, a_final = _subset_view(a)
+    b_initial, b_step, b_final = _subset_view(b)
+    alphabet = sorted(a.alphabet | b.alphabet)
+
+    parent = {}
+
+    def find(key):
+        root = key
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while key != root:
+            parent[key], key = root, parent[key]
+        return root
+
+    start = ((0, a_initial), (1, b_initial))
+    parents = {start: None}
+    queue = deque([start])
+    parent[find(start[1])] = find(start[0])
+    while queue:
+        pair = queue.popleft()
+        (_, p), (_, q) = pair
+        if (p is not None and a_final(p)) != (q is not None and b_final(q)):
+            return Decision(False, _word(parents, pair))
+        for symbol in alphabet:
+            next_pair = ((0, a_step(p, symbol) if p is not None else None),
+                         (1, b_step(q, symbol) if q is not None else None))
+            left, right = find(next_pair[0]), find(next_pair[1])
+            if left != right:
+                parent[right] = left
+                parents[next_pair] = (pair, symbol)
+                queue.append(next_pair)
+    return Decision(True, None)
+
+
+def is_empty(fa):
+    """
+    Whether the automaton accepts no string, by a breadth-first search over
+    its transitions; otherwise a shortest accepted string is given.
+    """
+    parents = {fa.initial_state: None}
+    queue = deque([fa.initial_state])
+    while queue:
+        state = queue.popleft()
+        if state in fa.final_states:
+            return Decision(False, _word(parents, state))
+        for symbol, targets in fa.transitions.get(state, {}).items():
+            for to_state in fa.transitions.as_set(targets):
+                if to_state not in parents:
+                    parents[to_state] = (state, symbol)
+                    queue.append(to_state)
+    return Decision(True, None)
+
+
+def is_subset(a, b):
+    """
+    Whether every string accepted by a is accepted by b, without
+    determinizing either automaton. Pairs (state of a, set of states of b)
+    are explored from the initial ones; a pair is skipped when another with
+    the same state of a and a subset of its states of b was already seen,
+    since that one fails whenever it would. Only a's own transitions are
+    followed.
+    """
+    b_initial = frozenset(b.epsilon_closure({b.initial_state}))
+    antichain = {}
+    parents = {}
+    queue = deque()
+
+    def visit(state, states, parent):
+        known = antichain.setdefault(state, [])
+        if any(seen <= states for seen in known):
+            return
+        known[:] = [seen for seen in known if not states <= seen]
+        known.append(states)
+        parents[(state, states)] = parent
+        queue.append((state, states))
+
+    for state in a.epsilon_closure({a.initial_state}):
+        visit(state, b_initial, None)
+
+    while queue:
+        pair = queue.popleft()
+        state, states = pair
+        # Dropped from the antichain since it was queued
+        if not any(seen is states for seen in antichain[state]):
+            continue
+        if state in a.final_states and b.final_states.isdisjoint(states):
+            return Decision(False, _word(parents, pair))
+        for symbol, targets in a.transitions.get(state, {}).items():
+            if symbol == '':
+                continue
+            next_states = set()
+            for b_state in states:
+                next_states.update(b.transitions.targets(b_state, symbol))
+            next_states = frozenset(b.epsilon_closure(next_states))
+            for to_state in a.epsilon_closure(a.transitions.as_set(targets)):
+                visit(to_state, next_states, (pair, symbol))
+    return Decision(True, None)
@@ -0,0 +1,40 @@
+"""Automata shared by the tests and the benchmark workloads of this lab."""
+from main import FiniteAutomaton, TransitionTable
+
+
+def variant_nfa():
+    """Fresh copy of the variant 15 automaton, which the tests are free to change."""
+    transitions = {
+        'q0': {'a': {'q0', 'q1'}},
+        'q1': {'b': {'q2'}},
+        'q2': {'a': {'q2'}, 'b': {'q3'}, 'c': {'q0'}}
+    }
+    return FiniteAutomaton({'q0', 'q1', 'q2', 'q3'}, {'a', 'b', 'c'}, transitions, 'q0', {'q3'})
+
+
+def even_a():
+    """DFA for the words over {a, b} with an even number of a."""
+    return FiniteAutomaton({'e', 'o'}, 'ab', {'e': {'a': 'o', 'b': 'e'}, 'o': {'a': 'e', 'b': 'o'}}, 'e', {'e'})
+
+
+def random_dfa(size, rng, alphabet='ab', shared=0):
+    """
+    Random complete DFA with size // 10 final states. With probability shared,
+    a symbol leads to a target common to all the symbols of its state, which
+    gives parallel edges to merge.
+    """
+    states = [f'q{i}' for i in range(size)]
+    transitions = {}
+    for state in states:
+        common = rng.choice(states) if shared else None
+        transitions[state] = {symbol: common if shared and rng.random() < shared else rng.choice(states)
+                              for symbol in alphabet}
+    return FiniteAutomaton(states, alphabet, transitions, states[0], set(rng.sample(states, size // 10)))
+
+
+def nth_from_end(n):
+    """NFA for (a|b)* a (a|b)^n."""
+    transitions = TransitionTable({0: {'a': {0, 1}, 'b': {0}}})
+    for i in range(1, n + 1):
+        transitions[i] = {'a': {i + 1}, 'b': {i + 1}}
+    return FiniteAutomaton(range(n + 2), 'ab', transitions, 0, {n + 1})
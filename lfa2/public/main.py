@@ -10,14 +10,37 @@
 # δ(q2,c) = q0
 # }
 
+import json
 import random
-from graphviz import Digraph
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import metrics
+from graphs import strongly_connected_components
+
+GRAMMAR_TYPES = {
+    3: "Type 3 (Regular Grammar)",
+    2: "Type 2 (Context-Free Grammar)",
+    1: "Type 1 (Context-Sensitive Grammar)",
+    0: "Type 0 (Unrestricted Grammar)",
+}
+
+# A production that keeps the grammar out of the given Chomsky type
+Violation = namedtuple('Violation', ['type', 'left', 'right', 'reason'])
+
+
+class Classification(namedtuple('Classification', ['type', 'violations'])):
+    def __str__(self):
+        return GRAMMAR_TYPES[self.type]
+
 
 class Grammar:
     def __init__(self, non_terminals, terminals, productions, initial_state, final_states):
         self.nonterminal = non_terminals
         self.terminals = terminals
         self.production_rules = productions
+        self.start_symbol = initial_state
+        self.final_states = final_states
 
     def generate_string(self, start_symbol='S'):
         result = start_symbol
@@ -36,92 +59,182 @@ class Grammar:
         return result
 
     def to_finite_automaton(self):
-        # Empty string indicates the final state
-        states = {'S', 'A', 'B', ''}
-        alphabet = self.terminal
-        transitions = {}
-        initial_state = 'S'
-        # Represent empty string as final state (aka epsilon)
-        final_states = {''}
-
-        fa = FiniteAutomaton(states, alphabet, transitions, initial_state, final_states)
-        fa.add_transition('S', 'a', 'S')
-        fa.add_transition('S', 'b', 'S')
-        fa.add_transition('S', 'c', 'A')
-        fa.add_transition('A', 'a', 'B')
-        fa.add_transition('B', 'a', 'B')
-        fa.add_transition('B', 'b', 'B')
-        fa.add_transition('B', 'c', 'final')
+        """
+        NFA of a right-linear grammar. A -> aB becomes a transition from A to B
+        on a, A -> a a transition to the final state, A -> ε makes A final and
+        A -> abB goes through intermediate states. Nonterminal names may be
+        longer than one character, as in the grammars from to_grammar.
+        """
+        non_terminals = set(self.nonterminal)
+        final_state = 'final'
+        while final_state in non_terminals:
+            final_state += "'"
+        fa = FiniteAutomaton(non_terminals | {final_state}, self.terminals, {}, self.start_symbol, {final_state})
+
+        for left, rights in self.production_rules.items():
+            for right in rights:
+                if right == '':
+                    fa.add_final_state(left)
+                    continue
+                split = next((i for i in range(len(right) + 1) if right[i:] in non_terminals or i == len(right)))
+                word, target = right[:split], right[split:] or final_state
+                if any(symbol in non_terminals for symbol in word):
+                    raise ValueError(f"Production is not right-linear: {left} -> {right}")
+                if not word:
+                    fa.transitions.add(left, '', target)
+                    continue
+                state = left
+                for i, symbol in enumerate(word[:-1]):
+                    next_state = f"{left}->{right}.{i}"
+                    fa.states.add(next_state)
+                    fa.transitions.add(state, symbol, next_state)
+                    state = next_state
+                fa.transitions.add(state, word[-1], target)
 
         return fa
 
     def classify_grammar(self):
-        type1 = type2 = type3 = type0 = True
-
-        for left in self.production_rules:
+        """
+        Chomsky type of the grammar with every production that rules out a
+        higher type, in one pass over the productions. str() of the result is
+        the type name. A word of several terminals, as in A -> ab, keeps the
+        grammar regular, since to_finite_automaton reads it through
+        intermediate states.
+        """
+        non_terminals = frozenset(self.nonterminal)
+        terminals = frozenset(self.terminals)
+        violations = []
+        left_linear = right_linear = None
+
+        for left, rights in self.production_rules.items():
             if len(left) > 1:
-                type3 = False  # For structure like aAB -> a
-                type2 = False  # For structure like AB -> a
-
-            startedWithNonTerminal = False
-            endedWithNonTerminal = False
-
-            for right in self.production_rules[left]:
-                # If the production is non-empty and the right side is shorter than the left side, it's invalid.
-                if right != '' and len(right) < len(left):
-                    type1 = False
-                    print(f"Type 1 violation (shortened production): {left} -> {right}")
-
-                # If an empty production is found, it is only allowed for the start symbol (if defined).
-                if right == '' and left != self.start_symbol:
-                    type1 = False
-                    print(f"Empty production is only allowed for the start symbol: {left} -> {right}")
-
-                startsWithNonTerminal = right and right[0] in self.nonterminal
-                endsWithNonTerminal = right and right[-1] in self.nonterminal
-                nonTerminalCount = sum(1 for symbol in right if symbol in self.nonterminal)
+                violations.append(Violation(2, left, None, "more than one symbol on the left side"))
 
+            for right in rights:
                 if right == '':
+                    if left != self.start_symbol:
+                        violations.append(Violation(1, left, right, "empty production of a non-start symbol"))
                     continue
+                if len(right) < len(left):
+                    violations.append(Violation(1, left, right, "shortened production"))
+
+                count = 0
+                for symbol in right:
+                    if symbol in non_terminals:
+                        count += 1
 
                 if len(right) == 1:
-                    if right not in self.terminal:
-                        type3 = False  # For structure like A -> B
-                        print("Vn -> Vn")
-                elif not ((startsWithNonTerminal or endsWithNonTerminal) and nonTerminalCount == 1):
-                    type3 = False  # For structure like A -> aBa or A -> BaB
-                    print("Vn -> VnVn")
-
-                if startsWithNonTerminal:
-                    startedWithNonTerminal = True
-                elif endsWithNonTerminal:
-                    endedWithNonTerminal = True
-
-                if startedWithNonTerminal and endedWithNonTerminal:
-                    type3 = False  # For situations when A -> aB and A -> Ba
-                    print("Vn -> VnVt/VtVn")
-
-        if type3:
-            return "Type 3 (Regular Grammar)"
-        elif type2:
-            return "Type 2 (Context-Free Grammar)"
-        elif type1:
-            return "Type 1 (Context-Sensitive Grammar)"
+                    if right not in terminals:
+                        violations.append(Violation(3, left, right, "renaming or unknown symbol"))
+                elif count > 1:
+                    violations.append(Violation(3, left, right, "more than one non-terminal"))
+                elif count == 1:
+                    if right[0] in non_terminals:
+                        left_linear = left_linear or (left, right)
+                    elif right[-1] in non_terminals:
+                        right_linear = right_linear or (left, right)
+                    else:
+                        violations.append(Violation(3, left, right, "non-terminal in the middle"))
+
+        if left_linear and right_linear:
+            violations.append(Violation(3, right_linear[0], right_linear[1],
+                                        f"right-linear, while {left_linear[0]} -> {left_linear[1]} is left-linear"))
+
+        # A left side with several symbols rules out type 3 as well, an empty
+        # or shortened production only type 1
+        ruled_out = {violation.type for violation in violations}
+        if not ruled_out & {2, 3}:
+            grammar_type = 3
+        elif 2 not in ruled_out:
+            grammar_type = 2
+        elif 1 not in ruled_out:
+            grammar_type = 1
         else:
-            return "Type 0 (Unrestricted Grammar)"
+            grammar_type = 0
+        return Classification(grammar_type, violations)
+
+
+def _classify(grammar):
+    return grammar.classify_grammar()
+
+
+def classify_many(grammars, processes=None, chunksize=64):
+    """
+    classify_grammar for every grammar, in order. With processes > 1 the
+    grammars are classified in a process pool, chunksize at a time.
+    """
+    if not processes or processes == 1:
+        return [grammar.classify_grammar() for grammar in grammars]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_classify, grammars, chunksize=chunksize))
+
+
+class TransitionTable(dict):
+    """
+    Transitions as {from_state: {symbol: targets}}, where targets is a single
+    state (deterministic) or a set of states. The empty symbol is ε.
+    """
+
+    @staticmethod
+    def as_set(targets):
+        if isinstance(targets, (set, frozenset, list, tuple)):
+            return targets
+        return (targets,)
+
+    def targets(self, state, symbol):
+        """States reached from state on symbol, as a collection."""
+        state_transitions = self.get(state)
+        if state_transitions is None or symbol not in state_transitions:
+            return ()
+        return self.as_set(state_transitions[symbol])
+
+    def add(self, from_state, symbol, to_state):
+        """Adds a transition, keeping the other targets of the same symbol."""
+        state_transitions = self.setdefault(from_state, {})
+        targets = state_transitions.get(symbol)
+        if targets is None:
+            state_transitions[symbol] = {to_state}
+        elif isinstance(targets, set):
+            targets.add(to_state)
+        else:
+            state_transitions[symbol] = set(self.as_set(targets)) | {to_state}
+
+    def edges(self):
+        """Every (from_state, symbol, to_state) transition."""
+        for from_state, state_transitions in self.items():
+            for symbol, targets in state_transitions.items():
+                for to_state in self.as_set(targets):
+                    yield from_state, symbol, to_state
+
+    def is_deterministic(self):
+        """No ε-moves and at most one target per state and symbol."""
+        for state_transitions in self.values():
+            if '' in state_transitions:
+                return False
+            for targets in state_transitions.values():
+                if isinstance(targets, (set, frozenset, list, tuple)) and len(targets) > 1:
+                    return False
+        return True
+
 
 class FiniteAutomaton:
     def __init__(self, states, alphabet, transitions, initial_state, final_states):
+        """
+        transitions is kept as is when it is a TransitionTable. A plain dict is
+        copied into a new one: the {symbol: targets} dicts of every state are
+        shared with it, but states added to the dict later are not seen.
+        """
         self.states = set(states)
         self.alphabet = set(alphabet)
-        self.transitions = transitions
+        self.transitions = transitions if isinstance(transitions, TransitionTable) else TransitionTable(transitions)
         self.initial_state = initial_state
         self.final_states = set(final_states)
 
+    @metrics.instrumented(symbols=lambda result, self, input_string: len(input_string))
     def string_belong_to_language(self, input_string):
         # Start from initial state
         current_state = self.initial_state
-        for char in input_string:
+        for position, char in enumerate(input_string):
             # If char is not in the alphabet, it is 100% not of this language
             if char not in self.alphabet:
                 return False
@@ -129,16 +242,50 @@ class FiniteAutomaton:
             # Get state transitions for current state
             state_transitions = self.transitions.get(current_state, {})
 
+            # Nondeterministic from here on: follow every possible state at once
+            if '' in state_transitions:
+                return self.accepts_from({current_state}, input_string[position:])
+
             # If we cant reach the character from current state, wrong language
             if char not in state_transitions:
                 return False
 
             # Change the state to the state, with which this char was generated
-            current_state = state_transitions[char]
-
+            next_state = state_transitions[char]
+            if isinstance(next_state, (set, frozenset, list, tuple)):
+                if len(next_state) != 1:
+                    return self.accepts_from({current_state}, input_string[position:])
+                next_state, = next_state
+            current_state = next_state
+
+        if '' in self.transitions.get(current_state, {}):
+            return self.accepts_from({current_state}, '')
         return current_state in self.final_states
 
+    def epsilon_closure(self, states):
+        closure = set(states)
+        stack = list(states)
+        while stack:
+            for next_state in self.transitions.targets(stack.pop(), ''):
+                if next_state not in closure:
+                    closure.add(next_state)
+                    stack.append(next_state)
+        return closure
+
+    def accepts_from(self, states, input_string):
+        """Whether input_string leads from any of the states to a final one."""
+        current_states = self.epsilon_closure(states)
+        for char in input_string:
+            next_states = set()
+            for state in current_states:
+                next_states.update(self.transitions.targets(state, char))
+            if not next_states:
+                return False
+            current_states = self.epsilon_closure(next_states)
+        return not self.final_states.isdisjoint(current_states)
+
     def add_transition(self, from_state, input_char, to_state):
+        # Replaces the targets; transitions.add keeps them
         if from_state not in self.transitions:
             self.transitions[from_state] = {}
         self.transitions[from_state][input_char] = to_state
@@ -152,116 +299,110 @@ class FiniteAutomaton:
     def to_grammar(self):
         non_terminals = self.states
         terminals = self.alphabet
-        productions = {}
+        productions = {state: {} for state in self.states}
 
-        for state in self.states:
-            productions[state] = []
-            for symbol in self.alphabet:
-                if state in self.transitions and symbol in self.transitions[state]:
-                    next_states = self.transitions[state][symbol]
-                    for next_state in next_states:
-                        productions[state].append(symbol + next_state)
-                        if next_state in self.final_states:
-                            productions[state].append(symbol)
+        # Dicts keep the productions of each state unique and in order
+        for from_state, symbol, to_state in self.transitions.edges():
+            state_productions = productions.setdefault(from_state, {})
+            state_productions[symbol + to_state] = None
+            if to_state in self.final_states:
+                state_productions[symbol] = None
 
+        productions = {state: list(state_productions) for state, state_productions in productions.items()}
         return Grammar(non_terminals, terminals, productions, self.initial_state, self.final_states)
 
     def is_deterministic(self):
-        for state in self.states:
-            for symbol in self.alphabet:
-                # Check if there are transitions for the current state and symbol
-                if state in self.transitions and symbol in self.transitions[state]:
-                    next_states = self.transitions[state][symbol]
-                    # If there are multiple next states, it's non-deterministic
-                    if len(next_states) > 1 and not isinstance(next_states, str):
-                        return False
-
-        return True
-
-
-class NFAtoDFAConverter:
-    def __init__(self, nfa):
-        self.nfa = nfa
-        self.alphabet = list(nfa.alphabet)  # Alphabet of the NFA
-        self.states = []  # List of DFA states (each state is a set of NFA states)
-        self.transitions = {}  # DFA transitions
-        self.final_states = set()  # DFA final states
-        self.initial_state = None  # DFA initial state
-        self.convert()  # Perform the conversion
-
-    def convert(self):
-        # Compute the epsilon closure of the NFA's initial state
-        initial_dfa_state = self.epsilon_closure({self.nfa.initial_state})
-        self.states.append(initial_dfa_state)
-        self.initial_state = self.state_to_string(initial_dfa_state)
-
-        unprocessed_states = [initial_dfa_state]
-
-        while unprocessed_states:
-            current_state = unprocessed_states.pop()
-            state_key = self.state_to_string(current_state)
-            self.transitions[state_key] = {}
-
-            for symbol in self.alphabet:
-                # Compute the move for the current state and symbol
-                next_state = self.epsilon_closure(self.move(current_state, symbol))
-                if next_state:
-                    next_state_key = self.state_to_string(next_state)
-
-                    # If the next state is new, add it to the list of states
-                    if not any(self.state_to_string(s) == next_state_key for s in self.states):
-                        self.states.append(next_state)
-                        unprocessed_states.append(next_state)
-
-                    # Add the transition to the DFA
-                    if symbol not in self.transitions[state_key]:
-                        self.transitions[state_key][symbol] = []
-                    self.transitions[state_key][symbol].append(next_state_key)
-
-            # Check if the current state contains any NFA final states
-            if any(state in self.nfa.final_states for state in current_state):
-                self.final_states.add(state_key)
-
-    def epsilon_closure(self, states):
-        closure = set(states)
-        stack = list(states)
-
-        while stack:
-            state = stack.pop()
-            if state in self.nfa.transitions and '' in self.nfa.transitions[state]:
-                for next_state in self.nfa.transitions[state]['']:
-                    if next_state not in closure:
-                        closure.add(next_state)
-                        stack.append(next_state)
-
-        return closure
-
-    def move(self, states, symbol):
-        result = set()
-        for state in states:
-            if state in self.nfa.transitions and symbol in self.nfa.transitions[state]:
-                result.update(self.nfa.transitions[state][symbol])
-        return result
-
-    def state_to_string(self, state_set):
-        return ','.join(sorted(state_set))
+        return self.transitions.is_deterministic()
 
     def to_dfa(self):
-        dfa_states = [self.state_to_string(state) for state in self.states]
-        dfa_transitions = {}
-
-        for state_key, transitions in self.transitions.items():
-            dfa_transitions[state_key] = {}
-            for symbol, next_states in transitions.items():
-                dfa_transitions[state_key][symbol] = next_states[0]  # DFA has only one next state
-
-        return FiniteAutomaton(
-            states=dfa_states,
-            alphabet=self.alphabet,
-            transitions=dfa_transitions,
-            initial_state=self.initial_state,
-            final_states=self.final_states
-        )
+        """The automaton itself if it is deterministic, else its subset DFA."""
+        if self.is_deterministic():
+            return self
+        return NFAtoDFAConverter(self).to_dfa()
+
+    def step(self, state, symbol):
+        """Deterministic successor, or None when the transition is missing."""
+        for to_state in self.transitions.targets(state, symbol):
+            return to_state
+        return None
+
+    def product(self, other, accept):
+        """
+        DFA running both automata in parallel, built only over the pairs of
+        states reachable from the pair of initial states. A pair is final when
+        accept(in self's final states, in other's final states) holds. A missing
+        transition leads to None, and pairs that can no longer be accepted are
+        not explored.
+        """
+        left, right = self.to_dfa(), other.to_dfa()
+        alphabet = sorted(left.alphabet | right.alphabet)
+        dead_left = not accept(False, True) and not accept(False, False)
+        dead_right = not accept(True, False) and not accept(False, False)
+
+        def is_dead(pair):
+            return (pair[0] is None and dead_left) or (pair[1] is None and dead_right) or pair == (None, None)
+
+        start = (left.initial_state, right.initial_state)
+        names = {start: 'q0'}
+        transitions = TransitionTable()
+        final_states = set()
+        queue = [start]
+        for pair in queue:
+            name = names[pair]
+            if accept(pair[0] in left.final_states, pair[1] in right.final_states):
+                final_states.add(name)
+            for symbol in alphabet:
+                next_pair = (left.step(pair[0], symbol) if pair[0] is not None else None,
+                             right.step(pair[1], symbol) if pair[1] is not None else None)
+                if is_dead(next_pair):
+                    continue
+                if next_pair not in names:
+                    names[next_pair] = f'q{len(names)}'
+                    queue.append(next_pair)
+                transitions.setdefault(name, {})[symbol] = names[next_pair]
+
+        return FiniteAutomaton(names.values(), alphabet, transitions, 'q0', final_states)
+
+    def intersection(self, other):
+        return self.product(other, lambda in_self, in_other: in_self and in_other)
+
+    def union(self, other):
+        return self.product(other, lambda in_self, in_other: in_self or in_other)
+
+    def difference(self, other):
+        return self.product(other, lambda in_self, in_other: in_self and not in_other)
+
+    def complement(self, alphabet=None):
+        """DFA of every string over alphabet (by default this one's) not accepted."""
+        universe = FiniteAutomaton({'q0'}, alphabet or self.alphabet,
+                                   {'q0': {symbol: 'q0' for symbol in alphabet or self.alphabet}}, 'q0', {'q0'})
+        return universe.difference(self)
+
+
+def epsilon_closures(fa):
+    """
+    {state: ε-closure} for every state with ε-moves or reached by one. The
+    states of a cycle of ε-moves share one closure, so the ε-graph is
+    condensed into strongly connected components, which come after every
+    component they lead to; each closure is then its own states and the
+    closures of the ε-successors outside it.
+    """
+    successors = {}
+    for from_state, symbol, to_state in fa.transitions.edges():
+        if symbol == '':
+            successors.setdefault(from_state, []).append(to_state)
+
+    closures = {}
+    for component in strongly_connected_components(successors):
+        closure = set(component)
+        for member in component:
+            for next_state in successors.get(member, ()):
+                if next_state not in closure:
+                    closure.update(closures[next_state])
+        closure = frozenset(closure)
+        for member in component:
+            closures[member] = closure
+    return closures
 
 
 class NFAtoDFAConverter:
@@ -272,13 +413,17 @@ class NFAtoDFAConverter:
         self.transitions = {}  # DFA transitions
         self.final_states = set()  # DFA final states
         self.initial_state = None  # DFA initial state
+        self.closures = epsilon_closures(nfa)  # ε-closure of every NFA state
+        self.set_closures = {}  # ε-closures of the sets of states met so far
         self.convert()  # Perform the conversion
 
+    @metrics.instrumented(states=lambda result, self: len(self.states))
     def convert(self):
         # Compute the epsilon closure of the NFA's initial state
         initial_dfa_state = self.epsilon_closure({self.nfa.initial_state})
         self.states.append(initial_dfa_state)
         self.initial_state = self.state_to_string(initial_dfa_state)
+        state_keys = {self.initial_state}
 
         unprocessed_states = [initial_dfa_state]
 
@@ -294,7 +439,8 @@ class NFAtoDFAConverter:
                     next_state_key = self.state_to_string(next_state)
 
                     # If the next state is new, add it to the list of states
-                    if not any(self.state_to_string(s) == next_state_key for s in self.states):
+                    if next_state_key not in state_keys:
+                        state_keys.add(next_state_key)
                         self.states.append(next_state)
                         unprocessed_states.append(next_state)
 
@@ -308,24 +454,19 @@ class NFAtoDFAConverter:
                 self.final_states.add(state_key)
 
     def epsilon_closure(self, states):
-        closure = set(states)
-        stack = list(states)
-
-        while stack:
-            state = stack.pop()
-            if state in self.nfa.transitions and '' in self.nfa.transitions[state]:
-                for next_state in self.nfa.transitions[state]['']:
-                    if next_state not in closure:
-                        closure.add(next_state)
-                        stack.append(next_state)
-
+        key = frozenset(states)
+        closure = self.set_closures.get(key)
+        if closure is None:
+            closure = set()
+            for state in key:
+                closure.update(self.closures.get(state, (state,)))
+            closure = self.set_closures[key] = frozenset(closure)
         return closure
 
     def move(self, states, symbol):
         result = set()
         for state in states:
-            if state in self.nfa.transitions and symbol in self.nfa.transitions[state]:
-                result.update(self.nfa.transitions[state][symbol])
+            result.update(self.nfa.transitions.targets(state, symbol))
         return result
 
     def state_to_string(self, state_set):
@@ -349,7 +490,83 @@ class NFAtoDFAConverter:
         )
 
 
-def visualize_fa(fa, title):
+def merged_edges(fa, from_state):
+    """
+    Transitions of from_state grouped by target, as (to_state, label) pairs
+    where parallel edges share one label like 'a,b'.
+    """
+    symbols_by_target = {}
+    for symbol, to_states in fa.transitions.get(from_state, {}).items():
+        for to_state in fa.transitions.as_set(to_states):
+            symbols_by_target.setdefault(to_state, []).append(symbol or 'ε')
+    return [(to_state, ','.join(sorted(symbols))) for to_state, symbols in symbols_by_target.items()]
+
+
+def dot_id(name):
+    return '"' + str(name).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def all_states(fa):
+    """
+    States of the automaton sorted by name, including the ones only found as
+    a transition source or target, a final state or the initial state.
+    """
+    states = set(fa.states) | set(fa.transitions) | set(fa.final_states) | {fa.initial_state}
+    states.update(to_state for _, _, to_state in fa.transitions.edges())
+    return sorted(states, key=str)
+
+
+def write_dot(fa, file, title='FA'):
+    """
+    Writes the automaton to a text file in Graphviz DOT format, one line per
+    state and per merged edge, without building a graphviz.Digraph.
+    """
+    states = all_states(fa)
+    file.write(f'// {title}\ndigraph {{\n\trankdir=LR\n')
+    for state in states:
+        shape = 'doublecircle' if state in fa.final_states else 'circle'
+        file.write(f'\t{dot_id(state)} [shape={shape}]\n')
+    file.write(f'\t__start__ [shape=none, label=""]\n\t__start__ -> {dot_id(fa.initial_state)}\n')
+    for from_state in states:
+        for to_state, label in merged_edges(fa, from_state):
+            file.write(f'\t{dot_id(from_state)} -> {dot_id(to_state)} [label={dot_id(label)}]\n')
+    file.write('}\n')
+
+
+def write_json(fa, file):
+    """
+    Writes the automaton to a text file as compact JSON: states are listed once
+    and referred to by index in the initial state, the final states and the
+    [from, to, label] edges.
+    """
+    states = all_states(fa)
+    index = {state: i for i, state in enumerate(states)}
+    file.write('{"states":' + json.dumps(states, separators=(',', ':')))
+    file.write(',"alphabet":' + json.dumps(sorted(fa.alphabet), separators=(',', ':')))
+    file.write(f',"initial":{index[fa.initial_state]}')
+    file.write(',"final":' + json.dumps(sorted(index[state] for state in fa.final_states)))
+    file.write(',"edges":[')
+    separator = ''
+    for from_state in states:
+        for to_state, label in merged_edges(fa, from_state):
+            file.write(f'{separator}[{index[from_state]},{index[to_state]},{json.dumps(label)}]')
+            separator = ','
+    file.write(']}\n')
+
+
+def visualize_fa(fa, title, headless=False):
+    """
+    Renders the automaton with Graphviz and opens it. Headless, only the DOT
+    text is written to '{title}.gv', which needs neither the graphviz package
+    nor its binaries.
+    """
+    if headless:
+        with open(f'{title}.gv', 'w', encoding='utf-8') as file:
+            write_dot(fa, file, title)
+        return
+
+    from graphviz import Digraph
+
     graph = Digraph(comment=title)
     graph.attr(rankdir='LR')
 
@@ -374,33 +591,34 @@ def visualize_fa(fa, title):
     graph.render(f'{title}.gv', view=True)
 
 
-nfa_states = {'q0', 'q1', 'q2', 'q3'}
-nfa_alphabet = {'a', 'b', 'c'}
-nfa_transitions = {
-    'q0': {'a': {'q0', 'q1'}},
-    'q1': {'b': {'q2'}},
-    'q2': {'a': {'q2'}, 'b': {'q3'}, 'c': {'q0'}}
-}
-nfa_initial_state = 'q0'
-nfa_final_states = {'q3'}
-
-nfa = FiniteAutomaton(nfa_states, nfa_alphabet, nfa_transitions, nfa_initial_state, nfa_final_states)
-converter = NFAtoDFAConverter(nfa)
-dfa = converter.to_dfa()
-
-print("DFA States:", dfa.states)
-print("DFA Alphabet:", dfa.alphabet)
-print("DFA Transitions:", dfa.transitions)
-print("DFA Initial State:", dfa.initial_state)
-print("DFA Final States:", dfa.final_states)
-print("DFA is deterministic:", dfa.is_deterministic())
-visualize_fa(dfa, 'DFA')
-
-print("")
-print("nfa States:", nfa.states)
-print("nfa Alphabet:", nfa.alphabet)
-print("nfa Transitions:", nfa.transitions)
-print("nfa Initial State:", nfa.initial_state)
-print("nfa Final States:", nfa.final_states)
-print("nfa is deterministic:", nfa.is_deterministic())
-visualize_fa(nfa, 'NFA')
+if __name__ == '__main__':
+    nfa_states = {'q0', 'q1', 'q2', 'q3'}
+    nfa_alphabet = {'a', 'b', 'c'}
+    nfa_transitions = {
+        'q0': {'a': {'q0', 'q1'}},
+        'q1': {'b': {'q2'}},
+        'q2': {'a': {'q2'}, 'b': {'q3'}, 'c': {'q0'}}
+    }
+    nfa_initial_state = 'q0'
+    nfa_final_states = {'q3'}
+
+    nfa = FiniteAutomaton(nfa_states, nfa_alphabet, nfa_transitions, nfa_initial_state, nfa_final_states)
+    converter = NFAtoDFAConverter(nfa)
+    dfa = converter.to_dfa()
+
+    print("DFA States:", dfa.states)
+    print("DFA Alphabet:", dfa.alphabet)
+    print("DFA Transitions:", dfa.transitions)
+    print("DFA Initial State:", dfa.initial_state)
+    print("DFA Final States:", dfa.final_states)
+    print("DFA is deterministic:", dfa.is_deterministic())
+    visualize_fa(dfa, 'DFA')
+
+    print("")
+    print("nfa States:", nfa.states)
+    print("nfa Alphabet:", nfa.alphabet)
+    print("nfa Transitions:", nfa.transitions)
+    print("nfa Initial State:", nfa.initial_state)
+    print("nfa Final States:", nfa.final_states)
+    print("nfa is deterministic:", nfa.is_deterministic())
+    visualize_fa(nfa, 'NFA')
@@ -0,0 +1,127 @@
+from main import TransitionTable
+
+# Scanner states kept before the cache is cleared and rebuilt on demand
+MAX_STATES = 10000
+
+
+class MultiMatcher:
+    """
+    Tagged DFA for several automata at once. Any object with the attributes of
+    FiniteAutomaton can be a pattern, deterministic or not; pattern i sets bit
+    i of the mask of every accepting scanner state.
+
+    The states of all patterns are numbered into one NFA whose ε-closures are
+    computed once. Scanner states are sets of those NFA states, built on first
+    use and cached, so one pass over a string answers every pattern.
+    """
+
+    def __init__(self, automata):
+        self.patterns = list(automata)
+        self.moves = []
+        self.final_masks = []
+        initial = set()
+
+        for pattern_id, fa in enumerate(self.patterns):
+            numbers = {}
+
+            def number(state):
+                if state not in numbers:
+                    numbers[state] = len(self.moves)
+                    self.moves.append({})
+                    self.final_masks.append(1 << pattern_id if state in fa.final_states else 0)
+                return numbers[state]
+
+            initial.add(number(fa.initial_state))
+            for state in fa.states:
+                number(state)
+            for from_state, state_transitions in fa.transitions.items():
+                moves = self.moves[number(from_state)]
+                for symbol, targets in state_transitions.items():
+                    moves.setdefault(symbol, set()).update(number(target) for target in TransitionTable.as_set(targets))
+
+        self.closures = [self._closure(state) for state in range(len(self.moves))]
+        for moves in self.moves:
+            moves.pop('', None)
+        self.initial = self._close(initial)
+        self.clear()
+
+    def _closure(self, state):
+        closure = {state}
+        stack = [state]
+        while stack:
+            for target in self.moves[stack.pop()].get('', ()):
+                if target not in closure:
+                    closure.add(target)
+                    stack.append(target)
+        return closure
+
+    def _close(self, states):
+        result = set()
+        for state in states:
+            result.update(self.closures[state])
+        return frozenset(result)
+
+    def clear(self):
+        """Drops every scanner state but the initial one."""
+        self.ids = {self.initial: 0}
+        self.sets = [self.initial]
+        self.table = [{}]
+        self.masks = [self._mask(self.initial)]
+
+    def trim(self):
+        """Clears the cache if it grew past MAX_STATES."""
+        if len(self.sets) > MAX_STATES:
+            self.clear()
+
+    def _mask(self, states):
+        mask = 0
+        for state in states:
+            mask |= self.final_masks[state]
+        return mask
+
+    def step(self, scanner_state, symbol):
+        """Builds, caches and returns the successor of a scanner state, -1 if dead."""
+        targets = set()
+        for state in self.sets[scanner_state]:
+            targets.update(self.moves[state].get(symbol, ()))
+        if not targets:
+            self.table[scanner_state][symbol] = -1
+            return -1
+
+        next_id = self.state_id(self._close(targets))
+        self.table[scanner_state][symbol] = next_id
+        return next_id
+
+    def state_id(self, states):
+        """Id of the scanner state for a closed set of NFA states, added if new."""
+        state = self.ids.get(states)
+        if state is None:
+            state = self.ids[states] = len(self.sets)
+            self.sets.append(states)
+            self.table.append({})
+            self.masks.append(self._mask(states))
+        return state
+
+    def match_mask(self, input_string):
+        """Bitset of the patterns accepting input_string."""
+        self.trim()
+        state = 0
+        table = self.table
+        for char in input_string:
+            next_state = table[state].get(char)
+            if next_state is None:
+                next_state = self.step(state, char)
+            if next_state == -1:
+                return 0
+            state = next_state
+        return self.masks[state]
+
+    def matches(self, input_string):
+        """Ids of the patterns accepting input_string, in increasing order."""
+        mask = self.match_mask(input_string)
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(low.bit_length() - 1)
+            mask ^= low
+        return result
@@ -0,0 +1,141 @@
+from main import FiniteAutomaton, TransitionTable
+from multimatcher import MultiMatcher
+
+# Added states of the reversed automaton: one looping on every symbol, one
+# leading to every final state of the original automaton
+_ANY = object()
+_END = object()
+
+
+class Searcher:
+    """
+    Finds the substrings of a text accepted by an automaton, leftmost-longest
+    first, like re.finditer.
+
+    Two lazy DFAs are built: the automaton itself, anchored at a start
+    position, and Σ* followed by the reversed automaton. Read backwards over
+    the text, the second one marks every position where a match starts, so
+    the leftmost start is found in one pass; the anchored DFA then reads on
+    from it for the longest end. When every accepted string begins with the
+    same literal, candidate starts are found with str.find instead.
+
+    Finding the longest end reads the text until the anchored DFA dies, so a
+    pattern that stays alive over long stretches without accepting rereads
+    them for each match it starts.
+    """
+
+    def __init__(self, fa):
+        self.anchored = MultiMatcher([fa])
+        transitions = TransitionTable()
+        for from_state, symbol, to_state in fa.transitions.edges():
+            transitions.add(to_state, symbol, from_state)
+        for state in fa.final_states:
+            transitions.add(_END, '', state)
+        transitions[_ANY] = {symbol: {_ANY} for symbol in fa.alphabet}
+        transitions.add(_ANY, '', _END)
+        self.reversed = MultiMatcher([FiniteAutomaton(fa.states | {_ANY, _END}, fa.alphabet, transitions, _ANY,
+                                                      {fa.initial_state})])
+        self.prefix, self.after_prefix = self._required_prefix()
+
+    def _required_prefix(self):
+        """
+        Literal every accepted string starts with, and the set of NFA states
+        reached after reading it. The set is kept rather than its scanner
+        state, whose id changes when the cache is cleared.
+        """
+        matcher = self.anchored
+        prefix = []
+        state = 0
+        seen = {state}
+        while not matcher.masks[state]:
+            symbols = set()
+            for nfa_state in matcher.sets[state]:
+                symbols.update(matcher.moves[nfa_state])
+            if len(symbols) != 1:
+                break
+            symbol, = symbols
+            next_state = matcher.step(state, symbol)
+            if next_state in seen:
+                break
+            prefix.append(symbol)
+            state = next_state
+            seen.add(state)
+        return ''.join(prefix), matcher.sets[state]
+
+    def _longest(self, text, state, pos):
+        """End of the longest match read from the anchored state at pos, -1 if none."""
+        matcher = self.anchored
+        table, masks = matcher.table, matcher.masks
+        end = pos if masks[state] else -1
+        for i in range(pos, len(text)):
+            next_state = table[state].get(text[i])
+            if next_state is None:
+                next_state = matcher.step(state, text[i])
+            if next_state == -1:
+                break
+            state = next_state
+            if masks[state]:
+                end = i + 1
+        return end
+
+    def _starts(self, text, pos):
+        """bytearray with a 1 at every position from pos where a match starts."""
+        matcher = self.reversed
+        matcher.trim()
+        table, masks = matcher.table, matcher.masks
+        starts = bytearray(len(text) + 1)
+        state = 0
+        starts[len(text)] = masks[state] != 0
+        for i in range(len(text) - 1, pos - 1, -1):
+            next_state = table[state].get(text[i])
+            if next_state is None:
+                next_state = matcher.step(state, text[i])
+            # Only the Σ* loop is left, which a symbol outside the alphabet ends too
+            state = next_state if next_state != -1 else 0
+            if masks[state]:
+                starts[i] = 1
+        return starts
+
+    def _search(self, text, pos, starts):
+        self.anchored.trim()
+        if self.prefix:
+            after_prefix = self.anchored.state_id(self.after_prefix)
+            while True:
+                start = text.find(self.prefix, pos)
+                if start == -1:
+                    return None
+                end = self._longest(text, after_prefix, start + len(self.prefix))
+                if end != -1:
+                    return start, end
+                pos = start + 1
+
+        start = starts.find(1, pos)
+        if start == -1:
+            return None
+        return start, self._longest(text, 0, start)
+
+    def search(self, text, pos=0):
+        """(start, end) of the leftmost-longest match in the str text at pos or later, None if there is none."""
+        return self._search(text, pos, None if self.prefix else self._starts(text, pos))
+
+    def finditer(self, text):
+        """
+        Yields the (start, end) spans of non-overlapping matches in text, a
+        str or bytes (read as latin-1). After an empty match the search goes
+        on one position further.
+        """
+        if isinstance(text, (bytes, bytearray)):
+            text = text.decode('latin-1')
+        starts = None if self.prefix else self._starts(text, 0)
+        pos = 0
+        while pos <= len(text):
+            span = self._search(text, pos, starts)
+            if span is None:
+                return
+            yield span
+            start, end = span
+            pos = end if end > start else end + 1
+
+    def findall(self, text):
+        """Matched substrings of text."""
+        return [text[start:end] for start, end in self.finditer(text)]
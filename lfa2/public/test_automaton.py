@@ -0,0 +1,176 @@
+import io
+import itertools
+import json
+import random
+import unittest
+
+from fixtures import even_a, variant_nfa
+from main import FiniteAutomaton, Grammar, NFAtoDFAConverter, TransitionTable, write_dot, write_json
+
+
+def random_nfa(size, transitions_count, rng):
+    """NFA over {a, b} with size states and about transitions_count transitions."""
+    states = [f'q{i}' for i in range(size)]
+    transitions = TransitionTable()
+    for _ in range(transitions_count):
+        transitions.add(rng.choice(states), rng.choice('ab'), rng.choice(states))
+    return FiniteAutomaton(states, 'ab', transitions, states[0], set(rng.sample(states, size // 10)))
+
+
+class TestFiniteAutomaton(unittest.TestCase):
+    def setUp(self):
+        self.nfa = variant_nfa()
+        self.dfa = NFAtoDFAConverter(self.nfa).to_dfa()
+
+    def test_transitions_copied_into_table(self):
+        transitions = {'q0': {'a': 'q1'}}
+        fa = FiniteAutomaton({'q0', 'q1'}, 'a', transitions, 'q0', {'q1'})
+        self.assertIsInstance(fa.transitions, TransitionTable)
+        self.assertIs(fa.transitions['q0'], transitions['q0'])
+        transitions['q1'] = {'a': 'q0'}
+        self.assertNotIn('q1', fa.transitions)
+
+        table = TransitionTable(transitions)
+        self.assertIs(FiniteAutomaton({'q0', 'q1'}, 'a', table, 'q0', {'q1'}).transitions, table)
+
+    def test_write_dot(self):
+        file = io.StringIO()
+        write_dot(self.dfa, file, 'DFA')
+        lines = file.getvalue().splitlines()
+        self.assertEqual(lines[:3], ['// DFA', 'digraph {', '\trankdir=LR'])
+        self.assertIn('\t"q3" [shape=doublecircle]', lines)
+        self.assertIn('\t"q0,q1" [shape=circle]', lines)
+        self.assertIn('\t__start__ -> "q0"', lines)
+        self.assertIn('\t"q0,q1" -> "q2" [label="b"]', lines)
+        self.assertEqual(lines[-1], '}')
+        self.assertEqual(sum('->' in line for line in lines), 1 + 6)
+
+    def test_write_dot_parallel_edges(self):
+        fa = FiniteAutomaton({'p', 'q"'}, {'a', 'b', 'c'}, {'p': {'c': {'q"'}, 'a': {'p', 'q"'}, 'b': {'p'}, '': {'p'}}},
+                             'p', {'q"'})
+        file = io.StringIO()
+        write_dot(fa, file)
+        lines = file.getvalue().splitlines()
+        self.assertIn('\t"p" -> "p" [label="a,b,ε"]', lines)
+        self.assertIn('\t"p" -> "q\\"" [label="a,c"]', lines)
+
+    def test_write_json(self):
+        file = io.StringIO()
+        write_json(self.nfa, file)
+        data = json.loads(file.getvalue())
+        self.assertEqual(data['states'], ['q0', 'q1', 'q2', 'q3'])
+        self.assertEqual(data['alphabet'], ['a', 'b', 'c'])
+        self.assertEqual(data['initial'], 0)
+        self.assertEqual(data['final'], [3])
+        self.assertEqual(sorted(map(tuple, data['edges'])), [
+            (0, 0, 'a'), (0, 1, 'a'), (1, 2, 'b'), (2, 0, 'c'), (2, 2, 'a'), (2, 3, 'b')
+        ])
+
+    def test_write_states_only_reached(self):
+        # q1 is only an edge target and a final state, q2 a pure sink
+        fa = FiniteAutomaton({'q0'}, {'a', 'b'}, {'q0': {'a': 'q1', 'b': 'q2'}}, 'q0', {'q1'})
+        file = io.StringIO()
+        write_json(fa, file)
+        data = json.loads(file.getvalue())
+        self.assertEqual(data['states'], ['q0', 'q1', 'q2'])
+        self.assertEqual(data['final'], [1])
+        self.assertEqual(sorted(map(tuple, data['edges'])), [(0, 1, 'a'), (0, 2, 'b')])
+
+        file = io.StringIO()
+        write_dot(fa, file)
+        self.assertIn('\t"q1" [shape=doublecircle]', file.getvalue().splitlines())
+        self.assertIn('\t"q2" [shape=circle]', file.getvalue().splitlines())
+
+    def test_is_deterministic(self):
+        self.assertFalse(self.nfa.is_deterministic())
+        self.assertTrue(self.dfa.is_deterministic())
+        self.dfa.transitions.add('q3', 'a', 'q2')
+        self.assertTrue(self.dfa.is_deterministic())
+        self.dfa.transitions.add('q3', 'a', 'q0')
+        self.assertFalse(self.dfa.is_deterministic())
+
+    def test_to_grammar(self):
+        # DFA targets are plain state names, not iterated character by character
+        grammar = self.dfa.to_grammar()
+        self.assertEqual(sorted(grammar.production_rules['q2']), ['aq2', 'b', 'bq3', 'cq0'])
+        self.assertEqual(grammar.production_rules['q3'], [])
+        self.assertEqual(grammar.start_symbol, 'q0')
+
+    def test_grammar_round_trip(self):
+        fa = self.nfa.to_grammar().to_finite_automaton()
+        for length in range(7):
+            for word in map(''.join, itertools.product('abc', repeat=length)):
+                self.assertEqual(fa.string_belong_to_language(word), self.nfa.string_belong_to_language(word), word)
+        self.assertTrue(self.nfa.string_belong_to_language('aabb'))
+        self.assertTrue(self.dfa.string_belong_to_language('abcabb'))
+        self.assertFalse(self.nfa.string_belong_to_language('aab'))
+
+    def test_variant_grammar(self):
+        grammar = Grammar(['S', 'A', 'B'], ['a', 'b', 'c'], {
+            'S': ['aS', 'bS', 'cA'],
+            'A': ['aB'],
+            'B': ['aB', 'bB', 'c'],
+        }, 'S', [])
+        fa = grammar.to_finite_automaton()
+        self.assertTrue(fa.is_deterministic())
+        self.assertTrue(fa.string_belong_to_language('abcabc'))
+        self.assertFalse(fa.string_belong_to_language('abca'))
+
+    def test_product(self):
+        ends_b = FiniteAutomaton({'x', 'y'}, 'ab', {'x': {'a': 'x', 'b': 'y'}, 'y': {'a': 'x', 'b': 'y'}}, 'x', {'y'})
+        even = even_a()
+        nfa = self.nfa
+        cases = [
+            (even.intersection(ends_b), lambda w: w.count('a') % 2 == 0 and w.endswith('b')),
+            (even.union(ends_b), lambda w: w.count('a') % 2 == 0 or w.endswith('b')),
+            (even.difference(ends_b), lambda w: w.count('a') % 2 == 0 and not w.endswith('b')),
+            (even.complement(), lambda w: w.count('a') % 2 == 1),
+            (nfa.intersection(even), lambda w: nfa.string_belong_to_language(w) and 'c' not in w and w.count('a') % 2 == 0),
+            (nfa.difference(ends_b), lambda w: nfa.string_belong_to_language(w) and ('c' in w or not w.endswith('b'))),
+            (nfa.complement(), lambda w: not nfa.string_belong_to_language(w)),
+        ]
+        for product, expected in cases:
+            self.assertTrue(product.is_deterministic())
+            for length in range(8):
+                for word in map(''.join, itertools.product('abc', repeat=length)):
+                    if set(word) <= product.alphabet:
+                        self.assertEqual(product.string_belong_to_language(word), expected(word), word)
+        self.assertFalse(even.union(ends_b).string_belong_to_language('ac'))
+
+    def test_product_explores_reachable_pairs(self):
+        # Both automata count a's modulo 7, so only the 7 diagonal pairs are reachable
+        count = FiniteAutomaton(range(7), 'a', {i: {'a': (i + 1) % 7} for i in range(7)}, 0, {0})
+        self.assertEqual(len(count.intersection(count).states), 7)
+        self.assertEqual(len(count.difference(count).final_states), 0)
+        # Nothing can be accepted once either automaton is stuck
+        only_b = FiniteAutomaton({'s'}, 'b', {'s': {'b': 's'}}, 's', {'s'})
+        self.assertEqual(len(only_b.intersection(count).states), 1)
+        self.assertEqual(len(only_b.union(count).states), 9)
+
+    def test_large_automaton(self):
+        rng = random.Random(15)
+        nfa = random_nfa(20000, 100000, rng)
+        edges = list(nfa.transitions.edges())
+        self.assertGreater(len(edges), 99000)
+        self.assertFalse(nfa.is_deterministic())
+
+        # One production per transition, plus one per state and symbol leading to a final state
+        grammar = nfa.to_grammar()
+        to_final = {(from_state, symbol) for from_state, symbol, to_state in edges if to_state in nfa.final_states}
+        self.assertEqual(sum(map(len, grammar.production_rules.values())), len(edges) + len(to_final))
+
+        fa = grammar.to_finite_automaton()
+        self.assertEqual(sum(1 for _ in fa.transitions.edges()), len(edges) + len(to_final))
+        for _ in range(200):
+            word = ''.join(rng.choice('ab') for _ in range(rng.randint(0, 5)))
+            self.assertEqual(fa.string_belong_to_language(word), nfa.string_belong_to_language(word), word)
+
+        states = [f'q{i}' for i in range(50000)]
+        dfa = FiniteAutomaton(states, 'ab', {state: {'a': state, 'b': states[i - 1]} for i, state in enumerate(states)},
+                              'q0', [])
+        self.assertEqual(sum(1 for _ in dfa.transitions.edges()), 100000)
+        self.assertTrue(dfa.is_deterministic())
+
+
+if __name__ == '__main__':
+    unittest.main()
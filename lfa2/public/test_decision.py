@@ -0,0 +1,83 @@
+import random
+import unittest
+
+from decision import equivalent, is_empty, is_subset
+from fixtures import even_a, nth_from_end, random_dfa, variant_nfa
+from main import FiniteAutomaton, NFAtoDFAConverter
+
+
+class TestDecision(unittest.TestCase):
+    def setUp(self):
+        self.nfa = variant_nfa()
+        self.dfa = NFAtoDFAConverter(self.nfa).to_dfa()
+        self.even_a = even_a()
+
+    def assertCounterexample(self, a, b, word):
+        self.assertNotEqual(a.string_belong_to_language(word), b.string_belong_to_language(word), word)
+
+    def test_equivalent(self):
+        self.assertEqual(equivalent(self.nfa, self.dfa), (True, None))
+        self.assertEqual(equivalent(self.dfa, self.dfa.union(self.dfa)), (True, None))
+
+        self.dfa.add_final_state(self.dfa.initial_state)
+        self.assertEqual(equivalent(self.nfa, self.dfa), (False, ''))
+
+        result = equivalent(self.nfa, self.even_a)
+        self.assertFalse(result.holds)
+        self.assertCounterexample(self.nfa, self.even_a, result.counterexample)
+
+    def test_equivalent_large(self):
+        rng = random.Random(15)
+        size = 20000
+        dfa = random_dfa(size, rng)
+        # The same DFA with every state split into two copies that alternate on 'b'
+        transitions = {}
+        for state, state_transitions in dfa.transitions.items():
+            for copy, other in (('x', 'y'), ('y', 'x')):
+                transitions[state + copy] = {'a': state_transitions['a'] + copy, 'b': state_transitions['b'] + other}
+        doubled = FiniteAutomaton(transitions, 'ab', transitions, dfa.initial_state + 'x',
+                                  {state + copy for state in dfa.final_states for copy in 'xy'})
+        self.assertEqual(equivalent(dfa, doubled), (True, None))
+
+        doubled.final_states ^= {dfa.transitions['q0']['b'] + 'y'}
+        result = equivalent(dfa, doubled)
+        self.assertFalse(result.holds)
+        self.assertCounterexample(dfa, doubled, result.counterexample)
+
+    def test_is_empty(self):
+        self.assertEqual(is_empty(self.nfa), (False, 'abb'))
+        self.assertEqual(is_empty(self.nfa.difference(self.dfa)), (True, None))
+        self.assertEqual(is_empty(self.even_a.intersection(self.even_a.complement())), (True, None))
+
+    def test_is_subset(self):
+        both = self.nfa.intersection(self.even_a)
+        self.assertEqual(is_subset(both, self.nfa), (True, None))
+        self.assertEqual(is_subset(self.nfa, self.nfa.union(self.even_a)), (True, None))
+        self.assertEqual(is_subset(self.nfa, self.dfa), (True, None))
+
+        result = is_subset(self.nfa, self.even_a)
+        self.assertFalse(result.holds)
+        self.assertTrue(self.nfa.string_belong_to_language(result.counterexample))
+        self.assertFalse(self.even_a.string_belong_to_language(result.counterexample))
+
+    def test_is_subset_epsilon(self):
+        # a* b with an ε-move, against a DFA for the same language minus 'b'
+        nfa = FiniteAutomaton({'s', 't', 'f'}, 'ab', {'s': {'a': {'s'}, '': {'t'}}, 't': {'b': {'f'}}}, 's', {'f'})
+        dfa = FiniteAutomaton({'s', 'a', 'f'}, 'ab', {'s': {'a': 'a'}, 'a': {'a': 'a', 'b': 'f'}}, 's', {'f'})
+        self.assertEqual(is_subset(dfa, nfa), (True, None))
+        self.assertEqual(is_subset(nfa, dfa), (False, 'b'))
+
+    def test_is_subset_large(self):
+        # The subset DFA of the n-th symbol from the end being a has 2^(n+1) states
+        n = 200
+        nfa = nth_from_end(n)
+        chain = {i: {'a': i + 1, 'b': i + 1} for i in range(1, n + 1)}
+        starts_a = FiniteAutomaton(range(n + 2), 'ab', {**chain, 0: {'a': 1}}, 0, {n + 1})
+        starts_b = FiniteAutomaton(range(n + 2), 'ab', {**chain, 0: {'b': 1}}, 0, {n + 1})
+
+        self.assertEqual(is_subset(starts_a, nfa), (True, None))
+        self.assertEqual(is_subset(starts_b, nfa), (False, 'b' * (n + 1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from main import Grammar, Violation, classify_many
+
+
+class TestGrammar(unittest.TestCase):
+    def setUp(self):
+        # variant 15 grammar
+        self.grammar = Grammar(['S', 'A', 'B'], ['a', 'b', 'c'], {
+            'S': ['aS', 'bS', 'cA'],
+            'A': ['aB'],
+            'B': ['aB', 'bB', 'c'],
+        }, 'S', [])
+
+    def test_regular(self):
+        result = self.grammar.classify_grammar()
+        self.assertEqual(result.type, 3)
+        self.assertEqual(result.violations, [])
+        self.assertEqual(str(result), "Type 3 (Regular Grammar)")
+
+    def test_epsilon_productions(self):
+        self.grammar.production_rules['S'].append('')
+        self.assertEqual(self.grammar.classify_grammar().type, 3)
+        self.grammar.production_rules['B'].append('')
+        result = self.grammar.classify_grammar()
+        self.assertEqual(result.type, 3)
+        self.assertEqual(result.violations, [Violation(1, 'B', '', "empty production of a non-start symbol")])
+
+    def test_terminal_word(self):
+        self.grammar.production_rules['B'].append('ab')
+        result = self.grammar.classify_grammar()
+        self.assertEqual(result.type, 3)
+        self.assertEqual(result.violations, [])
+        self.assertTrue(self.grammar.to_finite_automaton().string_belong_to_language('caab'))
+
+    def test_context_free(self):
+        self.grammar.production_rules['A'].append('aAb')
+        self.grammar.production_rules['B'].append('A')
+        result = self.grammar.classify_grammar()
+        self.assertEqual(result.type, 2)
+        self.assertEqual([(v.left, v.right) for v in result.violations], [('A', 'aAb'), ('B', 'A')])
+
+    def test_mixed_linearity(self):
+        self.grammar.production_rules['A'].append('Ba')
+        result = self.grammar.classify_grammar()
+        self.assertEqual(result.type, 2)
+        self.assertEqual([(v.type, v.left, v.right) for v in result.violations], [(3, 'S', 'aS')])
+
+    def test_context_sensitive_and_unrestricted(self):
+        self.grammar.production_rules['aA'] = ['aBc']
+        self.assertEqual(str(self.grammar.classify_grammar()), "Type 1 (Context-Sensitive Grammar)")
+        self.grammar.production_rules['aB'] = ['c']
+        result = self.grammar.classify_grammar()
+        self.assertEqual(result.type, 0)
+        self.assertIn(Violation(1, 'aB', 'c', "shortened production"), result.violations)
+
+    def test_classify_many(self):
+        grammars = [self.grammar, Grammar(['S'], ['a', 'b'], {'S': ['aSb', 'ab']}, 'S', [])] * 20
+        expected = [grammar.classify_grammar() for grammar in grammars]
+        self.assertEqual(classify_many(grammars), expected)
+        self.assertEqual(classify_many(grammars, processes=2, chunksize=8), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import io
+import json
+import unittest
+
+from fixtures import variant_nfa
+from main import FiniteAutomaton, NFAtoDFAConverter, metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.nfa = variant_nfa()
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.reset()
+
+    def test_disabled(self):
+        # Nothing stands between the callers and the undecorated functions
+        self.assertFalse(hasattr(FiniteAutomaton.string_belong_to_language, '__wrapped__'))
+        NFAtoDFAConverter(self.nfa)
+        self.nfa.string_belong_to_language('abb')
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_enabled(self):
+        metrics.enable()
+        converter = NFAtoDFAConverter(self.nfa)
+        dfa = converter.to_dfa()
+        dfa.string_belong_to_language('abb')
+        dfa.string_belong_to_language('aabcab')
+        registry = metrics.snapshot()
+        self.assertEqual(registry['NFAtoDFAConverter.convert']['calls'], 1)
+        self.assertEqual(registry['NFAtoDFAConverter.convert']['states'], len(converter.states))
+        self.assertEqual(registry['FiniteAutomaton.string_belong_to_language']['calls'], 2)
+        self.assertEqual(registry['FiniteAutomaton.string_belong_to_language']['symbols'], 9)
+        self.assertGreater(registry['NFAtoDFAConverter.convert']['seconds'], 0)
+
+        file = io.StringIO()
+        metrics.dump(file)
+        self.assertEqual(json.loads(file.getvalue()), registry)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import random
+import unittest
+
+import multimatcher
+from fixtures import even_a, nth_from_end, random_dfa, variant_nfa
+from main import Grammar
+from multimatcher import MultiMatcher
+
+
+class TestMultiMatcher(unittest.TestCase):
+    def setUp(self):
+        self.nfa = variant_nfa()
+        self.even_a = even_a()
+        grammar = Grammar(['S', 'A'], ['a', 'b'], {'S': ['aA', 'b'], 'A': ['bS', '']}, 'S', [])
+        self.grammar_fa = grammar.to_finite_automaton()
+
+    def test_matches(self):
+        patterns = [self.nfa, self.even_a, self.grammar_fa, nth_from_end(2)]
+        matcher = MultiMatcher(patterns)
+        for word in ['', 'a', 'b', 'ab', 'abb', 'aab', 'abab', 'aabb', 'abcab', 'abb', 'baaa', 'cab']:
+            expected = [i for i, fa in enumerate(patterns) if fa.string_belong_to_language(word)]
+            self.assertEqual(matcher.matches(word), expected, word)
+            self.assertEqual(matcher.match_mask(word), sum(1 << i for i in expected), word)
+
+    def test_no_patterns(self):
+        self.assertEqual(MultiMatcher([]).matches('abc'), [])
+
+    def test_random_patterns(self):
+        rng = random.Random(15)
+        patterns = [random_dfa(rng.randint(10, 30), rng) for _ in range(200)]
+        matcher = MultiMatcher(patterns)
+        for _ in range(300):
+            word = ''.join(rng.choice('ab') for _ in range(rng.randint(0, 12)))
+            expected = [i for i, fa in enumerate(patterns) if fa.string_belong_to_language(word)]
+            self.assertEqual(matcher.matches(word), expected, word)
+
+    def test_cache_limit(self):
+        limit = multimatcher.MAX_STATES
+        multimatcher.MAX_STATES = 4
+        try:
+            fa = nth_from_end(5)
+            matcher = MultiMatcher([fa])
+            rng = random.Random(15)
+            for _ in range(100):
+                word = ''.join(rng.choice('ab') for _ in range(rng.randint(0, 12)))
+                self.assertEqual(matcher.matches(word), [0] if fa.string_belong_to_language(word) else [])
+                self.assertLessEqual(len(matcher.sets), 4 + len(word) + 1)
+        finally:
+            multimatcher.MAX_STATES = limit
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import random
+import re
+import unittest
+
+import multimatcher
+from fixtures import nth_from_end, random_dfa
+from main import FiniteAutomaton, TransitionTable
+from search import Searcher
+from thompson import regex_to_nfa
+
+
+def brute_force(fa, text):
+    """Leftmost-longest spans, trying every substring."""
+    spans = []
+    pos = 0
+    while pos <= len(text):
+        for start in range(pos, len(text) + 1):
+            ends = [end for end in range(start, len(text) + 1) if fa.string_belong_to_language(text[start:end])]
+            if ends:
+                spans.append((start, ends[-1]))
+                pos = ends[-1] if ends[-1] > start else ends[-1] + 1
+                break
+        else:
+            break
+    return spans
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        # ab(a|b)*c
+        transitions = {'s': {'a': 'x'}, 'x': {'b': 'y'}, 'y': {'a': 'y', 'b': 'y', 'c': 'z'}}
+        self.abc = FiniteAutomaton('sxyz', 'abc', transitions, 's', {'z'})
+        # a*
+        self.a_star = FiniteAutomaton({0}, 'a', {0: {'a': 0}}, 0, {0})
+
+    def test_prefix(self):
+        self.assertEqual(Searcher(self.abc).prefix, 'ab')
+        self.assertEqual(Searcher(self.a_star).prefix, '')
+        self.assertEqual(Searcher(nth_from_end(3)).prefix, '')
+
+    def test_finditer(self):
+        searcher = Searcher(self.abc)
+        text = 'xxabcyyabaabbczabab'
+        self.assertEqual(list(searcher.finditer(text)), [(2, 5), (7, 14)])
+        self.assertEqual(searcher.findall(text), [m.group() for m in re.finditer('ab[ab]*c', text)])
+        self.assertEqual(list(searcher.finditer(text.encode())), [(2, 5), (7, 14)])
+        self.assertEqual(searcher.search(text, 3), (7, 14))
+        self.assertEqual(searcher.search(text, 8), (10, 14))
+        self.assertIsNone(searcher.search(text, 14))
+
+    def test_empty_matches(self):
+        text = 'baacaaa'
+        self.assertEqual(list(Searcher(self.a_star).finditer(text)),
+                         [m.span() for m in re.finditer('a*', text)])
+
+    def test_random(self):
+        rng = random.Random(15)
+        for _ in range(100):
+            fa = random_dfa(rng.randint(2, 8), rng) if rng.random() < 0.7 else nth_from_end(rng.randint(0, 3))
+            searcher = Searcher(fa)
+            text = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 25)))
+            self.assertEqual(list(searcher.finditer(text)), brute_force(fa, text), text)
+
+    def test_random_prefixed(self):
+        rng = random.Random(15)
+        for _ in range(100):
+            fa = random_dfa(rng.randint(2, 8), rng)
+            transitions = TransitionTable({'p0': {'b': {'p1'}}, 'p1': {'a': {'p2'}}, 'p2': {'': {fa.initial_state}}})
+            transitions.update(fa.transitions)
+            prefixed = FiniteAutomaton(fa.states | {'p0', 'p1', 'p2'}, 'ab', transitions, 'p0', fa.final_states)
+            searcher = Searcher(prefixed)
+            self.assertTrue(searcher.prefix.startswith('ba'))
+            text = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 40)))
+            self.assertEqual(list(searcher.finditer(text)), brute_force(prefixed, text), text)
+
+    def test_cache_cleared_between_searches(self):
+        limit = multimatcher.MAX_STATES
+        multimatcher.MAX_STATES = 16
+        try:
+            rng = random.Random(15)
+            text = ''.join(rng.choice('abx') for _ in range(2000))
+            for regex in ['x(a|b)*a(a|b)(a|b)(a|b)(a|b)', '(a|b)*a(a|b)(a|b)(a|b)(a|b)x']:
+                searcher = Searcher(regex_to_nfa(regex))
+                expected = [match.span() for match in re.finditer(regex, text)]
+                self.assertEqual(list(searcher.finditer(text)), expected, regex)
+                self.assertEqual(list(searcher.finditer(text)), expected, regex)
+        finally:
+            multimatcher.MAX_STATES = limit
+
+
+if __name__ == '__main__':
+    unittest.main()
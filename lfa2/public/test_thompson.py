@@ -0,0 +1,59 @@
+import itertools
+import random
+import re
+import unittest
+
+from decision import equivalent
+from main import FiniteAutomaton, NFAtoDFAConverter, TransitionTable, epsilon_closures
+from thompson import regex_to_nfa
+
+REGEXES = ['a', 'ab', 'a|b', 'a*', '(a|b)*abb', 'a+b?', '((a*|b*)*)*c', '(a|)b', '(ab|ba)+a?', r'a\*b', '']
+
+
+def words(alphabet, max_length):
+    for length in range(max_length + 1):
+        for word in itertools.product(alphabet, repeat=length):
+            yield ''.join(word)
+
+
+class TestThompson(unittest.TestCase):
+    def test_regex_to_nfa(self):
+        for regex in REGEXES:
+            nfa = regex_to_nfa(regex)
+            dfa = NFAtoDFAConverter(nfa).to_dfa()
+            for word in words('abc*', 5):
+                expected = re.fullmatch(regex, word) is not None
+                self.assertEqual(nfa.string_belong_to_language(word), expected, (regex, word))
+                self.assertEqual(dfa.string_belong_to_language(word), expected, (regex, word))
+
+    def test_errors(self):
+        for regex in ['(a', 'a)', '*a', 'a|*', 'a\\']:
+            with self.assertRaises(ValueError):
+                regex_to_nfa(regex)
+
+    def test_epsilon_closures(self):
+        rng = random.Random(15)
+        for _ in range(50):
+            size = rng.randint(1, 30)
+            transitions = TransitionTable()
+            for _ in range(rng.randint(0, 3 * size)):
+                transitions.add(rng.randrange(size), rng.choice(['', '', 'a']), rng.randrange(size))
+            fa = FiniteAutomaton(range(size), 'a', transitions, 0, {size - 1})
+            closures = epsilon_closures(fa)
+            for state in range(size):
+                self.assertEqual(set(closures.get(state, {state})), fa.epsilon_closure({state}), state)
+
+    def test_cached_closures(self):
+        class SearchingConverter(NFAtoDFAConverter):
+            def epsilon_closure(self, states):
+                return self.nfa.epsilon_closure(states)
+
+        for regex in REGEXES + ['(a|b)*a(a|b)(a|b)(a|b)']:
+            nfa = regex_to_nfa(regex)
+            converter = NFAtoDFAConverter(nfa)
+            self.assertEqual(converter.transitions, SearchingConverter(nfa).transitions, regex)
+            self.assertEqual(equivalent(nfa, converter.to_dfa()), (True, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
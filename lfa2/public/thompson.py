@@ -0,0 +1,94 @@
+from main import FiniteAutomaton, TransitionTable
+
+OPERATORS = set('|*+?()\\')
+
+
+def regex_to_nfa(regex):
+    """
+    ε-NFA for a regular expression by Thompson's construction. Supported are
+    symbols, concatenation, '|', '*', '+', '?', parentheses and '\\' to
+    escape an operator; an empty alternative matches the empty string.
+    Every piece gets its own start and end state joined by ε-moves, so the
+    result has many of them. States are named q0, q1, ...
+    """
+    transitions = TransitionTable()
+    alphabet = set()
+    pos = 0
+
+    def new_state():
+        state = f'q{len(states)}'
+        states.append(state)
+        return state
+
+    def epsilon(from_state, to_state):
+        transitions.add(from_state, '', to_state)
+
+    def alternation():
+        nonlocal pos
+        branches = [concatenation()]
+        while pos < len(regex) and regex[pos] == '|':
+            pos += 1
+            branches.append(concatenation())
+        if len(branches) == 1:
+            return branches[0]
+        start, end = new_state(), new_state()
+        for branch_start, branch_end in branches:
+            epsilon(start, branch_start)
+            epsilon(branch_end, end)
+        return start, end
+
+    def concatenation():
+        pieces = []
+        while pos < len(regex) and regex[pos] not in '|)':
+            pieces.append(repetition())
+        if not pieces:
+            start, end = new_state(), new_state()
+            epsilon(start, end)
+            return start, end
+        for (_, left_end), (right_start, _) in zip(pieces, pieces[1:]):
+            epsilon(left_end, right_start)
+        return pieces[0][0], pieces[-1][1]
+
+    def repetition():
+        nonlocal pos
+        inner_start, inner_end = atom()
+        while pos < len(regex) and regex[pos] in '*+?':
+            operator = regex[pos]
+            pos += 1
+            start, end = new_state(), new_state()
+            epsilon(start, inner_start)
+            epsilon(inner_end, end)
+            if operator != '+':
+                epsilon(start, end)
+            if operator != '?':
+                epsilon(inner_end, inner_start)
+            inner_start, inner_end = start, end
+        return inner_start, inner_end
+
+    def atom():
+        nonlocal pos
+        char = regex[pos]
+        pos += 1
+        if char == '(':
+            fragment = alternation()
+            if pos == len(regex) or regex[pos] != ')':
+                raise ValueError(f'Missing ) in {regex!r}')
+            pos += 1
+            return fragment
+        if char == '\\':
+            if pos == len(regex):
+                raise ValueError(f'Trailing \\ in {regex!r}')
+            char = regex[pos]
+            pos += 1
+        elif char in OPERATORS:
+            raise ValueError(f'Unexpected {char!r} at {pos - 1} in {regex!r}')
+        start, end = new_state(), new_state()
+        transitions.add(start, char, end)
+        alphabet.add(char)
+        return start, end
+
+    states = []
+    start, end = alternation()
+    if pos != len(regex):
+        raise ValueError(f'Unexpected {regex[pos]!r} at {pos} in {regex!r}')
+    return FiniteAutomaton(states, alphabet, transitions, start, {end})
@@ -0,0 +1,23 @@
+"""Workloads of this lab for the benchmark runner at the root of the repository."""
+from main import Stack, tokenize
+
+BLOCK = """{
+  asg a 44
+  asg b 0.01
+  print mul a b
+}
+"""
+
+
+def tokenize_program(rng):
+    code = 'int a\nfloat b\n' + BLOCK * rng.randint(4000, 6000)
+
+    def run():
+        return {'characters': len(code), 'tokens': tokenize(code, Stack(), [])}
+
+    return run
+
+
+WORKLOADS = {
+    'tokenize': tokenize_program,
+}
@@ -1,6 +1,8 @@
 import re
 from typing import List, Dict, Union
 
+import metrics
+
 TYPE_NONE = 0
 INT = 1
 FLOAT = 2
@@ -28,6 +30,8 @@ COND_OP = 23
 VALUE = 24
 ID = 25
 
+MAX_VAR_AMOUNT = 100
+
 IS_VAR = r'^[a-zA-Z][a-zA-Z0-9_]*'
 var_regex = re.compile(IS_VAR)
 
@@ -100,7 +104,11 @@ def get_cond_op_type(s: str) -> int:
     return cond_op_map.get(s, TYPE_NONE)
 
 
-def tokenize(code: str, stack: Stack, variables: List[Variable], debug: bool = False) -> None:
+@metrics.instrumented(characters=lambda result, code, *args, **kwargs: len(code),
+                      tokens=lambda result, *args, **kwargs: result)
+def tokenize(code: str, stack: Stack, variables: List[Variable], debug: bool = False) -> int:
+    """Pushes the tokens of code onto stack and returns how many there were."""
+    appended = 0
     curr_type = TYPE_NONE
     var_amount = 0
     line_count = 1
@@ -226,9 +234,11 @@ def tokenize(code: str, stack: Stack, variables: List[Variable], debug: bool = F
             continue
         if not stack.append(curr):
             raise ValueError(f"Lexer error: failed to append token '{curr.value}'")
+        appended += 1
 
     if depth != 0:
         raise ValueError("Lexer error: Not all code blocks are enclosed")
+    return appended
 
 
 if __name__ == "__main__":
@@ -243,6 +253,5 @@ if __name__ == "__main__":
     """
     stack = Stack()
     variables = []
-    MAX_VAR_AMOUNT = 100
     tokenize(code, stack, variables, debug=False)
     stack.print_stack()
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""Workloads of this lab for the benchmark runner at the root of the repository."""
+from main import PatternAutomaton, SimpleRegexGenerator, _parse_pattern, compile_all, compile_pattern
+
+PATTERNS = ['M?N{2}(O|P){3}Q*R+', '(X|Y|Z){3}8+(9|0)', '(H|i)(J|K)L*N']
+
+
+def random_pattern(rng):
+    """Random pattern in the syntax of the lab, each part doubling the strings or more."""
+    parts = []
+    for _ in range(rng.randint(10, 13)):
+        kind = rng.random()
+        letters = rng.sample('ABCDEFGHIJ', rng.randint(2, 4))
+        if kind < 0.5:
+            parts.append(f'({"|".join(letters)}){{{rng.randint(1, 2)}}}')
+        elif kind < 0.7:
+            parts.append(letters[0] + '*')
+        elif kind < 0.9:
+            parts.append(letters[0] + '+')
+        else:
+            parts.append(letters[0] + '?')
+    return ''.join(parts)
+
+
+def generate(rng):
+    patterns = PATTERNS + [random_pattern(rng) for _ in range(10)]
+
+    def run():
+        compile_pattern.cache_clear()
+        strings = 0
+        for pattern in patterns:
+            generator = SimpleRegexGenerator(pattern)
+            for _ in generator.generate_strings(generator.parse_pattern()):
+                strings += 1
+        return {'strings': strings, 'patterns': len(patterns)}
+
+    return run
+
+
+def match(rng):
+    generator = SimpleRegexGenerator(PATTERNS[0])
+    strings = list(generator.generate_strings(generator.parse_pattern()))
+    words = [rng.choice(strings) if rng.random() < 0.5 else ''.join(rng.choice('MNOPQR') for _ in range(9))
+             for _ in range(20000)]
+
+    def run():
+        accepted = sum(map(generator.matches, words))
+        return {'words': len(words), 'accepted': accepted}
+
+    return run
+
+
+def match_large(use_automaton):
+    """Matching words against a large pattern with its automaton, or by generating its strings and looking up."""
+    def workload(rng):
+        pattern = random_pattern(rng)
+        generator = SimpleRegexGenerator(pattern)
+        strings = list(generator.generate_strings(generator.parse_pattern()))
+        words = [rng.choice(strings) if rng.random() < 0.5 else rng.choice(strings)[::-1] for _ in range(1000)]
+
+        def run():
+            if use_automaton:
+                automaton = compile_pattern(pattern).automaton
+                accepted = sum(map(automaton.string_belong_to_language, words))
+            else:
+                generated = set(generator.generate_strings(generator.parse_pattern()))
+                accepted = sum(word in generated for word in words)
+            return {'words': len(words), 'accepted': accepted}
+
+        return run
+
+    return workload
+
+
+def compile_catalog(cached):
+    """5000 patterns, 50 of them distinct, compiled through the cache or parsed and built every time."""
+    def workload(rng):
+        distinct = PATTERNS + [random_pattern(rng) for _ in range(47)]
+        patterns = [rng.choice(distinct) for _ in range(5000)]
+
+        def run():
+            if cached:
+                compile_pattern.cache_clear()
+                automata = [compiled.automaton for compiled in compile_all(patterns)]
+            else:
+                automata = [PatternAutomaton.from_parts(_parse_pattern(pattern)[0]) for pattern in patterns]
+            return {'patterns': len(automata), 'distinct': len(set(patterns))}
+
+        return run
+
+    return workload
+
+
+WORKLOADS = {
+    'generate': generate,
+    'match': match,
+    'match_large': match_large(True),
+    'match_large_generating': match_large(False),
+    'compile': compile_catalog(True),
+    'compile_uncached': compile_catalog(False),
+}
@@ -1,4 +1,166 @@
 import itertools
+from collections import namedtuple
+from functools import lru_cache
+
+import metrics
+
+# Maximum amount of distinct patterns kept in the compiled-pattern cache
+PATTERN_CACHE_SIZE = 4096
+
+CompiledPattern = namedtuple('CompiledPattern', ['pattern', 'parts', 'explanation', 'automaton'])
+
+
+class PatternAutomaton:
+    """
+    DFA recognizing exactly the strings generated by a parsed pattern.
+    Uses the same attribute layout as the FiniteAutomaton from the previous labs.
+    """
+
+    def __init__(self, states, alphabet, transitions, initial_state, final_states):
+        self.states = set(states)
+        self.alphabet = set(alphabet)
+        self.transitions = transitions
+        self.initial_state = initial_state
+        self.final_states = set(final_states)
+
+    @metrics.instrumented(symbols=lambda result, self, input_string: len(input_string))
+    def string_belong_to_language(self, input_string):
+        current_state = self.initial_state
+        for char in input_string:
+            current_state = self.transitions.get(current_state, {}).get(char)
+            if current_state is None:
+                return False
+        return current_state in self.final_states
+
+    @classmethod
+    def from_parts(cls, parts):
+        """
+        Builds the DFA for a sequence of parts, each part being a list of alternatives.
+        """
+        # Every part goes from junction state i to junction state i + 1, one
+        # intermediate NFA state per character of each alternative.
+        moves = {}
+        skips = {}
+        next_free = len(parts) + 1
+        for i, alternatives in enumerate(parts):
+            for alternative in alternatives:
+                if not alternative:
+                    skips.setdefault(i, set()).add(i + 1)
+                    continue
+                state = i
+                for position, char in enumerate(alternative):
+                    if position == len(alternative) - 1:
+                        target = i + 1
+                    else:
+                        target = next_free
+                        next_free += 1
+                    moves.setdefault(state, {}).setdefault(char, set()).add(target)
+                    state = target
+
+        def closure(nfa_states):
+            result = set(nfa_states)
+            stack = list(nfa_states)
+            while stack:
+                for target in skips.get(stack.pop(), ()):
+                    if target not in result:
+                        result.add(target)
+                        stack.append(target)
+            return frozenset(result)
+
+        # Subset construction, naming the DFA states q0, q1, ...
+        start = closure({0})
+        names = {start: 'q0'}
+        transitions = {}
+        final_states = set()
+        alphabet = set()
+        unprocessed = [start]
+        while unprocessed:
+            current = unprocessed.pop()
+            name = names[current]
+            if len(parts) in current:
+                final_states.add(name)
+            step = {}
+            for nfa_state in current:
+                for char, targets in moves.get(nfa_state, {}).items():
+                    step.setdefault(char, set()).update(targets)
+            for char, targets in step.items():
+                target = closure(targets)
+                if target not in names:
+                    names[target] = f'q{len(names)}'
+                    unprocessed.append(target)
+                transitions.setdefault(name, {})[char] = names[target]
+                alphabet.add(char)
+
+        return cls(names.values(), alphabet, transitions, 'q0', final_states)
+
+
+def _parse_pattern(pattern):
+    """
+    Splits a pattern into its parts and the explanation of every processing step.
+    """
+    parts = []
+    explanation = []
+
+    def explain(part, text):
+        explanation.append(f"Processing '{part}': {text}")
+
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == '(':
+            end = pattern.find(')', i)
+            if end == -1:
+                raise ValueError("Unmatched parenthesis")
+            group = pattern[i + 1:end].split('|')
+            parts.append(group)
+            explain(pattern[i:end + 1], "Either of " + " or ".join(group) + " appears exactly once")
+            i = end + 1
+        elif pattern[i] == '{':
+            end = pattern.find('}', i)
+            if end == -1:
+                raise ValueError("Unmatched curly brace")
+            repeat = int(pattern[i + 1:end])
+            if parts:
+                last_part = parts.pop()
+                parts.append([''.join([c] * repeat) for c in last_part])
+            explain(pattern[i:end + 1], f"Previous character appears exactly {repeat} times")
+            i = end + 1
+        elif i + 1 < len(pattern) and pattern[i + 1] in '?*+':
+            if pattern[i + 1] == '?':
+                parts.append([pattern[i], ''])
+                explain(pattern[i:i + 2], f"'{pattern[i]}' is optional")
+            elif pattern[i + 1] == '*':
+                parts.append(['', pattern[i]])
+                explain(pattern[i:i + 2], f"'{pattern[i]}' appears zero or more times")
+            elif pattern[i + 1] == '+':
+                parts.append([pattern[i], pattern[i] * 2])
+                explain(pattern[i:i + 2], f"'{pattern[i]}' appears one or more times")
+            i += 2
+        else:
+            parts.append([pattern[i]])
+            explain(pattern[i], f"'{pattern[i]}' appears exactly once")
+            i += 1
+    return parts, explanation
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pattern):
+    """
+    Parses and compiles a pattern once; repeated calls are served from an LRU cache.
+    """
+    parts, explanation = _parse_pattern(pattern)
+    return CompiledPattern(
+        pattern=pattern,
+        parts=tuple(tuple(part) for part in parts),
+        explanation=tuple(explanation),
+        automaton=PatternAutomaton.from_parts(parts)
+    )
+
+
+def compile_all(patterns):
+    """
+    Compiles a whole catalog of patterns, returning them in the given order.
+    """
+    return [compile_pattern(pattern) for pattern in patterns]
 
 
 class SimpleRegexGenerator:
@@ -6,52 +168,17 @@ class SimpleRegexGenerator:
         self.pattern = pattern
         self.explanation = []  # To store explanation steps
 
-    def add_explanation(self, part, explanation):
-        """Adds an explanation for each part of the pattern being processed."""
-        self.explanation.append(f"Processing '{part}': {explanation}")
+    def compile(self):
+        """Returns the cached compiled form of the pattern."""
+        return compile_pattern(self.pattern)
 
     def parse_pattern(self):
         """
         Parses the simplified pattern into components, with explanations.
         """
-        parts = []
-        i = 0
-        while i < len(self.pattern):
-            if self.pattern[i] == '(':
-                end = self.pattern.find(')', i)
-                if end == -1:
-                    raise ValueError("Unmatched parenthesis")
-                group = self.pattern[i + 1:end].split('|')
-                parts.append(group)
-                self.add_explanation(self.pattern[i:end + 1],
-                                     "Either of " + " or ".join(group) + " appears exactly once")
-                i = end + 1
-            elif self.pattern[i] == '{':
-                end = self.pattern.find('}', i)
-                if end == -1:
-                    raise ValueError("Unmatched curly brace")
-                repeat = int(self.pattern[i + 1:end])
-                if parts:
-                    last_part = parts.pop()
-                    parts.append([''.join([c] * repeat) for c in last_part])
-                self.add_explanation(self.pattern[i:end + 1], f"Previous character appears exactly {repeat} times")
-                i = end + 1
-            elif i + 1 < len(self.pattern) and self.pattern[i + 1] in '?*+':
-                if self.pattern[i + 1] == '?':
-                    parts.append([self.pattern[i], ''])
-                    self.add_explanation(self.pattern[i:i + 2], f"'{self.pattern[i]}' is optional")
-                elif self.pattern[i + 1] == '*':
-                    parts.append(['', self.pattern[i]])
-                    self.add_explanation(self.pattern[i:i + 2], f"'{self.pattern[i]}' appears zero or more times")
-                elif self.pattern[i + 1] == '+':
-                    parts.append([self.pattern[i], self.pattern[i] * 2])
-                    self.add_explanation(self.pattern[i:i + 2], f"'{self.pattern[i]}' appears one or more times")
-                i += 2
-            else:
-                parts.append([self.pattern[i]])
-                self.add_explanation(self.pattern[i], f"'{self.pattern[i]}' appears exactly once")
-                i += 1
-        return parts
+        compiled = self.compile()
+        self.explanation = list(compiled.explanation)
+        return [list(part) for part in compiled.parts]
 
     def explain_process(self):
         """Prints the explanation of how the pattern was processed."""
@@ -67,6 +194,10 @@ class SimpleRegexGenerator:
         for combination in itertools.product(*parts):
             yield ''.join(combination)
 
+    def matches(self, string):
+        """Checks whether the string is one of the strings the pattern generates."""
+        return self.compile().automaton.string_belong_to_language(string)
+
     def run(self):
         parts = self.parse_pattern()
         self.explain_process()
@@ -75,8 +206,9 @@ class SimpleRegexGenerator:
             print(string)
 
 
-pattern = 'M?N{2}(O|P){3}Q*R+'
-# pattern = '(X|Y|Z){3}8+(9|0)'
-# pattern = '(H|i)(J|K)L*N'
-generator = SimpleRegexGenerator(pattern)
-generator.run()
+if __name__ == "__main__":
+    pattern = 'M?N{2}(O|P){3}Q*R+'
+    # pattern = '(X|Y|Z){3}8+(9|0)'
+    # pattern = '(H|i)(J|K)L*N'
+    generator = SimpleRegexGenerator(pattern)
+    generator.run()
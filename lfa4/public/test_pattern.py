@@ -0,0 +1,63 @@
+import itertools
+import random
+import unittest
+
+from benchmarks import PATTERNS, random_pattern
+from main import PatternAutomaton, SimpleRegexGenerator, compile_all, compile_pattern
+
+
+class TestPattern(unittest.TestCase):
+    def setUp(self):
+        compile_pattern.cache_clear()
+
+    def test_compile_pattern_cached(self):
+        first = compile_pattern(PATTERNS[0])
+        self.assertEqual(compile_pattern.cache_info().misses, 1)
+        self.assertIs(compile_pattern(PATTERNS[0]), first)
+        self.assertIs(SimpleRegexGenerator(PATTERNS[0]).compile(), first)
+        info = compile_pattern.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 1, 1))
+
+    def test_parse_pattern_resets_explanation(self):
+        generator = SimpleRegexGenerator(PATTERNS[0])
+        parts = generator.parse_pattern()
+        self.assertEqual(generator.parse_pattern(), parts)
+        self.assertEqual(generator.explanation, list(compile_pattern(PATTERNS[0]).explanation))
+        self.assertEqual(len(generator.explanation), 7)
+
+    def test_compile_all_keeps_order(self):
+        patterns = [PATTERNS[2], PATTERNS[0], PATTERNS[1], PATTERNS[0]]
+        compiled = compile_all(patterns)
+        self.assertEqual([c.pattern for c in compiled], patterns)
+        self.assertIs(compiled[1], compiled[3])
+        self.assertEqual(compile_pattern.cache_info().misses, 3)
+
+    def test_automaton_matches_generated_strings(self):
+        rng = random.Random(15)
+        for pattern in PATTERNS + [random_pattern(rng) for _ in range(3)]:
+            generator = SimpleRegexGenerator(pattern)
+            parts = generator.parse_pattern()
+            generated = set(generator.generate_strings(parts))
+            alphabet = sorted({c for part in parts for alternative in part for c in alternative})
+            for string in generated:
+                self.assertTrue(generator.matches(string), string)
+            # Every string one edit away from a generated one, most not generated
+            for string in itertools.islice(generated, 200):
+                for i in range(len(string) + 1):
+                    for c in alphabet + ['']:
+                        for variant in (string[:i] + c + string[i:], string[:i] + c + string[i + 1:]):
+                            self.assertEqual(generator.matches(variant), variant in generated, variant)
+
+    def test_from_parts(self):
+        fa = PatternAutomaton.from_parts([['a', ''], ['bc', 'b']])
+        accepted = {s for s in map(''.join, itertools.product('abc', repeat=3)) if fa.string_belong_to_language(s)}
+        self.assertEqual(accepted, {'abc'})
+        self.assertTrue(fa.string_belong_to_language('b'))
+        self.assertTrue(fa.string_belong_to_language('ab'))
+        self.assertTrue(fa.string_belong_to_language('bc'))
+        self.assertFalse(fa.string_belong_to_language(''))
+        self.assertFalse(fa.string_belong_to_language('ax'))
+
+
+if __name__ == '__main__':
+    unittest.main()
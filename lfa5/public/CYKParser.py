@@ -0,0 +1,128 @@
+from constants import EPSILON
+
+
+class CYKParser:
+    """
+    CYK recognizer for grammars in Chomsky Normal Form (see Grammar.to_cnf).
+
+    Non-terminals are numbered and every set of non-terminals is kept as an
+    integer bitmask, so filling a table cell is a bitwise OR over the rules.
+    """
+
+    def __init__(self, grammar):
+        self.start = grammar.start
+        self.non_terminals = list(grammar.rules)
+        self.index = {nt: i for i, nt in enumerate(self.non_terminals)}
+        self.accepts_empty = False
+
+        # terminal -> mask of A with A -> terminal
+        self.terminal_masks = {}
+        # (B, C) -> mask of A with A -> BC
+        self.pair_masks = {}
+
+        for non_terminal, productions in grammar.rules.items():
+            bit = 1 << self.index[non_terminal]
+            for production in productions:
+                if production == EPSILON or len(production) == 0:
+                    if non_terminal != self.start:
+                        raise ValueError(f"Grammar is not in CNF: {non_terminal} -> {EPSILON}")
+                    self.accepts_empty = True
+                elif len(production) == 1 and production[0] not in self.index:
+                    symbol = production[0]
+                    self.terminal_masks[symbol] = self.terminal_masks.get(symbol, 0) | bit
+                elif len(production) == 2 and all(symbol in self.index for symbol in production):
+                    pair = (self.index[production[0]], self.index[production[1]])
+                    self.pair_masks[pair] = self.pair_masks.get(pair, 0) | bit
+                else:
+                    raise ValueError(f"Grammar is not in CNF: {non_terminal} -> {production}")
+
+        self.pairs = list(self.pair_masks.items())
+
+    def _fill(self, word):
+        """
+        Fills the CYK table for the word.
+
+        Instead of storing the full n x n table of masks, for every non-terminal A
+        it keeps ends[A][i] (bit j set when A derives word[i:j]) and starts[A][j]
+        (bit i set when A derives word[i:j]). The split points of a span for the
+        rule A -> BC are then ends[B][i] & starts[C][j], a single AND.
+        """
+        n = len(word)
+        count = len(self.non_terminals)
+        ends = [[0] * (n + 1) for _ in range(count)]
+        starts = [[0] * (n + 1) for _ in range(count)]
+
+        def store(mask, i, j):
+            while mask:
+                low = mask & -mask
+                a = low.bit_length() - 1
+                ends[a][i] |= 1 << j
+                starts[a][j] |= 1 << i
+                mask ^= low
+
+        for i, symbol in enumerate(word):
+            store(self.terminal_masks.get(symbol, 0), i, i + 1)
+
+        pairs = self.pairs
+        for length in range(2, n + 1):
+            for i in range(n - length + 1):
+                j = i + length
+                cell = 0
+                for (b, c), mask in pairs:
+                    if ends[b][i] & starts[c][j]:
+                        cell |= mask
+                if cell:
+                    store(cell, i, j)
+
+        return ends, starts
+
+    def parse(self, word, build_tree=False):
+        """
+        Returns (accepted, tree). The tree is only built when requested and is
+        made of (non_terminal, terminal) leaves and (non_terminal, left, right) nodes.
+        """
+        if not word:
+            return self.accepts_empty, ((self.start, EPSILON) if build_tree and self.accepts_empty else None)
+        if self.start not in self.index:
+            return False, None
+
+        ends, starts = self._fill(word)
+        start = self.index[self.start]
+        accepted = bool(ends[start][0] >> len(word) & 1)
+        if not accepted or not build_tree:
+            return accepted, None
+        return True, self._build_tree(word, ends, starts, start, 0, len(word))
+
+    def recognize(self, word):
+        """Checks whether the word belongs to the language of the grammar."""
+        return self.parse(word)[0]
+
+    def _build_tree(self, word, ends, starts, root, i, j):
+        # Walk the table top-down with an explicit stack, filling in the
+        # children of every node once both of them are built.
+        result = {}
+        stack = [(root, i, j, None)]
+        while stack:
+            a, i, j, split = stack.pop()
+            if j - i == 1:
+                result[(a, i, j)] = (self.non_terminals[a], word[i])
+                continue
+            if split is not None:
+                b, c, k = split
+                result[(a, i, j)] = (self.non_terminals[a], result[(b, i, k)], result[(c, k, j)])
+                continue
+            b, c, k = self._split(ends, starts, a, i, j)
+            stack.append((a, i, j, (b, c, k)))
+            stack.append((b, i, k, None))
+            stack.append((c, k, j, None))
+        return result[(root, 0, len(word))]
+
+    def _split(self, ends, starts, a, i, j):
+        bit = 1 << a
+        for (b, c), mask in self.pairs:
+            if mask & bit:
+                splits = ends[b][i] & starts[c][j]
+                if splits:
+                    k = (splits & -splits).bit_length() - 1
+                    return b, c, k
+        raise ValueError("Inconsistent CYK table")
@@ -0,0 +1,161 @@
+from constants import EPSILON
+
+
+class EarleyParser:
+    """
+    Earley recognizer working directly on a Grammar, epsilon productions included.
+
+    Nullable non-terminals are handled the Aycock-Horspool way (the dot skips over
+    them on prediction) and right recursion uses Leo's transitive items, so the
+    parser runs in linear time on LR-regular grammars.
+    """
+
+    def __init__(self, grammar):
+        self.start = grammar.start
+        self.non_terminals = set(grammar.non_terminals) | set(grammar.rules)
+
+        # Rule 0 is the augmented start rule, its left side None
+        self.lhs = [None]
+        self.rhs = [(self.start,)]
+        self.by_lhs = {}
+        for non_terminal, productions in grammar.rules.items():
+            for production in productions:
+                self.by_lhs.setdefault(non_terminal, []).append(len(self.lhs))
+                self.lhs.append(non_terminal)
+                self.rhs.append(() if production == EPSILON else tuple(production))
+
+        self.nullable = self._nullable()
+
+    def _nullable(self):
+        """
+        Nullable non-terminals, found with a worklist over the rules that use them.
+        """
+        remaining = []
+        users = {}
+        nullable = set()
+        worklist = []
+        for rule in range(1, len(self.lhs)):
+            rhs = self.rhs[rule]
+            remaining.append(len(rhs))
+            if any(symbol not in self.non_terminals for symbol in rhs):
+                remaining[-1] = -1
+                continue
+            for symbol in rhs:
+                users.setdefault(symbol, []).append(rule)
+            if not rhs and self.lhs[rule] not in nullable:
+                nullable.add(self.lhs[rule])
+                worklist.append(self.lhs[rule])
+
+        while worklist:
+            symbol = worklist.pop()
+            for rule in users.get(symbol, ()):
+                remaining[rule - 1] -= 1
+                if remaining[rule - 1] == 0 and self.lhs[rule] not in nullable:
+                    nullable.add(self.lhs[rule])
+                    worklist.append(self.lhs[rule])
+
+        return nullable
+
+    def recognize(self, word):
+        """Checks whether the word belongs to the language of the grammar."""
+        n = len(word)
+        lhs, rhs, by_lhs = self.lhs, self.rhs, self.by_lhs
+        non_terminals, nullable = self.non_terminals, self.nullable
+
+        items = [[] for _ in range(n + 1)]
+        seen = [set() for _ in range(n + 1)]
+        # waiting[i][A]: items of set i with the dot right before A
+        waiting = [{} for _ in range(n + 1)]
+        # leo[i][A]: memoized topmost completed item for A completed from origin i
+        leo = [{} for _ in range(n + 1)]
+
+        items[0].append((0, 0, 0))
+        seen[0].add((0, 0, 0))
+
+        for i in range(n + 1):
+            current = items[i]
+            current_seen = seen[i]
+            symbol_at = word[i] if i < n else None
+            k = 0
+            while k < len(current):
+                item = current[k]
+                k += 1
+                rule, dot, origin = item
+                body = rhs[rule]
+
+                if dot < len(body):
+                    symbol = body[dot]
+                    if symbol in non_terminals:
+                        # Predict
+                        waiting[i].setdefault(symbol, []).append(item)
+                        for predicted in by_lhs.get(symbol, ()):
+                            new_item = (predicted, 0, i)
+                            if new_item not in current_seen:
+                                current_seen.add(new_item)
+                                current.append(new_item)
+                        if symbol in nullable:
+                            new_item = (rule, dot + 1, origin)
+                            if new_item not in current_seen:
+                                current_seen.add(new_item)
+                                current.append(new_item)
+                    elif symbol == symbol_at:
+                        # Scan
+                        new_item = (rule, dot + 1, origin)
+                        if new_item not in seen[i + 1]:
+                            seen[i + 1].add(new_item)
+                            items[i + 1].append(new_item)
+                    continue
+
+                # Complete. Empty completions (origin == i) are already covered
+                # by advancing over nullable symbols during prediction.
+                if origin == i:
+                    continue
+                completed = lhs[rule]
+                top = self._leo_item(completed, origin, waiting, leo)
+                if top is not None:
+                    advanced = [top]
+                else:
+                    advanced = [(r, d + 1, o) for r, d, o in waiting[origin].get(completed, ())]
+                for new_item in advanced:
+                    if new_item not in current_seen:
+                        current_seen.add(new_item)
+                        current.append(new_item)
+
+            if not current and i < n:
+                return False
+
+        return (0, 1, 0) in seen[n]
+
+    def _leo_item(self, symbol, origin, waiting, leo):
+        """
+        Topmost item of the deterministic reduction path for symbol completed from
+        origin, or None when the path is not deterministic.
+        """
+        path = []
+        visited = set()
+        position = origin
+        top = None
+        while True:
+            memo = leo[position]
+            if symbol in memo:
+                top = memo[symbol]
+                break
+            candidates = waiting[position].get(symbol, ())
+            if len(candidates) != 1 or (position, symbol) in visited:
+                break
+            rule, dot, item_origin = candidates[0]
+            if dot != len(self.rhs[rule]) - 1 or rule == 0:
+                break
+            visited.add((position, symbol))
+            path.append((position, symbol, (rule, dot + 1, item_origin)))
+            position, symbol = item_origin, self.lhs[rule]
+
+        if not path:
+            leo[position][symbol] = top
+            return top
+
+        for position, symbol, completed in reversed(path):
+            if top is None:
+                top = completed
+            leo[position][symbol] = top
+        return top
@@ -1,4 +1,23 @@
-from constants import EPSILON
+import hashlib
+import time
+from collections import OrderedDict, namedtuple
+
+from constants import EPSILON, FRESH_ALPHABET
+from passes import accessible, count_down, eliminate_units
+
+import metrics
+
+# Maximum amount of converted grammars kept in the CNF cache
+CNF_CACHE_SIZE = 256
+
+# Timing and size of one to_cnf pass
+CnfPass = namedtuple('CnfPass', ['name', 'seconds', 'rules_before', 'rules_after', 'new_non_terminals'])
+
+# First code point of the fresh names used once FRESH_ALPHABET is exhausted
+FRESH_CODE_POINTS = 0x4E00
+
+# canonical_hash() -> (non_terminals, rules, passes) of the converted grammar
+_cnf_cache = OrderedDict()
 
 
 class Grammar:
@@ -7,6 +26,7 @@ class Grammar:
         self.terminals = terminals
         self.rules = rules
         self.start = start
+        self._fresh_count = 0  # Fresh names tried by _create_new_non_terminal
 
     def print_rules(self):
         """
@@ -34,25 +54,7 @@ class Grammar:
         """
         Eliminate epsilon productions from the grammar.
         """
-        nullable = set()
-
-        # Find all nullable non-terminals
-        for non_terminal in self.non_terminals:
-            for production in self.rules[non_terminal]:
-                if production == EPSILON:
-                    nullable.add(non_terminal)
-
-        # Check for indirect nullable non-terminals
-        changes = True
-        while changes:
-            changes = False
-            for non_terminal in self.non_terminals:
-                if non_terminal not in nullable:
-                    for production in self.rules[non_terminal]:
-                        if all(symbol in nullable for symbol in production):
-                            nullable.add(non_terminal)
-                            changes = True
-                            break
+        nullable = self._nullable_non_terminals()
 
         # Eliminate epislon-productions
         new_rules = {}
@@ -67,6 +69,19 @@ class Grammar:
 
         self.rules = new_rules
 
+    def _nullable_non_terminals(self):
+        """
+        Find the nullable non-terminals: those with an epsilon production, then
+        those with a production made only of nullable non-terminals.
+        """
+        non_terminals = set(self.non_terminals)
+        return count_down((), (
+            (non_terminal, '' if production == EPSILON else production)
+            for non_terminal in self.non_terminals
+            for production in self.rules[non_terminal]
+            if production == EPSILON or all(symbol in non_terminals for symbol in production)
+        ))
+
     def _expand_nullable_prod(self, production, nullable):
         """
         Expand a production by replacing nullable non-terminals with epsilon.
@@ -90,143 +105,118 @@ class Grammar:
         """
         Eliminate renaming productions (unit productions) from the grammar.
         """
-
-        # Track the changes to avoid re-processing unit productions
-        changes = True
-        while changes:
-            changes = False
-            for non_terminal in self.non_terminals:
-                # Filter out unit productions
-                unit_productions = [
-                    p for p in self.rules[non_terminal] if p in self.non_terminals]
-                for unit in unit_productions:
-                    # Add the productions of the unit non-terminal, replacing the unit production
-                    new_productions = self.rules[unit]
-                    if new_productions:
-                        self.rules[non_terminal].extend(new_productions)
-                        self.rules[non_terminal].remove(unit)
-                        # Make sure to remove any duplicates
-                        self.rules[non_terminal] = list(
-                            set(self.rules[non_terminal]))
-                        changes = True
-
-                # After processing the unit productions for a non-terminal, filter them out
-                self.rules[non_terminal] = [
-                    p for p in self.rules[non_terminal] if p not in self.non_terminals]
+        non_terminals = set(self.non_terminals)
+        units = {
+            nt: [p for p in self.rules.get(nt, ()) if p in non_terminals]
+            for nt in self.non_terminals
+        }
+        eliminate_units(self.rules, units, non_terminals.__contains__)
 
     def eliminate_inaccessible_symbols(self):
         """
         Eliminate inaccessible symbols from the grammar.
         """
-        accessible = {self.start}
-        changes = True  # Flag to check if there were changes in the last iteration
-        old_rules = self.rules.copy()
+        accessible = self._accessible_non_terminals()
 
-        while changes:
-            changes = False
-            for non_terminal in accessible.copy():
-                for production in self.rules[non_terminal]:
-                    for symbol in production:
-                        if symbol in self.non_terminals and symbol not in accessible:
-                            accessible.add(symbol)
-                            changes = True
+        self.non_terminals = [nt for nt in self.non_terminals if nt in accessible]
+        self.rules = {nt: prods for nt, prods in self.rules.items() if nt in accessible}
 
-        self.non_terminals = list(accessible)
-        self.rules = {nt: old_rules[nt] for nt in accessible}
+    def _accessible_non_terminals(self):
+        """
+        Find the non-terminals reachable from the start symbol.
+        """
+        return accessible(self.start, self.rules, set(self.non_terminals))
 
     def eliminate_non_productive_symbols(self):
         """
         Eliminate non-productive symbols from the grammar.
         """
-        productive = {self.start}
-        changes = True
-
-        while changes:
-            changes = False
-            for non_terminal in self.non_terminals:
-                if non_terminal not in productive:
-                    for production in self.rules[non_terminal]:
-                        if all(symbol in self.terminals or symbol in productive for symbol in production):
-                            productive.add(non_terminal)
-                            changes = True
-                            break
+        productive = self._productive_non_terminals()
+        terminals = set(self.terminals)
 
-        self.non_terminals = list(productive)
+        self.non_terminals = [nt for nt in self.non_terminals if nt in productive]
+        if self.start not in self.non_terminals:
+            self.non_terminals.insert(0, self.start)
 
         # Create a new dictionary to store the updated rules
         updated_rules = {}
-        for nt in productive:
+        for nt in self.non_terminals:
             productive_rules = []
 
             # Check each production for this non-terminal
-            for production in self.rules[nt]:
+            for production in self.rules.get(nt, []):
                 # Verify if every symbol in the production is either a terminal
                 # or a productive non-terminal (i.e., it leads to a terminal string)
-                if all(symbol in self.terminals or symbol in productive for symbol in production):
+                if production == EPSILON or all(symbol in terminals or symbol in productive for symbol in production):
                     productive_rules.append(production)
 
             updated_rules[nt] = productive_rules
 
         self.rules = updated_rules
 
-    def _create_new_non_terminal(self):
-        alphabet = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZαβγδζηθικλμνξοπρστυφχψω'
-
-        # First, try to find a single unused letter from the Latin alphabet
-        for letter in alphabet:
-            if letter not in self.non_terminals:
-                self.non_terminals.append(letter)
-                return letter
-
-        # If all single letters are used, start combining them with numbers
-        for letter in alphabet:
-            for num in range(100):  # Assuming 100 is enough to avoid conflicts
-                new_symbol = f'{letter}{num}'
-                if new_symbol not in self.non_terminals:
-                    self.non_terminals.append(new_symbol)
-                    return new_symbol
-
-        # If all combinations are exhausted, raise an error
-        raise ValueError("Exhausted all possible non-terminal symbols.")
-
-    def to_cnf(self, print_steps=True):
+    def _productive_non_terminals(self):
         """
-        Convert the grammar to Chomsky Normal Form (CNF).
+        Find the productive non-terminals: those with an epsilon production or
+        a production whose non-terminals are all productive. The start symbol
+        is always kept.
+        """
+        terminals = set(self.terminals)
+        non_terminals = set(self.non_terminals)
+        return count_down({self.start}, (
+            (non_terminal, '' if production == EPSILON else
+             [symbol for symbol in production if symbol not in terminals])
+            for non_terminal in self.non_terminals
+            for production in self.rules[non_terminal]
+            if production == EPSILON or all(symbol in terminals or symbol in non_terminals for symbol in production)
+        ))
+
+    @staticmethod
+    def _fresh_name(index):
+        """
+        index-th candidate name for a new non-terminal: FRESH_ALPHABET, then
+        single characters from FRESH_CODE_POINTS on, skipping surrogates, so
+        productions stay strings of one character per symbol.
+        """
+        if index < len(FRESH_ALPHABET):
+            return FRESH_ALPHABET[index]
+        code = FRESH_CODE_POINTS + index - len(FRESH_ALPHABET)
+        if code >= 0xD800:
+            code += 0x800
+        if code > 0x10FFFF:
+            raise ValueError("Exhausted all possible non-terminal symbols.")
+        return chr(code)
+
+    def _taken_names(self):
+        return set(self.non_terminals) | set(self.rules) | set(self.terminals) | {EPSILON}
+
+    def _create_new_non_terminal(self, taken=None):
+        """
+        Allocates a fresh non-terminal from a counter, so every candidate is
+        looked at once. taken is the set of names in use, which a pass creating
+        several non-terminals builds once and passes to every call.
+        """
+        if taken is None:
+            taken = self._taken_names()
+        while True:
+            name = self._fresh_name(self._fresh_count)
+            self._fresh_count += 1
+            if name not in taken:
+                taken.add(name)
+                self.non_terminals.append(name)
+                return name
+
+    def _binarize(self):
+        """
+        Split productions longer than two symbols into chains of two-symbol
+        productions, sharing the new non-terminal of a repeated leading pair.
         """
-        if self.is_cnf():
-            return
-
-        self.eliminate_epsilon_productions()
-        if print_steps:
-            print('1. After eliminating epsilon productions:')
-            self.print_rules()
-            print()
-
-        self.eliminate_renaming()
-        if print_steps:
-            print('2. After eliminating renaming productions:')
-            self.print_rules()
-            print()
-
-        self.eliminate_inaccessible_symbols()
-        if print_steps:
-            print('3. After eliminating inaccessible symbols:')
-            self.print_rules()
-            print()
-
-        self.eliminate_non_productive_symbols()
-        if print_steps:
-            print('4. After eliminating non-productive symbols:')
-            self.print_rules()
-            print()
-
-        # Additional steps to convert to CNF
         rhs_to_non_terminal = {}
-        old_non_terminals = list(self.rules)
+        taken = self._taken_names()
 
         new_rules = {}
+        split_rules = {}
         for non_terminal in list(self.rules):
-            new_rules[non_terminal] = set()
+            productions = {}
             for production in self.rules[non_terminal]:
                 # Case for productions with more than 2 symbols
                 while len(production) > 2:
@@ -236,15 +226,28 @@ class Grammar:
                     if first_two_symbols in rhs_to_non_terminal:
                         new_non_terminal = rhs_to_non_terminal[first_two_symbols]
                     else:
-                        new_non_terminal = self._create_new_non_terminal()
-                        new_rules[new_non_terminal] = {first_two_symbols}
+                        new_non_terminal = self._create_new_non_terminal(taken)
+                        split_rules[new_non_terminal] = [first_two_symbols]
                         rhs_to_non_terminal[first_two_symbols] = new_non_terminal
                     # Replace the first two symbols with the new non-terminal
                     production = new_non_terminal + production[2:]
 
-                new_rules[non_terminal].add(production)
+                productions[production] = None
+            new_rules[non_terminal] = list(productions)
+
+        # Keep the original order, followed by the new non-terminals
+        new_rules.update(split_rules)
+        self.rules = new_rules
+
+    def _replace_terminals(self):
+        """
+        Replace the terminals of two-symbol productions with new non-terminals
+        deriving only that terminal.
+        """
+        terminal_to_non_terminal = {}
+        taken = self._taken_names()
 
-        # Handle mixed productions
+        new_rules = {nt: set(productions) for nt, productions in self.rules.items()}
         for non_terminal, productions in list(new_rules.items()):
             temp_productions = productions.copy()
             for production in temp_productions:
@@ -252,23 +255,97 @@ class Grammar:
                     new_production = []
                     for symbol in production:
                         if symbol in self.terminals:
-                            if symbol in rhs_to_non_terminal:
-                                new_non_terminal = rhs_to_non_terminal[symbol]
+                            if symbol in terminal_to_non_terminal:
+                                new_non_terminal = terminal_to_non_terminal[symbol]
                             else:
-                                new_non_terminal = self._create_new_non_terminal()
+                                new_non_terminal = self._create_new_non_terminal(taken)
                                 new_rules[new_non_terminal] = {symbol}
-                                rhs_to_non_terminal[symbol] = new_non_terminal
+                                terminal_to_non_terminal[symbol] = new_non_terminal
                             new_production.append(new_non_terminal)
                         else:
                             new_production.append(symbol)
                     productions.remove(production)
                     productions.add(''.join(new_production))
 
-        # Reorder the rules to match the original order + new non-terminals
-        self.rules = {nt: new_rules[nt] for nt in old_non_terminals +
-                      list(set(new_rules) - set(old_non_terminals))}
+        self.rules = new_rules
+
+    def rule_count(self):
+        return sum(len(productions) for productions in self.rules.values())
+
+    def canonical_hash(self):
+        """
+        Hash of the grammar that does not depend on the order of its
+        non-terminals, terminals or productions.
+        """
+        canonical = (
+            self.start,
+            sorted(map(repr, self.terminals)),
+            sorted(map(repr, self.non_terminals)),
+            sorted((repr(nt), sorted(map(repr, prods))) for nt, prods in self.rules.items()),
+        )
+        return hashlib.sha256(repr(canonical).encode()).hexdigest()
+
+    @metrics.instrumented(rules=lambda result, self, *args, **kwargs: self.rule_count())
+    def to_cnf(self, print_steps=True, use_cache=True):
+        """
+        Convert the grammar to Chomsky Normal Form (CNF).
+
+        Long productions are split before epsilon productions are eliminated,
+        so expanding nullable symbols only ever sees productions of at most two
+        symbols and epsilon elimination grows the grammar linearly.
 
-        if print_steps:
-            print('5. After converting to CNF:')
-            self.print_rules()
-            print()
\ No newline at end of file
+        Returns one CnfPass per pass. Converted grammars are cached by their
+        canonical hash; a cache hit is reported as a single 'cache hit' pass.
+        """
+        if self.is_cnf():
+            return []
+
+        started = time.perf_counter()
+        key = self.canonical_hash() if use_cache else None
+        if key in _cnf_cache:
+            _cnf_cache.move_to_end(key)
+            non_terminals, rules, passes = _cnf_cache[key]
+            rules_before = self.rule_count()
+            self.non_terminals = list(non_terminals)
+            self.rules = {nt: set(productions) for nt, productions in rules.items()}
+            if print_steps:
+                print('Converted grammar found in the CNF cache:')
+                self.print_rules()
+                print()
+            new_non_terminals = [nt for pass_stats in passes for nt in pass_stats.new_non_terminals]
+            return [CnfPass('cache hit', time.perf_counter() - started, rules_before,
+                            self.rule_count(), new_non_terminals)]
+
+        steps = [
+            ('splitting long productions', self._binarize),
+            ('eliminating epsilon productions', self.eliminate_epsilon_productions),
+            ('eliminating renaming productions', self.eliminate_renaming),
+            ('eliminating inaccessible symbols', self.eliminate_inaccessible_symbols),
+            ('eliminating non-productive symbols', self.eliminate_non_productive_symbols),
+            ('converting to CNF', self._replace_terminals),
+        ]
+        passes = []
+        for number, (name, step) in enumerate(steps, start=1):
+            rules_before = self.rule_count()
+            non_terminals_before = set(self.rules)
+            pass_started = time.perf_counter()
+            step()
+            seconds = time.perf_counter() - pass_started
+            new_non_terminals = [nt for nt in self.rules if nt not in non_terminals_before]
+            passes.append(CnfPass(name, seconds, rules_before, self.rule_count(), new_non_terminals))
+
+            if print_steps:
+                print(f'{number}. After {name}:')
+                self.print_rules()
+                print()
+
+        if use_cache:
+            _cnf_cache[key] = (
+                tuple(self.non_terminals),
+                {nt: frozenset(productions) for nt, productions in self.rules.items()},
+                passes
+            )
+            if len(_cnf_cache) > CNF_CACHE_SIZE:
+                _cnf_cache.popitem(last=False)
+
+        return passes
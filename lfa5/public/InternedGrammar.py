@@ -0,0 +1,265 @@
+from constants import EPSILON
+from Grammar import Grammar
+from passes import accessible, count_down, eliminate_units
+
+import metrics
+
+
+class InternedGrammar:
+    """
+    Grammar with interned symbols: every symbol is an integer id, every
+    production a tuple of ids and all membership checks go through sets and
+    dicts. Epsilon is the empty tuple.
+    """
+
+    def __init__(self):
+        self.names = []  # id -> symbol name
+        self.ids = {}  # symbol name -> id
+        self.terminals = set()
+        self.non_terminals = {}  # Ordered set of non-terminal ids
+        self.rules = {}
+        self.start = None
+        self._fresh_count = 0  # Fresh names tried by new_non_terminal
+
+    @classmethod
+    def from_rules(cls, non_terminals, terminals, rules, start='S'):
+        """
+        Builds the grammar from symbol names. Productions are either strings
+        (one symbol per character, EPSILON for the empty production) or
+        sequences of symbol names.
+        """
+        grammar = cls()
+        for name in non_terminals:
+            grammar.non_terminals[grammar.intern(name)] = None
+        for name in terminals:
+            grammar.terminals.add(grammar.intern(name))
+        for name, productions in rules.items():
+            non_terminal = grammar.intern(name)
+            grammar.non_terminals[non_terminal] = None
+            grammar.rules[non_terminal] = [
+                () if production == EPSILON else tuple(grammar.intern(symbol) for symbol in production)
+                for production in productions
+            ]
+        grammar.start = grammar.intern(start)
+        grammar.non_terminals[grammar.start] = None
+        return grammar
+
+    @classmethod
+    def from_grammar(cls, grammar):
+        return cls.from_rules(grammar.non_terminals, grammar.terminals, grammar.rules, grammar.start)
+
+    def to_grammar(self):
+        """
+        Converts back to a string Grammar. Productions are strings when every
+        symbol name is a single character and tuples of names otherwise.
+        """
+        return Grammar(
+            [self.names[nt] for nt in self.non_terminals],
+            [self.names[t] for t in sorted(self.terminals)],
+            {self.names[nt]: [self._production_value(p) for p in prods] for nt, prods in self.rules.items()},
+            self.names[self.start]
+        )
+
+    def intern(self, name):
+        """Returns the id of a symbol name, allocating one when it is new."""
+        symbol = self.ids.get(name)
+        if symbol is None:
+            symbol = len(self.names)
+            self.names.append(name)
+            self.ids[name] = symbol
+        return symbol
+
+    def new_non_terminal(self):
+        """
+        Allocates a fresh non-terminal with the same single-character names as
+        Grammar._create_new_non_terminal. Every candidate name is looked at
+        most once over the lifetime of the grammar, so this is amortized O(1).
+        """
+        while True:
+            name = Grammar._fresh_name(self._fresh_count)
+            self._fresh_count += 1
+            if name not in self.ids:
+                symbol = self.intern(name)
+                self.non_terminals[symbol] = None
+                return symbol
+
+    def _production_value(self, production):
+        if not production:
+            return EPSILON
+        names = [self.names[symbol] for symbol in production]
+        if all(len(name) == 1 for name in names):
+            return ''.join(names)
+        return tuple(names)
+
+    def print_rules(self):
+        """
+        Print the rules of the grammar in a human-readable format.
+        """
+        for non_terminal, productions in self.rules.items():
+            formatted = []
+            for production in productions:
+                value = self._production_value(production)
+                formatted.append(value if isinstance(value, str) else ' '.join(value))
+            print(f'{self.names[non_terminal]} -> {" | ".join(formatted)}')
+
+    def is_cnf(self):
+        """
+        Check if the grammar is in Chomsky Normal Form (CNF).
+        """
+        for productions in self.rules.values():
+            for production in productions:
+                if len(production) == 0 or len(production) > 2:
+                    return False
+                if len(production) == 1 and production[0] not in self.terminals:
+                    return False
+                if len(production) == 2 and any(symbol in self.terminals for symbol in production):
+                    return False
+
+        return True
+
+    def nullable_non_terminals(self):
+        non_terminals = self.non_terminals
+        return count_down((), (
+            (nt, production)
+            for nt, productions in self.rules.items()
+            for production in productions
+            if all(symbol in non_terminals for symbol in production)
+        ))
+
+    def productive_non_terminals(self):
+        non_terminals = self.non_terminals
+        return count_down((), (
+            (nt, [symbol for symbol in production if symbol not in self.terminals])
+            for nt, productions in self.rules.items()
+            for production in productions
+            if all(symbol in non_terminals or symbol in self.terminals for symbol in production)
+        ))
+
+    def accessible_non_terminals(self):
+        return accessible(self.start, self.rules, self.non_terminals)
+
+    def eliminate_epsilon_productions(self):
+        """
+        Eliminate epsilon productions from the grammar.
+        """
+        nullable = self.nullable_non_terminals()
+        for non_terminal, productions in self.rules.items():
+            expanded = {}
+            for production in productions:
+                if production:
+                    for expansion in self._expand_nullable_prod(production, nullable):
+                        expanded[expansion] = None
+            self.rules[non_terminal] = list(expanded)
+
+    def _expand_nullable_prod(self, production, nullable):
+        expansions = [()]
+        for symbol in production:
+            if symbol in nullable:
+                expansions = [e + (symbol,) for e in expansions] + expansions
+            else:
+                expansions = [e + (symbol,) for e in expansions]
+        return [expansion for expansion in expansions if expansion]
+
+    def eliminate_renaming(self):
+        """
+        Eliminate renaming productions (unit productions) from the grammar,
+        one strongly connected component of the unit graph at a time.
+        """
+        units = {
+            nt: [p[0] for p in productions if len(p) == 1 and p[0] in self.non_terminals]
+            for nt, productions in self.rules.items()
+        }
+        eliminate_units(self.rules, units, lambda p: len(p) == 1 and p[0] in self.non_terminals)
+
+    def eliminate_inaccessible_symbols(self):
+        """
+        Eliminate inaccessible symbols from the grammar.
+        """
+        accessible = self.accessible_non_terminals()
+        self.non_terminals = {nt: None for nt in self.non_terminals if nt in accessible}
+        self.rules = {nt: prods for nt, prods in self.rules.items() if nt in accessible}
+
+    def eliminate_non_productive_symbols(self):
+        """
+        Eliminate non-productive symbols from the grammar. The start symbol is
+        kept even when it is not productive.
+        """
+        productive = self.productive_non_terminals()
+        productive.add(self.start)
+        self.non_terminals = {nt: None for nt in self.non_terminals if nt in productive}
+        self.rules = {
+            nt: [p for p in prods if all(s in self.terminals or s in productive for s in p)]
+            for nt, prods in self.rules.items() if nt in productive
+        }
+
+    def _binarize(self):
+        """
+        Split productions longer than two symbols, sharing the new
+        non-terminal of every repeated leading pair.
+        """
+        pair_to_non_terminal = {}
+        for non_terminal in list(self.rules):
+            productions = {}
+            for production in self.rules[non_terminal]:
+                while len(production) > 2:
+                    pair = production[:2]
+                    new_non_terminal = pair_to_non_terminal.get(pair)
+                    if new_non_terminal is None:
+                        new_non_terminal = self.new_non_terminal()
+                        self.rules[new_non_terminal] = [pair]
+                        pair_to_non_terminal[pair] = new_non_terminal
+                    production = (new_non_terminal,) + production[2:]
+                productions[production] = None
+            self.rules[non_terminal] = list(productions)
+
+    def _replace_terminals(self):
+        """
+        Replace the terminals of two-symbol productions with non-terminals
+        deriving just that terminal.
+        """
+        terminal_to_non_terminal = {}
+        for non_terminal in list(self.rules):
+            productions = {}
+            for production in self.rules[non_terminal]:
+                if len(production) == 2:
+                    replaced = []
+                    for symbol in production:
+                        if symbol in self.terminals:
+                            new_non_terminal = terminal_to_non_terminal.get(symbol)
+                            if new_non_terminal is None:
+                                new_non_terminal = self.new_non_terminal()
+                                self.rules[new_non_terminal] = [(symbol,)]
+                                terminal_to_non_terminal[symbol] = new_non_terminal
+                            symbol = new_non_terminal
+                        replaced.append(symbol)
+                    production = tuple(replaced)
+                productions[production] = None
+            self.rules[non_terminal] = list(productions)
+
+    def rule_count(self):
+        return sum(len(productions) for productions in self.rules.values())
+
+    @metrics.instrumented(rules=lambda result, self, *args, **kwargs: self.rule_count())
+    def to_cnf(self, print_steps=True):
+        """
+        Convert the grammar to Chomsky Normal Form (CNF).
+        """
+        if self.is_cnf():
+            return
+
+        # Splitting long productions first keeps epsilon elimination from
+        # expanding all 2^k variants of a production with k nullable symbols.
+        steps = [
+            ('After splitting long productions', self._binarize),
+            ('After eliminating epsilon productions', self.eliminate_epsilon_productions),
+            ('After eliminating renaming productions', self.eliminate_renaming),
+            ('After eliminating inaccessible symbols', self.eliminate_inaccessible_symbols),
+            ('After eliminating non-productive symbols', self.eliminate_non_productive_symbols),
+            ('After converting to CNF', self._replace_terminals),
+        ]
+        for number, (title, step) in enumerate(steps, start=1):
+            step()
+            if print_steps:
+                print(f'{number}. {title}:')
+                self.print_rules()
+                print()
@@ -0,0 +1,328 @@
+"""Workloads of this lab for the benchmark runner at the root of the repository."""
+from CYKParser import CYKParser
+from EarleyParser import EarleyParser
+from Grammar import Grammar
+from InternedGrammar import InternedGrammar
+from constants import EPSILON
+from equivalence import random_grammar
+
+TERMINALS = ['a', 'b', 'c', 'd']
+
+
+def copy_grammar(grammar):
+    """Copy of a string grammar whose lists the passes can change."""
+    return Grammar(list(grammar.non_terminals), list(grammar.terminals),
+                   {non_terminal: list(productions) for non_terminal, productions in grammar.rules.items()},
+                   grammar.start)
+
+
+def names(count):
+    # Single CJK characters, so productions stay plain strings
+    return [chr(0x4E00 + i) for i in range(count)]
+
+
+def random_rules(size, rng):
+    """
+    size non-terminals named N0, N1, ..., five productions each, every
+    production being a tuple of symbol names. Long productions start with a
+    terminal, so epsilon elimination does not turn them into unit productions.
+    """
+    non_terminals = [f'N{i}' for i in range(size)]
+    rules = {}
+    for nt in non_terminals:
+        productions = [(rng.choice(TERMINALS),), EPSILON if rng.random() < 0.2 else (rng.choice(TERMINALS),) * 2]
+        for _ in range(3):
+            productions.append((rng.choice(TERMINALS),) + tuple(
+                rng.choice(TERMINALS) if rng.random() < 0.3 else non_terminals[rng.randrange(size)]
+                for _ in range(rng.randint(1, 4))
+            ))
+        rules[nt] = productions
+    return non_terminals, rules
+
+
+def cnf(rng):
+    grammars = [random_grammar(rng, max_non_terminals=8, max_productions=6, max_length=6) for _ in range(500)]
+
+    def run():
+        rules_before = rules_after = 0
+        for grammar in grammars:
+            copy = copy_grammar(grammar)
+            rules_before += copy.rule_count()
+            copy.to_cnf(print_steps=False, use_cache=False)
+            rules_after += copy.rule_count()
+        return {'grammars': len(grammars), 'rules_before': rules_before, 'rules_after': rules_after}
+
+    return run
+
+
+def cnf_random_rules(interned):
+    """
+    Large random rules converted by InternedGrammar, or by the string Grammar
+    with the non-terminals renamed to single characters.
+    """
+    def workload(rng):
+        non_terminals, rules = random_rules(2000, rng)
+        renamed = dict(zip(non_terminals, names(len(non_terminals))))
+        grammar = Grammar(list(renamed.values()), TERMINALS, {
+            renamed[nt]: [p if p == EPSILON else ''.join(renamed.get(s, s) for s in p) for p in productions]
+            for nt, productions in rules.items()
+        }, start=renamed['N0'])
+
+        def run():
+            if interned:
+                copy = InternedGrammar.from_rules(non_terminals, TERMINALS, rules, start='N0')
+                rules_before = copy.rule_count()
+                copy.to_cnf(print_steps=False)
+            else:
+                copy = copy_grammar(grammar)
+                rules_before = copy.rule_count()
+                copy.to_cnf(print_steps=False, use_cache=False)
+            return {'rules': rules_before, 'rules_after': copy.rule_count()}
+
+        return run
+
+    return workload
+
+
+def cache_grammar(size, rng):
+    """Random grammar with nullable symbols, unit productions and long productions."""
+    non_terminals = names(size)
+    rules = {}
+    for nt in non_terminals:
+        productions = [rng.choice(TERMINALS)]
+        if rng.random() < 0.2:
+            productions.append(EPSILON)
+        if rng.random() < 0.2:
+            productions.append(rng.choice(non_terminals))
+        for _ in range(2):
+            productions.append(rng.choice(TERMINALS) + ''.join(
+                rng.choice(TERMINALS + non_terminals) for _ in range(rng.randint(1, 3))))
+        rules[nt] = productions
+    return Grammar(non_terminals, TERMINALS, rules, start=non_terminals[0])
+
+
+def cnf_cached(rng):
+    """Converting a grammar already in the CNF cache."""
+    grammar = cache_grammar(200, rng)
+    copy_grammar(grammar).to_cnf(print_steps=False)
+
+    def run():
+        copy = copy_grammar(grammar)
+        rules_before = copy.rule_count()
+        copy.to_cnf(print_steps=False)
+        return {'rules': rules_before, 'rules_after': copy.rule_count()}
+
+    return run
+
+
+def chain_grammar(size):
+    """
+    Grammar with 5 * size productions where nullability, productivity and
+    reachability all propagate along one long chain.
+    """
+    non_terminals = names(size)
+    rules = {non_terminals[0]: ['a', EPSILON, 'b', 'ab', 'ba']}
+    for previous, non_terminal in zip(non_terminals, non_terminals[1:]):
+        rules[non_terminal] = [previous + 'a', 'b' + previous, previous + previous, 'ab' + previous, 'ba']
+    return Grammar(non_terminals, ['a', 'b'], rules, start=non_terminals[-1])
+
+
+def cleanup(rng):
+    grammar = chain_grammar(2000)
+
+    def run():
+        copy = copy_grammar(grammar)
+        rules_before = copy.rule_count()
+        copy.eliminate_epsilon_productions()
+        copy.eliminate_inaccessible_symbols()
+        copy.eliminate_non_productive_symbols()
+        return {'rules': rules_before, 'rules_after': copy.rule_count()}
+
+    return run
+
+
+def unit_chain(length):
+    """N0 -> N1 -> ... -> N(length-1), every non-terminal with two own productions."""
+    non_terminals = names(length)
+    rules = {}
+    for i, nt in enumerate(non_terminals):
+        rules[nt] = ['a' + nt, 'b' + nt]
+        if i + 1 < length:
+            rules[nt].append(non_terminals[i + 1])
+    return Grammar(non_terminals, ['a', 'b'], rules, start=non_terminals[0])
+
+
+def unit_cycles(count, size):
+    """count cycles of the given size, each cycle renaming into the next one."""
+    non_terminals = names(count * size)
+    rules = {}
+    for i, nt in enumerate(non_terminals):
+        cycle, position = divmod(i, size)
+        following = non_terminals[cycle * size + (position + 1) % size]
+        rules[nt] = ['a' + nt, following]
+        if position == 0 and cycle + 1 < count:
+            rules[nt].append(non_terminals[(cycle + 1) * size])
+    return Grammar(non_terminals, ['a', 'b'], rules, start=non_terminals[0])
+
+
+def renaming(make_grammar):
+    def workload(rng):
+        grammar = make_grammar()
+
+        def run():
+            copy = copy_grammar(grammar)
+            rules_before = copy.rule_count()
+            copy.eliminate_renaming()
+            return {'rules': rules_before, 'rules_after': copy.rule_count()}
+
+        return run
+
+    return workload
+
+
+def nullable_grammar(count):
+    """S -> N1 N2 ... Nk, every Ni -> ai | epsilon."""
+    non_terminals = names(count)
+    terminals = [chr(ord('a') + i % 26) for i in range(count)]
+    rules = {'S': [''.join(non_terminals)]}
+    for non_terminal, terminal in zip(non_terminals, terminals):
+        rules[non_terminal] = [terminal, EPSILON]
+    return Grammar(['S'] + non_terminals, sorted(set(terminals)), rules)
+
+
+def nullable(count, method):
+    """
+    A long production of nullable symbols through to_cnf, InternedGrammar, or
+    expanded before binarizing as the epsilon pass alone does, which gives 2^count
+    productions.
+    """
+    def workload(rng):
+        grammar = nullable_grammar(count)
+
+        def run():
+            if method == 'interned':
+                copy = InternedGrammar.from_grammar(grammar)
+                copy.to_cnf(print_steps=False)
+            else:
+                copy = copy_grammar(grammar)
+                if method == 'expand':
+                    copy.eliminate_epsilon_productions()
+                else:
+                    copy.to_cnf(print_steps=False, use_cache=False)
+            return {'rules': grammar.rule_count(), 'rules_after': copy.rule_count()}
+
+        return run
+
+    return workload
+
+
+# Balanced brackets over {a, b} in CNF: S -> SS | LR | LX, X -> SR, L -> a, R -> b
+BRACKETS = (['S', 'X', 'L', 'R'], ['a', 'b'], {'S': ['SS', 'LR', 'LX'], 'X': ['SR'], 'L': ['a'], 'R': ['b']})
+
+
+def naive_cyk(grammar, word):
+    """
+    Textbook CYK with a set of non-terminals per table cell.
+    """
+    n = len(word)
+    by_pair = {}
+    by_terminal = {}
+    for non_terminal, productions in grammar.rules.items():
+        for production in productions:
+            if len(production) == 1:
+                by_terminal.setdefault(production, set()).add(non_terminal)
+            else:
+                by_pair.setdefault((production[0], production[1]), set()).add(non_terminal)
+
+    table = [[set() for _ in range(n + 1)] for _ in range(n)]
+    for i, symbol in enumerate(word):
+        table[i][1] = set(by_terminal.get(symbol, ()))
+
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            cell = table[i][length]
+            for split in range(1, length):
+                for left in table[i][split]:
+                    for right in table[i + split][length - split]:
+                        cell.update(by_pair.get((left, right), ()))
+
+    return grammar.start in table[0][n]
+
+
+def balanced_word(length, rng):
+    """Random balanced word of the given (even) length."""
+    word = []
+    open_count = 0
+    remaining = length
+    while remaining:
+        if open_count and (open_count == remaining or rng.random() < 0.5):
+            word.append('b')
+            open_count -= 1
+        else:
+            word.append('a')
+            open_count += 1
+        remaining -= 1
+    return ''.join(word)
+
+
+def cyk(naive):
+    def workload(rng):
+        grammar = Grammar(*BRACKETS)
+        parser = CYKParser(grammar)
+        word = balanced_word(300, rng)
+
+        def run():
+            accepted = naive_cyk(grammar, word) if naive else parser.recognize(word)
+            return {'characters': len(word), 'accepted': int(accepted)}
+
+        return run
+
+    return workload
+
+
+# non-terminals, terminals, rules, word of a given length
+PARSED_LANGUAGES = [
+    (['S'], ['a', 'b', 'c'], {'S': ['aS', 'bS', 'c']}, lambda n: 'ab' * ((n - 1) // 2) + 'a' * ((n - 1) % 2) + 'c'),
+    (['S'], ['a', 'b'], {'S': ['aSb', 'ab']}, lambda n: 'a' * (n // 2) + 'b' * (n // 2)),
+]
+
+
+def parse_language(use_cyk):
+    """Recognizing words of a right recursive and a nested grammar with Earley, or CYK after converting to CNF."""
+    def workload(rng):
+        parsers = []
+        words = []
+        for non_terminals, terminals, rules, make_word in PARSED_LANGUAGES:
+            grammar = Grammar(non_terminals, terminals, rules)
+            if use_cyk:
+                grammar.to_cnf(print_steps=False)
+                parsers.append(CYKParser(grammar))
+            else:
+                parsers.append(EarleyParser(grammar))
+            words.append(make_word(500))
+
+        def run():
+            accepted = sum(parser.recognize(word) for parser, word in zip(parsers, words))
+            return {'characters': sum(map(len, words)), 'accepted': accepted}
+
+        return run
+
+    return workload
+
+
+WORKLOADS = {
+    'cnf': cnf,
+    'cnf_interned': cnf_random_rules(True),
+    'cnf_string': cnf_random_rules(False),
+    'cnf_cached': cnf_cached,
+    'cleanup': cleanup,
+    'renaming_chain': renaming(lambda: unit_chain(2000)),
+    'renaming_cycles': renaming(lambda: unit_cycles(10, 200)),
+    'nullable_to_cnf': nullable(28, 'to_cnf'),
+    'nullable_interned': nullable(28, 'interned'),
+    'nullable_expand_first': nullable(16, 'expand'),
+    'cyk': cyk(False),
+    'cyk_naive': cyk(True),
+    'earley': parse_language(False),
+    'earley_cnf_cyk': parse_language(True),
+}
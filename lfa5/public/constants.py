@@ -1 +1,4 @@
-EPSILON = 'ε'
\ No newline at end of file
+EPSILON = 'ε'
+
+# Names of new non-terminals, in the order they are tried
+FRESH_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZαβγδζηθικλμνξοπρστυφχψω'
@@ -0,0 +1,125 @@
+import copy
+import itertools
+import random
+
+from CYKParser import CYKParser
+from Grammar import Grammar
+from InternedGrammar import InternedGrammar
+from constants import EPSILON
+
+
+def random_grammar(rng, max_non_terminals=5, terminals=('a', 'b'), max_productions=4, max_length=4):
+    """
+    Random grammar with epsilon, unit, long and non-productive productions.
+    """
+    non_terminals = ['S'] + list('ABCDEFGH'[:rng.randint(0, max_non_terminals - 1)])
+    symbols = non_terminals + list(terminals)
+    rules = {}
+    for non_terminal in non_terminals:
+        productions = []
+        for _ in range(rng.randint(1, max_productions)):
+            kind = rng.random()
+            if kind < 0.1:
+                productions.append(EPSILON)
+            elif kind < 0.25:
+                productions.append(rng.choice(non_terminals))
+            else:
+                productions.append(''.join(rng.choice(symbols) for _ in range(rng.randint(1, max_length))))
+        rules[non_terminal] = list(dict.fromkeys(productions))
+    return Grammar(non_terminals, list(terminals), rules)
+
+
+def language_up_to(grammar, max_length):
+    """
+    All non-empty words of at most max_length symbols derivable from the start
+    symbol.
+
+    table[A][n] holds the words of length exactly n derived from A. Lengths are
+    filled in increasing order; within one length a fixed point is needed only
+    because of nullable and unit productions. Splits of a production over a
+    length are memoized per production suffix.
+    """
+    rules = {nt: [() if p == EPSILON else tuple(p) for p in prods] for nt, prods in grammar.rules.items()}
+    table = {nt: [set() for _ in range(max_length + 1)] for nt in rules}
+
+    def words(symbols, length, memo):
+        key = (symbols, length)
+        if key in memo:
+            return memo[key]
+        if not symbols:
+            result = {''} if length == 0 else set()
+        else:
+            first, rest = symbols[0], symbols[1:]
+            result = set()
+            if first in rules:
+                for first_length in range(length + 1):
+                    heads = table[first][first_length]
+                    if heads:
+                        tails = words(rest, length - first_length, memo)
+                        result.update(head + tail for head in heads for tail in tails)
+            elif length >= 1:
+                result.update(first + tail for tail in words(rest, length - 1, memo))
+        memo[key] = result
+        return result
+
+    for length in range(max_length + 1):
+        changed = True
+        while changed:
+            changed = False
+            memo = {}
+            for non_terminal, productions in rules.items():
+                for production in productions:
+                    new_words = words(production, length, memo) - table[non_terminal][length]
+                    if new_words:
+                        table[non_terminal][length] |= new_words
+                        changed = True
+
+    if grammar.start not in table:
+        return set()
+    return set().union(*table[grammar.start][1:])
+
+
+def counterexamples(grammar, cnf, max_length):
+    """
+    Every non-empty word of at most max_length terminals on which the language
+    of grammar and the CNF recognizer for cnf disagree.
+    """
+    expected = language_up_to(grammar, max_length)
+    parser = CYKParser(cnf)
+
+    result = []
+    for length in range(1, max_length + 1):
+        for word in map(''.join, itertools.product(grammar.terminals, repeat=length)):
+            if parser.recognize(word) != (word in expected):
+                result.append(word)
+    return result
+
+
+def cnf_counterexamples(grammar, max_length, interned=False):
+    """
+    Converts a copy of the grammar to CNF, with Grammar.to_cnf or
+    InternedGrammar.to_cnf, and returns the words the conversion got wrong.
+    """
+    if interned:
+        converted = InternedGrammar.from_grammar(grammar)
+        converted.to_cnf(print_steps=False)
+        cnf = converted.to_grammar()
+    else:
+        cnf = copy.deepcopy(grammar)
+        cnf.to_cnf(print_steps=False, use_cache=False)
+    return counterexamples(grammar, cnf, max_length)
+
+
+def check_random_grammars(count, max_length=5, seed=0, interned=False):
+    """
+    Runs cnf_counterexamples over count random grammars and returns the
+    (grammar, counterexamples) pairs that failed.
+    """
+    rng = random.Random(seed)
+    failures = []
+    for _ in range(count):
+        grammar = random_grammar(rng)
+        counterexamples = cnf_counterexamples(grammar, max_length, interned)
+        if counterexamples:
+            failures.append((grammar, counterexamples))
+    return failures
@@ -0,0 +1,14 @@
+"""Grammars shared by the tests of this lab."""
+from constants import EPSILON
+from Grammar import Grammar
+
+
+def variant_grammar():
+    """Fresh copy of the variant 15 grammar, which the tests are free to change."""
+    return Grammar(['S', 'A', 'B', 'C', 'D'], ['a', 'b'], {
+        'S': ['AC', 'bA', 'B', 'aA'],
+        'A': [EPSILON, 'aS', 'ABab'],
+        'B': ['a', 'bS'],
+        'C': ['abC'],
+        'D': ['AB']
+    })
@@ -0,0 +1,86 @@
+"""
+Simplification passes shared by Grammar and InternedGrammar. They only look
+at productions as sequences of symbols, so both representations use them.
+"""
+
+from graphs import strongly_connected_components
+
+
+def count_down(seeds, candidates):
+    """
+    Worklist fixed point of the nullable and productive computations.
+    candidates yields (non_terminal, pending symbols) pairs, and a
+    non-terminal is added once all pending symbols of one of its productions
+    are in the result. Each production keeps a counter of its pending
+    symbols, and each new member only decrements the productions using it.
+    """
+    result = set(seeds)
+    worklist = list(result)
+    remaining = []  # [non_terminal, pending symbols not in the result yet] per production
+    users = {}  # Symbol -> ids of the productions waiting for it
+
+    for non_terminal, pending in candidates:
+        if non_terminal in result:
+            continue
+        if not pending:
+            result.add(non_terminal)
+            worklist.append(non_terminal)
+            continue
+        remaining.append([non_terminal, len(pending)])
+        for symbol in pending:
+            users.setdefault(symbol, []).append(len(remaining) - 1)
+
+    while worklist:
+        symbol = worklist.pop()
+        for production_id in users.get(symbol, ()):
+            counter = remaining[production_id]
+            counter[1] -= 1
+            if counter[1] == 0 and counter[0] not in result:
+                result.add(counter[0])
+                worklist.append(counter[0])
+
+    return result
+
+
+def accessible(start, rules, non_terminals):
+    """Non-terminals reachable from start, visiting every production once."""
+    result = {start}
+    worklist = [start]
+    while worklist:
+        for production in rules.get(worklist.pop(), ()):
+            for symbol in production:
+                if symbol in non_terminals and symbol not in result:
+                    result.add(symbol)
+                    worklist.append(symbol)
+    return result
+
+
+def eliminate_units(rules, units, is_unit):
+    """
+    Replaces the unit productions of rules by the productions they lead to.
+    units maps every non-terminal to the non-terminals of its unit
+    productions, and is_unit tells those productions apart. Every
+    non-terminal of a unit cycle derives the same productions, so they are
+    computed once per strongly connected component; components come in
+    reverse topological order, so the ones reachable through unit
+    productions are already done.
+    """
+    component_of = {}
+    inherited = []
+    for component in strongly_connected_components(units):
+        index = len(inherited)
+        productions = {}
+        for nt in component:
+            component_of[nt] = index
+            for production in rules.get(nt, ()):
+                if not is_unit(production):
+                    productions[production] = None
+        for nt in component:
+            for unit in units.get(nt, ()):
+                if component_of[unit] != index:
+                    productions.update(inherited[component_of[unit]])
+        inherited.append(productions)
+
+        for nt in component:
+            if nt in rules:
+                rules[nt] = list(productions)
@@ -0,0 +1,51 @@
+import unittest
+
+from CYKParser import CYKParser
+from Grammar import Grammar
+from constants import EPSILON
+
+
+class TestCYKParser(unittest.TestCase):
+    def setUp(self):
+        # a^n b^n, n >= 1
+        non_terminals = ['S', 'X', 'A', 'B']
+        terminals = ['a', 'b']
+        rules = {
+            'S': ['AB', 'AX'],
+            'X': ['SB'],
+            'A': ['a'],
+            'B': ['b'],
+        }
+        self.grammar = Grammar(non_terminals, terminals, rules)
+        self.parser = CYKParser(self.grammar)
+
+    def test_recognize(self):
+        self.assertTrue(self.parser.recognize('ab'))
+        self.assertTrue(self.parser.recognize('aaabbb'))
+        self.assertFalse(self.parser.recognize('aabbb'))
+        self.assertFalse(self.parser.recognize('ba'))
+        self.assertFalse(self.parser.recognize('abc'))
+        self.assertFalse(self.parser.recognize(''))
+
+    def test_parse_tree(self):
+        accepted, tree = self.parser.parse('aabb', build_tree=True)
+        self.assertTrue(accepted)
+        self.assertEqual(tree, ('S', ('A', 'a'), ('X', ('S', ('A', 'a'), ('B', 'b')), ('B', 'b'))))
+        self.assertEqual(self.parser.parse('aab', build_tree=True), (False, None))
+
+    def test_rejects_non_cnf(self):
+        self.grammar.rules['X'] = ['SBB']
+        with self.assertRaises(ValueError):
+            CYKParser(self.grammar)
+
+    def test_after_to_cnf(self):
+        grammar = Grammar(['S', 'A'], ['a', 'b'], {'S': ['aSb', 'A'], 'A': ['ab', EPSILON]})
+        grammar.to_cnf(print_steps=False)
+        parser = CYKParser(grammar)
+        self.assertTrue(parser.recognize('ab'))
+        self.assertTrue(parser.recognize('aaabbb'))
+        self.assertFalse(parser.recognize('abab'))
+
+
+if __name__ == '__main__':
+    unittest.main()
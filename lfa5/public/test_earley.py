@@ -0,0 +1,42 @@
+import unittest
+
+from EarleyParser import EarleyParser
+from Grammar import Grammar
+from constants import EPSILON
+from fixtures import variant_grammar
+
+
+class TestEarleyParser(unittest.TestCase):
+    def setUp(self):
+        # Used as is, epsilon productions included
+        self.grammar = variant_grammar()
+        self.parser = EarleyParser(self.grammar)
+
+    def test_nullable(self):
+        self.assertEqual(self.parser.nullable, {'A'})
+
+    def test_recognize(self):
+        self.assertTrue(self.parser.recognize('a'))
+        self.assertTrue(self.parser.recognize('b'))
+        self.assertTrue(self.parser.recognize('ba'))
+        self.assertTrue(self.parser.recognize('aaab'))
+        self.assertFalse(self.parser.recognize('ab'))
+        self.assertFalse(self.parser.recognize(''))
+        self.assertFalse(self.parser.recognize('abc'))
+
+    def test_empty_word(self):
+        grammar = Grammar(['S'], ['a', 'b'], {'S': ['SS', 'aSb', EPSILON]})
+        parser = EarleyParser(grammar)
+        self.assertTrue(parser.recognize(''))
+        self.assertTrue(parser.recognize('aabbab'))
+        self.assertFalse(parser.recognize('abba'))
+
+    def test_long_right_recursion(self):
+        grammar = Grammar(['S'], ['a', 'b'], {'S': ['aS', 'b']})
+        parser = EarleyParser(grammar)
+        self.assertTrue(parser.recognize('a' * 5000 + 'b'))
+        self.assertFalse(parser.recognize('a' * 5000))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from Grammar import Grammar
+from constants import EPSILON
+from equivalence import check_random_grammars, cnf_counterexamples, counterexamples, language_up_to
+from fixtures import variant_grammar
+
+
+class TestEquivalence(unittest.TestCase):
+    def setUp(self):
+        self.grammar = variant_grammar()
+
+    def test_language_up_to(self):
+        grammar = Grammar(['S'], ['a', 'b'], {'S': ['aSb', EPSILON]})
+        self.assertEqual(language_up_to(grammar, 6), {'ab', 'aabb', 'aaabbb'})
+        self.assertEqual(language_up_to(self.grammar, 3),
+                         {'a', 'b', 'ba', 'bb', 'aaa', 'aab', 'baa', 'bab', 'bba', 'bbb'})
+
+    def test_variant_cnf(self):
+        self.assertEqual(cnf_counterexamples(self.grammar, 7), [])
+        self.assertEqual(cnf_counterexamples(self.grammar, 7, interned=True), [])
+
+    def test_detects_wrong_conversion(self):
+        grammar = Grammar(['S'], ['a', 'b'], {'S': ['aSb', 'ab']})
+        # Missing the base case and accepting b on its own
+        wrong = Grammar(['S', 'X', 'A', 'B'], ['a', 'b'], {
+            'S': ['AX', 'b'], 'X': ['SB'], 'A': ['a'], 'B': ['b']
+        })
+        self.assertEqual(counterexamples(grammar, wrong, 4), ['b', 'ab', 'abb', 'aabb'])
+
+    def test_random_grammars(self):
+        self.assertEqual(check_random_grammars(500, max_length=5, seed=15), [])
+
+    def test_random_grammars_interned(self):
+        self.assertEqual(check_random_grammars(500, max_length=5, seed=16, interned=True), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,22 +1,17 @@
+import copy
+import itertools
 import unittest
 
+from CYKParser import CYKParser
+from EarleyParser import EarleyParser
 from Grammar import Grammar
-from constants import EPSILON
+from constants import EPSILON, FRESH_ALPHABET
+from fixtures import variant_grammar
 
 
 class TestGrammar(unittest.TestCase):
     def setUp(self):
-        # variant 15 grammar
-        non_terminals = ['S', 'A', 'B', 'C', 'D']
-        terminals = ['a', 'b']
-        rules = {
-            'S': ['AC', 'bA', 'B', 'aA'],
-            'A': [EPSILON, 'aS', 'ABab'],
-            'B': ['a', 'bS'],
-            'C': ['abC'],
-            'D': ['AB']
-        }
-        self.grammar = Grammar(non_terminals, terminals, rules)
+        self.grammar = variant_grammar()
 
     def test_initial_grammar(self):
         self.assertEqual(self.grammar.non_terminals, ['S', 'A', 'B', 'C', 'D'])
@@ -55,6 +50,34 @@ class TestGrammar(unittest.TestCase):
                 self.assertTrue(all(
                     symbol in self.grammar.terminals or symbol in self.grammar.non_terminals for symbol in prod))
 
+    def test_eliminate_renaming_cycles(self):
+        grammar = Grammar(['S', 'A', 'B'], ['a', 'b'], {
+            'S': ['A', 'ab'],
+            'A': ['B', 'a'],
+            'B': ['A', 'S', 'b'],
+        })
+        grammar.eliminate_renaming()
+        for nt in ['S', 'A', 'B']:
+            self.assertEqual(set(grammar.rules[nt]), {'ab', 'a', 'b'})
+            self.assertEqual(len(grammar.rules[nt]), 3)
+
+    def test_cleanup_long_chain(self):
+        # N0 -> ε | Z, Ni -> N(i-1)N(i-1) | aZ, with Z non-productive and
+        # every Ni productive through N0 -> ε
+        non_terminals = [chr(0x4E00 + i) for i in range(500)] + ['Z']
+        rules = {non_terminals[0]: [EPSILON, 'Z'], 'Z': ['aZ']}
+        for previous, nt in zip(non_terminals, non_terminals[1:-1]):
+            rules[nt] = [previous + previous, 'aZ']
+        grammar = Grammar(non_terminals, ['a'], rules, start=non_terminals[-2])
+
+        self.assertEqual(grammar._nullable_non_terminals(), set(non_terminals[:-1]))
+        self.assertEqual(grammar._accessible_non_terminals(), set(non_terminals))
+        self.assertEqual(grammar._productive_non_terminals(), set(non_terminals[:-1]))
+
+        grammar.eliminate_non_productive_symbols()
+        self.assertEqual(grammar.non_terminals, non_terminals[:-1])
+        self.assertEqual(grammar.rules[non_terminals[0]], [EPSILON])
+
     def test_is_cnf(self):
         self.assertFalse(self.grammar.is_cnf())
         self.grammar.to_cnf(print_steps=False)
@@ -72,6 +95,74 @@ class TestGrammar(unittest.TestCase):
                     self.assertTrue(
                         prod in self.grammar.terminals or prod == EPSILON)
 
+    def test_to_cnf_passes(self):
+        passes = self.grammar.to_cnf(print_steps=False, use_cache=False)
+        self.assertEqual(len(passes), 6)
+        self.assertEqual(passes[0].rules_before, 11)
+        self.assertEqual(passes[-1].rules_after, self.grammar.rule_count())
+        for previous, current in zip(passes, passes[1:]):
+            self.assertEqual(previous.rules_after, current.rules_before)
+        new_non_terminals = [nt for p in passes for nt in p.new_non_terminals]
+        self.assertEqual(set(new_non_terminals), set(self.grammar.rules) - {'S', 'A', 'B'})
+
+    def test_to_cnf_cache(self):
+        reordered = Grammar(list(reversed(self.grammar.non_terminals)), ['b', 'a'],
+                            {nt: list(reversed(prods)) for nt, prods in reversed(self.grammar.rules.items())})
+        self.assertEqual(reordered.canonical_hash(), self.grammar.canonical_hash())
+
+        self.grammar.to_cnf(print_steps=False)
+        passes = reordered.to_cnf(print_steps=False)
+        self.assertEqual([p.name for p in passes], ['cache hit'])
+        self.assertEqual(reordered.rules, self.grammar.rules)
+        self.assertEqual(reordered.non_terminals, self.grammar.non_terminals)
+
+        # The cached copy is not shared with the converted grammars
+        reordered.rules['S'].add('ab')
+        self.assertNotIn('ab', self.grammar.rules['S'])
+
+    def assertSameLanguage(self, original, cnf, terminals, max_length):
+        earley = EarleyParser(original)
+        cyk = CYKParser(cnf)
+        for length in range(1, max_length + 1):
+            for word in map(''.join, itertools.product(terminals, repeat=length)):
+                self.assertEqual(earley.recognize(word), cyk.recognize(word), word)
+
+    def test_to_cnf_preserves_language(self):
+        original = copy.deepcopy(self.grammar)
+        self.grammar.to_cnf(print_steps=False)
+        self.assertSameLanguage(original, self.grammar, 'ab', 7)
+
+    def test_to_cnf_long_nullable_production(self):
+        # S -> ABC...Ys, every letter deriving its lowercase terminal or epsilon
+        letters = list('ABCDEFGHIJKLMNOPQRTUVWXY')
+        rules = {'S': [''.join(letters) + 's']}
+        for letter in letters:
+            rules[letter] = [letter.lower(), EPSILON]
+        grammar = Grammar(['S'] + letters, [letter.lower() for letter in letters] + ['s'], rules)
+        original = copy.deepcopy(grammar)
+
+        grammar.to_cnf(print_steps=False)
+        self.assertTrue(grammar.is_cnf())
+        # Expanding the production before binarizing would give 2^24 variants
+        self.assertLess(sum(map(len, grammar.rules.values())), 1000)
+        self.assertSameLanguage(original, grammar, 'abcs', 4)
+
+    def test_to_cnf_many_new_non_terminals(self):
+        # S -> XYA for every pair XY of ten letters: binarizing needs 100 new
+        # names, more than there are characters in FRESH_ALPHABET
+        letters = list('ABCDEFGHIJ')
+        rules = {'S': [x + y + 'A' for x in letters for y in letters]}
+        for letter in letters:
+            rules[letter] = [letter.lower()]
+        grammar = Grammar(['S'] + letters, [letter.lower() for letter in letters], rules)
+        original = copy.deepcopy(grammar)
+
+        grammar.to_cnf(print_steps=False, use_cache=False)
+        self.assertTrue(grammar.is_cnf())
+        self.assertGreater(len(grammar.non_terminals), len(FRESH_ALPHABET))
+        self.assertTrue(all(len(nt) == 1 for nt in grammar.non_terminals))
+        self.assertSameLanguage(original, grammar, 'abcdefghij', 3)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+import unittest
+
+from CYKParser import CYKParser
+from Grammar import Grammar
+from InternedGrammar import InternedGrammar, metrics
+from constants import EPSILON
+from fixtures import variant_grammar
+
+
+class TestInternedGrammar(unittest.TestCase):
+    def setUp(self):
+        self.grammar = variant_grammar()
+        self.interned = InternedGrammar.from_grammar(self.grammar)
+
+    def test_round_trip(self):
+        grammar = self.interned.to_grammar()
+        self.assertEqual(grammar.non_terminals, self.grammar.non_terminals)
+        self.assertEqual(grammar.rules, self.grammar.rules)
+        self.assertEqual(grammar.start, 'S')
+
+    def test_interned_productions(self):
+        a = self.interned.ids['a']
+        s = self.interned.ids['S']
+        self.assertIn((a, s), self.interned.rules[self.interned.ids['A']])
+        self.assertIn((), self.interned.rules[self.interned.ids['A']])
+
+    def test_new_non_terminal(self):
+        fresh = {self.interned.names[self.interned.new_non_terminal()] for _ in range(200)}
+        self.assertEqual(len(fresh), 200)
+        self.assertFalse(fresh & {'S', 'A', 'B', 'C', 'D', 'a', 'b'})
+        # The same single characters as Grammar, so converted productions stay strings
+        self.assertTrue(all(len(name) == 1 for name in fresh))
+        self.assertEqual(fresh, {Grammar._fresh_name(i) for i in range(205)} - {'S', 'A', 'B', 'C', 'D'})
+
+    def test_to_cnf(self):
+        self.interned.to_cnf(print_steps=False)
+        self.assertTrue(self.interned.is_cnf())
+        parser = CYKParser(self.interned.to_grammar())
+        self.assertTrue(parser.recognize('aaab'))
+        self.assertFalse(parser.recognize('ab'))
+
+    def test_to_cnf_metrics(self):
+        metrics.reset()
+        metrics.enable()
+        try:
+            self.interned.to_cnf(print_steps=False)
+        finally:
+            metrics.disable()
+        self.assertEqual(metrics.snapshot()['InternedGrammar.to_cnf']['rules'], self.interned.rule_count())
+        metrics.reset()
+
+    def test_multi_character_symbols(self):
+        grammar = InternedGrammar.from_rules(
+            ['Expr', 'Term'], ['x', '+'],
+            {'Expr': [('Term', '+', 'Expr'), ('Term',)], 'Term': [('x',)]},
+            start='Expr'
+        )
+        grammar.to_cnf(print_steps=False)
+        self.assertTrue(grammar.is_cnf())
+        parser = CYKParser(grammar.to_grammar())
+        self.assertTrue(parser.recognize(['x', '+', 'x', '+', 'x']))
+        self.assertFalse(parser.recognize(['x', '+']))
+
+    def test_to_cnf_long_nullable_production(self):
+        names = [f'N{i}' for i in range(30)]
+        rules = {'S': [tuple(names)]}
+        for name in names:
+            rules[name] = [(name.lower(),), EPSILON]
+        grammar = InternedGrammar.from_rules(['S'] + names, [name.lower() for name in names], rules)
+        grammar.to_cnf(print_steps=False)
+        self.assertTrue(grammar.is_cnf())
+        self.assertLess(sum(map(len, grammar.rules.values())), 2000)
+
+        parser = CYKParser(grammar.to_grammar())
+        self.assertTrue(parser.recognize(['n0', 'n7', 'n29']))
+        self.assertFalse(parser.recognize(['n7', 'n0']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+from types import MappingProxyType
+
+from TokenType import TokenType, enum
+
+# Shared read-only attributes of every node without any
+NO_ATTRIBUTES = MappingProxyType({})
+# Shared children of every CONTENT leaf, which never gets any
+NO_CHILDREN = ()
+
+
+def type_name(type):
+    """Name shown for a node type: the token type name, or the tag name."""
+    return type.name if isinstance(type, enum.Enum) else type
+
+
+def format_tree(node):
+    """
+    TYPE(value, [children...]) text of the tree at node, built with an explicit
+    stack so deep trees do not hit the recursion limit.
+    """
+    parts = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+        parts.append(f"{type_name(item.type)}({item.value}, [")
+        stack.append("])")
+        children = item.children
+        for i in range(len(children) - 1, -1, -1):
+            stack.append(children[i])
+            if i:
+                stack.append(", ")
+    return "".join(parts)
+
+
+class ASTNode:
+    __slots__ = ('type', 'value', 'children', 'attributes')
+
+    def __init__(self, type, children=None, value=None, attributes=None):
+        self.type = type
+        self.value = value
+        if children is None:
+            children = NO_CHILDREN if type is TokenType.CONTENT else []
+        self.children = children
+        self.attributes = attributes if attributes else NO_ATTRIBUTES
+
+    def __repr__(self):
+        return format_tree(self)
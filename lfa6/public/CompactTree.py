@@ -0,0 +1,130 @@
+from array import array
+
+from ASTNode import ASTNode, NO_ATTRIBUTES, format_tree
+from TokenType import TokenType
+
+
+class CompactTree:
+    """
+    AST stored as parallel arrays indexed by node id, node 0 being the ROOT.
+    Children are linked through first_child and next_sibling, -1 meaning none.
+    Node types are interned in type_names; attributes are only stored for the
+    nodes that have some.
+    """
+
+    def __init__(self):
+        self.type_names = []
+        self.type_ids = {}
+        self.types = array('H')
+        self.parents = array('i')
+        self.first_child = array('i')
+        self.last_child = array('i')
+        self.next_sibling = array('i')
+        self.values = []
+        self.node_attributes = {}
+        self.add(TokenType.HTML_OPEN, -1, "ROOT")
+
+    def add(self, type, parent, value=None, attributes=None):
+        """Appends a node as the last child of parent and returns its id."""
+        node = len(self.types)
+        type_id = self.type_ids.get(type)
+        if type_id is None:
+            type_id = self.type_ids[type] = len(self.type_names)
+            self.type_names.append(type)
+        self.types.append(type_id)
+        self.parents.append(parent)
+        self.first_child.append(-1)
+        self.last_child.append(-1)
+        self.next_sibling.append(-1)
+        self.values.append(value)
+        if attributes:
+            self.node_attributes[node] = attributes
+
+        if parent != -1:
+            previous = self.last_child[parent]
+            if previous == -1:
+                self.first_child[parent] = node
+            else:
+                self.next_sibling[previous] = node
+            self.last_child[parent] = node
+        return node
+
+    def __len__(self):
+        return len(self.types)
+
+    def type(self, node):
+        return self.type_names[self.types[node]]
+
+    def value(self, node):
+        return self.values[node]
+
+    def parent(self, node):
+        return self.parents[node]
+
+    def attributes(self, node):
+        return self.node_attributes.get(node, NO_ATTRIBUTES)
+
+    def children(self, node):
+        child = self.first_child[node]
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+    def __iter__(self):
+        """Node ids in document (pre-)order."""
+        return self.iter_subtree(0)
+
+    def view(self, node=0):
+        return NodeView(self, node)
+
+    def to_ast(self, node=0):
+        """Equivalent ASTNode tree of the subtree at node."""
+        nodes = {}
+        for current in self.iter_subtree(node):
+            ast_node = ASTNode(self.type(current), value=self.values[current], attributes=self.attributes(current))
+            nodes[current] = ast_node
+            if current != node:
+                nodes[self.parents[current]].children.append(ast_node)
+        return nodes[node]
+
+    def iter_subtree(self, node):
+        """Node ids of the subtree at node, in document order."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(list(self.children(current))))
+
+    def __repr__(self):
+        return repr(self.view())
+
+
+class NodeView:
+    """
+    ASTNode-like read-only view of one node of a CompactTree, with the same
+    repr as the ASTNode it stands for.
+    """
+    __slots__ = ('tree', 'node')
+
+    def __init__(self, tree, node):
+        self.tree = tree
+        self.node = node
+
+    @property
+    def type(self):
+        return self.tree.type(self.node)
+
+    @property
+    def value(self):
+        return self.tree.value(self.node)
+
+    @property
+    def attributes(self):
+        return self.tree.attributes(self.node)
+
+    @property
+    def children(self):
+        return [NodeView(self.tree, child) for child in self.tree.children(self.node)]
+
+    def __repr__(self):
+        return format_tree(self)
@@ -0,0 +1,120 @@
+from ASTNode import ASTNode
+from CompactTree import CompactTree
+from TokenType import TokenType
+
+
+class ContentHandler:
+    """
+    Receives the events of Parser.parse. Tags are the open token types for the
+    known elements, e.g. TokenType.P_OPEN for both <p> and </p>, and lowercase
+    names for any other element, e.g. 'div'.
+    """
+
+    def start_tag(self, tag, attributes):
+        pass
+
+    def end_tag(self, tag):
+        pass
+
+    def content(self, value):
+        pass
+
+    def close(self):
+        """Result returned by Parser.parse."""
+        return None
+
+
+class TreeBuilder(ContentHandler):
+    """
+    Builds the ASTNode tree under a ROOT node. With detach, every closed
+    element is removed from its parent and appended to closed instead.
+    """
+
+    def __init__(self, detach=False):
+        self.root = ASTNode(TokenType.HTML_OPEN, value="ROOT")
+        self.current_node = self.root
+        self.stack = [self.root]
+        self.detach = detach
+        self.closed = []
+
+    def start_tag(self, tag, attributes):
+        node = ASTNode(tag, attributes=attributes)
+        self.current_node.children.append(node)
+        self.stack.append(node)
+        self.current_node = node
+
+    def end_tag(self, tag):
+        node = self.stack.pop()
+        if self.stack:
+            self.current_node = self.stack[-1]
+        if self.detach:
+            if self.stack:
+                self.current_node.children.pop()
+            self.closed.append(node)
+
+    def content(self, value):
+        self.current_node.children.append(ASTNode(TokenType.CONTENT, value=value))
+
+    def close(self):
+        return self.root
+
+
+class SelectiveBuilder(ContentHandler):
+    """
+    Builds ASTNode subtrees only for the given tags, in document order. Tags
+    nested in a subtree that is already being built are part of it.
+    """
+
+    def __init__(self, tags):
+        self.tags = set(tags)
+        self.subtrees = []
+        self.stack = []
+
+    def start_tag(self, tag, attributes):
+        if self.stack:
+            node = ASTNode(tag, attributes=attributes)
+            self.stack[-1].children.append(node)
+            self.stack.append(node)
+        elif tag in self.tags:
+            node = ASTNode(tag, attributes=attributes)
+            self.subtrees.append(node)
+            self.stack.append(node)
+
+    def end_tag(self, tag):
+        if self.stack:
+            self.stack.pop()
+
+    def content(self, value):
+        if self.stack:
+            self.stack[-1].children.append(ASTNode(TokenType.CONTENT, value=value))
+
+    def close(self):
+        return self.subtrees
+
+
+class CompactTreeBuilder(ContentHandler):
+    """
+    Builds a CompactTree, which holds the same tree as TreeBuilder in a few
+    flat arrays instead of one object per node.
+    """
+
+    def __init__(self):
+        self.tree = CompactTree()
+        self.current_node = 0
+        self.stack = [0]
+
+    def start_tag(self, tag, attributes):
+        node = self.tree.add(tag, self.current_node, attributes=attributes)
+        self.stack.append(node)
+        self.current_node = node
+
+    def end_tag(self, tag):
+        self.stack.pop()
+        if self.stack:
+            self.current_node = self.stack[-1]
+
+    def content(self, value):
+        self.tree.add(TokenType.CONTENT, self.current_node, value)
+
+    def close(self):
+        return self.tree
@@ -0,0 +1,114 @@
+import re
+from collections import namedtuple
+
+from TokenType import TokenType
+
+import metrics
+
+TOKENS = [
+    (TokenType.HTML_OPEN, r'<html>'),
+    (TokenType.HTML_CLOSE, r'</html>'),
+    (TokenType.HEAD_OPEN, r'<head>'),
+    (TokenType.HEAD_CLOSE, r'</head>'),
+    (TokenType.TITLE_OPEN, r'<title>'),
+    (TokenType.TITLE_CLOSE, r'</title>'),
+    (TokenType.BODY_OPEN, r'<body>'),
+    (TokenType.BODY_CLOSE, r'</body>'),
+    (TokenType.H1_OPEN, r'<h1>'),
+    (TokenType.H1_CLOSE, r'</h1>'),
+    (TokenType.P_OPEN, r'<p>'),
+    (TokenType.P_CLOSE, r'</p>'),
+    # Any other tag, or a known one with attributes; '>' may appear inside quoted values
+    (TokenType.TAG_OPEN, r'<[A-Za-z][^\s/>]*(?:"[^"]*"|\'[^\']*\'|[^"\'>])*>'),
+    (TokenType.TAG_CLOSE, r'</[A-Za-z][^\s>]*\s*>'),
+    (TokenType.CONTENT, r'[^<]+'),  # Match any content not containing '<'
+]
+
+# Value of a TAG_OPEN token; void elements and tags ending in '/>' are self-closing
+Tag = namedtuple('Tag', ['name', 'attributes', 'self_closing'])
+
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+# One alternation over every token, tried in the order of TOKENS; the name of
+# the group that matched is the name of the token type
+MASTER_PATTERN = re.compile('|'.join(f'(?P<{token_type.name}>{regex})' for token_type, regex in TOKENS))
+WHITESPACE = re.compile(r'\s*')
+TAG_NAME = re.compile(r'</?([^\s/>]+)')
+# A tag cut off before its closing '>', possibly inside a quoted value
+PARTIAL_TAG = re.compile(r'<(?:"[^"]*(?:"|\Z)|\'[^\']*(?:\'|\Z)|[^"\'>])*\Z')
+ATTRIBUTE = re.compile(r'([^\s"\'>/=]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+)))?')
+
+# Characters read from a file at a time by stream_lexer
+CHUNK_SIZE = 1 << 16
+
+
+def _tag(text):
+    """
+    Tag of an open tag such as <a href="x" hidden>, with a lowercase name and
+    attribute values unquoted ('' for attributes without a value).
+    """
+    name_match = TAG_NAME.match(text)
+    name = name_match.group(1).lower()
+    attributes = {}
+    for match in ATTRIBUTE.finditer(text, name_match.end(), len(text) - 1):
+        double, single, bare = match.group(2, 3, 4)
+        attributes[match.group(1).lower()] = double if double is not None else single if single is not None else bare or ''
+    return Tag(name, attributes, text.endswith('/>') or name in VOID_ELEMENTS)
+
+
+def _scan(html, final):
+    """
+    Tokens of html and the position where scanning stopped. Unless final is
+    set, a tag or content that may continue past the end of html is left
+    unscanned.
+    """
+    tokens = []
+    pos = 0
+    end = len(html)
+    while True:
+        pos = WHITESPACE.match(html, pos).end()
+        if pos == end:
+            return tokens, pos
+        match = MASTER_PATTERN.match(html, pos)
+        if match is None:
+            if not final and PARTIAL_TAG.match(html, pos):
+                return tokens, pos
+            raise SyntaxError(f'Unknown HTML: {html[pos:pos + 80]}')
+        token_type = TokenType[match.lastgroup]
+        value = match.group()
+        if token_type is TokenType.CONTENT:
+            if not final and match.end() == end:
+                return tokens, pos
+            value = value.strip()
+        elif token_type is TokenType.TAG_OPEN:
+            value = _tag(value)
+        elif token_type is TokenType.TAG_CLOSE:
+            value = TAG_NAME.match(value).group(1).lower()
+        tokens.append((token_type, value))
+        pos = match.end()
+
+
+@metrics.instrumented(tokens=lambda tokens, html: len(tokens), characters=lambda tokens, html: len(html))
+def lexer(html):
+    """
+    Splits the document into (TokenType, value) pairs. Whitespace between
+    tokens is skipped and content values are stripped. The value of a
+    TAG_OPEN is a Tag and the value of a TAG_CLOSE is the tag name.
+    """
+    return _scan(html, True)[0]
+
+
+def stream_lexer(file, chunk_size=CHUNK_SIZE):
+    """
+    Yields the tokens of a text file read chunk_size characters at a time. A
+    tag or content cut by a chunk boundary is carried over to the next chunk.
+    """
+    rest = ''
+    while True:
+        chunk = file.read(chunk_size)
+        buffer = rest + chunk
+        tokens, pos = _scan(buffer, not chunk)
+        yield from tokens
+        if not chunk:
+            return
+        rest = buffer[pos:]
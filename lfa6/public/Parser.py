@@ -1,115 +1,111 @@
-from TokenType import TokenType, enum
 
+from ASTNode import NO_ATTRIBUTES
+from Handlers import TreeBuilder
+from TokenType import TokenType
 
-class ASTNode:
-    def __init__(self, type, children=None, value=None):
-        self.type = type
-        self.value = value
-        self.children = children if children is not None else []
+import metrics
 
-    def __repr__(self):
-        type_name = self.type.name if isinstance(self.type, enum.Enum) else self.type
-        return f"{type_name}({self.value}, {self.children})"
+
+# Open tag types handled by the parser; <html> itself is the implicit root
+OPEN_TAGS = [TokenType.HEAD_OPEN, TokenType.TITLE_OPEN, TokenType.BODY_OPEN, TokenType.H1_OPEN, TokenType.P_OPEN]
+
+CLOSE_TAGS = {
+    TokenType.HTML_CLOSE: TokenType.HTML_OPEN,
+    TokenType.HEAD_CLOSE: TokenType.HEAD_OPEN,
+    TokenType.TITLE_CLOSE: TokenType.TITLE_OPEN,
+    TokenType.BODY_CLOSE: TokenType.BODY_OPEN,
+    TokenType.H1_CLOSE: TokenType.H1_OPEN,
+    TokenType.P_CLOSE: TokenType.P_OPEN,
+}
+
+# Generic tags with these names are the same elements as the dedicated tokens
+KNOWN_TAGS = {open_type.name[:-len('_OPEN')].lower(): open_type for open_type in CLOSE_TAGS.values()}
 
 
 class Parser:
     def __init__(self):
-        self.root = None
-        self.current_node = None
+        self.handler = None
         self.stack = []
+        self.tokens_read = 0  # Tokens read by the last parse
+        self.dispatch = {
+            TokenType.CONTENT: self.handle_content,
+            TokenType.TAG_OPEN: self.handle_tag_open,
+            TokenType.TAG_CLOSE: self.handle_tag_close,
+        }
+        for open_type in OPEN_TAGS:
+            self.dispatch[open_type] = self.handle_open_token
+        for close_type in CLOSE_TAGS:
+            self.dispatch[close_type] = self.handle_close_token
+
+    @metrics.instrumented(tokens=lambda result, self, *args, **kwargs: self.tokens_read)
+    def parse(self, tokens, handler=None):
+        """
+        Feeds the tokens to handler as start_tag, content and end_tag events and
+        returns handler.close(). Without a handler, the ASTNode tree is built
+        and its root returned.
+        """
+        self.handler = handler if handler is not None else TreeBuilder()
+        self.stack = [TokenType.HTML_OPEN]
+
+        count = 0
+        for count, (token_type, value) in enumerate(tokens, 1):
+            self.handle_token(token_type, value)
+        self.tokens_read = count
+
+        return self.handler.close()
 
-    def parse(self, tokens):
-        self.root = ASTNode(TokenType.HTML_OPEN, value="ROOT")
-        self.current_node = self.root
-        self.stack = [self.root]
+    def iter_parse(self, tokens):
+        """
+        Parses a token iterator and yields every element as soon as its close
+        tag is read. Yielded elements are detached from their parent, so only
+        the open elements are kept in memory.
+        """
+        self.handler = TreeBuilder(detach=True)
+        self.stack = [TokenType.HTML_OPEN]
 
         for token_type, value in tokens:
             self.handle_token(token_type, value)
-
-        return self.root
+            if self.handler.closed:
+                closed = self.handler.closed
+                self.handler.closed = []
+                yield from closed
 
     def handle_token(self, token_type, value):
-        if token_type == TokenType.HEAD_OPEN:
-            self.handle_head_open()
-        elif token_type == TokenType.TITLE_OPEN:
-            self.handle_title_open()
-        elif token_type == TokenType.BODY_OPEN:
-            self.handle_body_open()
-        elif token_type == TokenType.H1_OPEN:
-            self.handle_h1_open()
-        elif token_type == TokenType.P_OPEN:
-            self.handle_p_open()
-        elif token_type == TokenType.CONTENT:
-            self.handle_content(value)
-        elif token_type == TokenType.HEAD_CLOSE:
-            self.handle_head_close()
-        elif token_type == TokenType.TITLE_CLOSE:
-            self.handle_title_close()
-        elif token_type == TokenType.BODY_CLOSE:
-            self.handle_body_close()
-        elif token_type == TokenType.H1_CLOSE:
-            self.handle_h1_close()
-        elif token_type == TokenType.P_CLOSE:
-            self.handle_p_close()
-        elif token_type == TokenType.HTML_CLOSE:
-            self.handle_html_close()
-
-    def handle_head_open(self):
-        head_node = ASTNode(TokenType.HEAD_OPEN)
-        self.current_node.children.append(head_node)
-        self.stack.append(head_node)
-        self.current_node = head_node
-
-    def handle_title_open(self):
-        title_node = ASTNode(TokenType.TITLE_OPEN)
-        self.current_node.children.append(title_node)
-        self.stack.append(title_node)
-        self.current_node = title_node
-
-    def handle_body_open(self):
-        body_node = ASTNode(TokenType.BODY_OPEN)
-        self.current_node.children.append(body_node)
-        self.stack.append(body_node)
-        self.current_node = body_node
-
-    def handle_h1_open(self):
-        h1_node = ASTNode(TokenType.H1_OPEN)
-        self.current_node.children.append(h1_node)
-        self.stack.append(h1_node)
-        self.current_node = h1_node
-
-    def handle_p_open(self):
-        p_node = ASTNode(TokenType.P_OPEN)
-        self.current_node.children.append(p_node)
-        self.stack.append(p_node)
-        self.current_node = p_node
-
-    def handle_content(self, content_value):
-        self.current_node.children.append(ASTNode(TokenType.CONTENT, value=content_value))
-
-    def handle_head_close(self):
-        self.handle_close(TokenType.HEAD_OPEN)
-
-    def handle_title_close(self):
-        self.handle_close(TokenType.TITLE_OPEN)
-
-    def handle_body_close(self):
-        self.handle_close(TokenType.BODY_OPEN)
-
-    def handle_h1_close(self):
-        self.handle_close(TokenType.H1_OPEN)
-
-    def handle_p_close(self):
-        self.handle_close(TokenType.P_OPEN)
-
-    def handle_html_close(self):
-        self.handle_close(TokenType.HTML_OPEN)
+        handler = self.dispatch.get(token_type)
+        if handler is not None:
+            handler(token_type, value)
+
+    def handle_open_token(self, token_type, value):
+        self.handle_open(token_type, NO_ATTRIBUTES)
+
+    def handle_close_token(self, token_type, value):
+        self.handle_close(CLOSE_TAGS[token_type])
+
+    def handle_tag_open(self, token_type, tag):
+        name = KNOWN_TAGS.get(tag.name, tag.name)
+        if name is TokenType.HTML_OPEN:
+            return
+        if tag.self_closing:
+            self.handler.start_tag(name, tag.attributes)
+            self.handler.end_tag(name)
+        else:
+            self.handle_open(name, tag.attributes)
+
+    def handle_tag_close(self, token_type, name):
+        self.handle_close(KNOWN_TAGS.get(name, name))
+
+    def handle_content(self, token_type, content_value):
+        self.handler.content(content_value)
+
+    def handle_open(self, tag, attributes):
+        self.stack.append(tag)
+        self.handler.start_tag(tag, attributes)
 
     def handle_close(self, expected_open_token):
-        if self.stack and self.stack[-1].type == expected_open_token:
+        if self.stack and self.stack[-1] == expected_open_token:
             self.stack.pop()
-            if self.stack:
-                self.current_node = self.stack[-1]
+            self.handler.end_tag(expected_open_token)
 
         else:
-            print(f"Error: Mismatched {expected_open_token.name.lower()} close token.")
\ No newline at end of file
+            name = expected_open_token.name.lower() if isinstance(expected_open_token, TokenType) else expected_open_token
+            print(f"Error: Mismatched {name} close token.")
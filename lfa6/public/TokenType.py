@@ -15,6 +15,5 @@ class TokenType(enum.Enum):
     P_OPEN = 11
     P_CLOSE = 12
     CONTENT = 13
-
-    def __eq__(self, value: object) -> bool:
-        return super().__eq__(value)
\ No newline at end of file
+    TAG_OPEN = 14
+    TAG_CLOSE = 15
@@ -0,0 +1,246 @@
+"""Workloads of this lab for the benchmark runner at the root of the repository."""
+import io
+import re
+
+from ASTNode import NO_ATTRIBUTES
+from Handlers import CompactTreeBuilder, ContentHandler, TreeBuilder
+from Lexer import TOKENS, lexer, stream_lexer
+from Parser import Parser
+from TokenType import TokenType
+from traversal import pre_order, write_dot
+
+
+def random_document(size, rng):
+    """Random page of roughly size characters."""
+    words = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'automaton', 'grammar', 'token']
+    parts = ['<html>\n<head>\n<title>Benchmark</title>\n</head>\n<body>\n']
+    length = sum(map(len, parts))
+    while length < size:
+        tag = rng.choice(['h1', 'p', 'p', 'p'])
+        text = ' '.join(rng.choice(words) for _ in range(rng.randint(3, 30)))
+        part = f'<{tag}>{text}</{tag}>\n'
+        parts.append(part)
+        length += len(part)
+    parts.append('</body>\n</html>\n')
+    return ''.join(parts)
+
+
+def known_tag_document(elements, rng):
+    """Body of nested <p> and <h1> elements with short contents."""
+    parts = ['<html><head><title>t</title></head><body>']
+    for _ in range(elements):
+        tag = rng.choice(['p', 'h1'])
+        parts.append(f'<{tag}>x<p>y</p></{tag}>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def generic_tag_document(elements, rng):
+    """Body of nested div, span, a and img elements with attributes."""
+    parts = ['<html><body>']
+    for i in range(elements):
+        parts.append(f'<div class="row r{i % 7}" id="d{i}"><span>x</span><a href="/page/{i}">y</a>'
+                     f'<img src="i{i}.png" alt="">{rng.choice(["<br>", ""])}</div>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def naive_lexer(html):
+    """
+    The original lexer: every pattern is compiled and tried in turn, and the
+    rest of the document is sliced off after each token.
+    """
+    tokens = []
+    while html:
+        html = html.strip()
+        match_found = False
+        for token_type, token_regex in TOKENS:
+            regex = re.compile(token_regex)
+            match = regex.match(html)
+            if match:
+                value = match.group(0).strip()
+                tokens.append((token_type, value))
+                html = html[match.end():]
+                match_found = True
+                break
+        if not match_found:
+            raise SyntaxError(f'Unknown HTML: {html}')
+    return tokens
+
+
+class ChainParser(Parser):
+    """Parser with the former if/elif chain in handle_token."""
+
+    def handle_token(self, token_type, value):
+        if token_type == TokenType.HEAD_OPEN:
+            self.handle_open(TokenType.HEAD_OPEN, NO_ATTRIBUTES)
+        elif token_type == TokenType.TITLE_OPEN:
+            self.handle_open(TokenType.TITLE_OPEN, NO_ATTRIBUTES)
+        elif token_type == TokenType.BODY_OPEN:
+            self.handle_open(TokenType.BODY_OPEN, NO_ATTRIBUTES)
+        elif token_type == TokenType.H1_OPEN:
+            self.handle_open(TokenType.H1_OPEN, NO_ATTRIBUTES)
+        elif token_type == TokenType.P_OPEN:
+            self.handle_open(TokenType.P_OPEN, NO_ATTRIBUTES)
+        elif token_type == TokenType.CONTENT:
+            self.handle_content(token_type, value)
+        elif token_type == TokenType.HEAD_CLOSE:
+            self.handle_close(TokenType.HEAD_OPEN)
+        elif token_type == TokenType.TITLE_CLOSE:
+            self.handle_close(TokenType.TITLE_OPEN)
+        elif token_type == TokenType.BODY_CLOSE:
+            self.handle_close(TokenType.BODY_OPEN)
+        elif token_type == TokenType.H1_CLOSE:
+            self.handle_close(TokenType.H1_OPEN)
+        elif token_type == TokenType.P_CLOSE:
+            self.handle_close(TokenType.P_OPEN)
+        elif token_type == TokenType.HTML_CLOSE:
+            self.handle_close(TokenType.HTML_OPEN)
+
+
+class DictNode:
+    """The former ASTNode, with a __dict__ and an attributes dict per node."""
+
+    def __init__(self, type, children=None, value=None, attributes=None):
+        self.type = type
+        self.value = value
+        self.children = children if children is not None else []
+        self.attributes = attributes if attributes is not None else {}
+
+
+class DictTreeBuilder(TreeBuilder):
+    def __init__(self):
+        super().__init__()
+        self.root = DictNode(TokenType.HTML_OPEN, value="ROOT")
+        self.current_node = self.root
+        self.stack = [self.root]
+
+    def start_tag(self, tag, attributes):
+        node = DictNode(tag, attributes=attributes if attributes else {})
+        self.current_node.children.append(node)
+        self.stack.append(node)
+        self.current_node = node
+
+    def content(self, value):
+        self.current_node.children.append(DictNode(TokenType.CONTENT, value=value))
+
+
+def lex(rng):
+    html = random_document(1 << 20, rng)
+
+    def run():
+        return {'characters': len(html), 'tokens': len(lexer(html))}
+
+    return run
+
+
+def lex_naive(rng):
+    # Smaller: slicing the rest of the document after each token is quadratic
+    html = random_document(1 << 18, rng)
+
+    def run():
+        return {'characters': len(html), 'tokens': len(naive_lexer(html))}
+
+    return run
+
+
+def stream_lex(rng):
+    html = random_document(1 << 20, rng)
+
+    def run():
+        tokens = sum(1 for _ in stream_lexer(io.StringIO(html)))
+        return {'characters': len(html), 'tokens': tokens}
+
+    return run
+
+
+def parse(rng):
+    tokens = lexer(random_document(1 << 20, rng))
+
+    def run():
+        Parser().parse(tokens)
+        return {'tokens': len(tokens)}
+
+    return run
+
+
+def parse_document(streamed):
+    """
+    A 2 MB document read whole, lexed and parsed into a tree, or streamed
+    through iter_parse; compare their memory with --memory.
+    """
+    def workload(rng):
+        html = random_document(2 << 20, rng)
+
+        def run():
+            file = io.StringIO(html)
+            if streamed:
+                return {'characters': len(html), 'elements': sum(1 for _ in Parser().iter_parse(stream_lexer(file)))}
+            return {'characters': len(html), 'nodes': sum(1 for _ in pre_order(Parser().parse(lexer(file.read()))))}
+
+        return run
+
+    return workload
+
+
+def dispatch(parser_class):
+    """Token dispatch alone: known tags only and no tree."""
+    def workload(rng):
+        tokens = lexer(known_tag_document(50000, rng))
+
+        def run():
+            parser_class().parse(tokens, ContentHandler())
+            return {'tokens': len(tokens)}
+
+        return run
+
+    return workload
+
+
+def build_tree(handler_class):
+    """Trees of generic tags with attributes; compare their memory with --memory."""
+    def workload(rng):
+        tokens = lexer(generic_tag_document(20000, rng))
+
+        def run():
+            Parser().parse(tokens, handler_class())
+            return {'tokens': len(tokens)}
+
+        return run
+
+    return workload
+
+
+def export(shape):
+    def workload(rng):
+        if shape == 'wide':
+            ast = Parser().parse(lexer(generic_tag_document(20000, rng)))
+        else:
+            depth = 100000
+            ast = Parser().parse(lexer('<html>' + '<div>' * depth + 'leaf' + '</div>' * depth + '</html>'))
+
+        def run():
+            file = io.StringIO()
+            write_dot(ast, file)
+            return {'nodes': sum(1 for _ in pre_order(ast)), 'characters': len(file.getvalue())}
+
+        return run
+
+    return workload
+
+
+WORKLOADS = {
+    'lex': lex,
+    'lex_naive': lex_naive,
+    'stream_lex': stream_lex,
+    'parse': parse,
+    'parse_whole': parse_document(False),
+    'parse_streamed': parse_document(True),
+    'dispatch': dispatch(Parser),
+    'dispatch_chain': dispatch(ChainParser),
+    'tree': build_tree(TreeBuilder),
+    'tree_dict_nodes': build_tree(DictTreeBuilder),
+    'tree_compact': build_tree(CompactTreeBuilder),
+    'write_dot_wide': export('wide'),
+    'write_dot_deep': export('deep'),
+}
@@ -1,43 +1,8 @@
-import re
 from graphviz import Digraph
+from ASTNode import type_name
+from Lexer import lexer
 from Parser import Parser
-from TokenType import TokenType
-
-TOKENS = [
-    (TokenType.HTML_OPEN, r'<html>'),
-    (TokenType.HTML_CLOSE, r'</html>'),
-    (TokenType.HEAD_OPEN, r'<head>'),
-    (TokenType.HEAD_CLOSE, r'</head>'),
-    (TokenType.TITLE_OPEN, r'<title>'),
-    (TokenType.TITLE_CLOSE, r'</title>'),
-    (TokenType.BODY_OPEN, r'<body>'),
-    (TokenType.BODY_CLOSE, r'</body>'),
-    (TokenType.H1_OPEN, r'<h1>'),
-    (TokenType.H1_CLOSE, r'</h1>'),
-    (TokenType.P_OPEN, r'<p>'),
-    (TokenType.P_CLOSE, r'</p>'),
-    (TokenType.CONTENT, r'[^<]*'),  # Match any content not containing '<' or '>'
-]
-
-
-def lexer(html):
-    tokens = []
-    while html:
-        html = html.strip()
-        match_found = False
-        for token_type, token_regex in TOKENS:
-            regex = re.compile(token_regex)
-            match = regex.match(html)
-            if match:
-                value = match.group(0).strip()
-                tokens.append((token_type, value))
-                html = html[match.end():]
-                match_found = True
-                break
-        if not match_found:
-            raise SyntaxError(f'Unknown HTML: {html}')
-    return tokens
-
+from traversal import pre_order
 
 html_code = """
 <html>
@@ -62,10 +27,10 @@ print(ast)
 def visualize_ast(node, graph=None):
     if graph is None:
         graph = Digraph()
-    graph.node(str(id(node)), label=f"{node.type.name}\n{node.value}")
-    for child in node.children:
-        graph.edge(str(id(node)), str(id(child)))
-        visualize_ast(child, graph)
+    for current in pre_order(node):
+        graph.node(str(id(current)), label=f"{type_name(current.type)}\n{current.value}")
+        for child in current.children:
+            graph.edge(str(id(current)), str(id(child)))
     return graph
 
 
@@ -0,0 +1,43 @@
+import unittest
+
+from Handlers import CompactTreeBuilder
+from Lexer import lexer
+from Parser import Parser
+from TokenType import TokenType
+
+
+class TestCompactTree(unittest.TestCase):
+    def setUp(self):
+        self.html = ('<html><head><title>Sample Page</title></head><body><h1>Welcome</h1>'
+                     '<div class="card"><p>one</p><br><p>two</p></div></body></html>')
+        self.ast = Parser().parse(lexer(self.html))
+        self.tree = Parser().parse(lexer(self.html), CompactTreeBuilder())
+
+    def test_repr(self):
+        self.assertEqual(repr(self.tree), repr(self.ast))
+        self.assertEqual(repr(self.tree.to_ast()), repr(self.ast))
+
+    def test_navigation(self):
+        self.assertEqual(len(self.tree), 13)
+        head, body = self.tree.children(0)
+        self.assertEqual(self.tree.type(body), TokenType.BODY_OPEN)
+        self.assertEqual(self.tree.parent(body), 0)
+        h1, div = self.tree.children(body)
+        self.assertEqual(self.tree.type(div), 'div')
+        self.assertEqual(self.tree.attributes(div), {'class': 'card'})
+        self.assertEqual(self.tree.attributes(h1), {})
+        self.assertEqual([self.tree.type(child) for child in self.tree.children(div)], [TokenType.P_OPEN, 'br', TokenType.P_OPEN])
+
+    def test_iteration(self):
+        contents = [self.tree.value(node) for node in self.tree if self.tree.type(node) is TokenType.CONTENT]
+        self.assertEqual(contents, ['Sample Page', 'Welcome', 'one', 'two'])
+
+    def test_view(self):
+        view = self.tree.view()
+        self.assertEqual(view.value, 'ROOT')
+        self.assertEqual(view.children[1].children[1].attributes, {'class': 'card'})
+        self.assertEqual(repr(view.children[0]), repr(self.ast.children[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
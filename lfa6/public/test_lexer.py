@@ -0,0 +1,85 @@
+import io
+import unittest
+
+from Lexer import Tag, lexer, stream_lexer
+from TokenType import TokenType
+
+
+class TestLexer(unittest.TestCase):
+    def setUp(self):
+        self.html = """
+<html>
+<head>
+<title>Sample Page</title>
+</head>
+<body>
+<h1>Welcome</h1>
+<p>This is a sample page.</p>
+</body>
+</html>
+"""
+
+    def test_tokens(self):
+        self.assertEqual(lexer(self.html), [
+            (TokenType.HTML_OPEN, '<html>'),
+            (TokenType.HEAD_OPEN, '<head>'),
+            (TokenType.TITLE_OPEN, '<title>'),
+            (TokenType.CONTENT, 'Sample Page'),
+            (TokenType.TITLE_CLOSE, '</title>'),
+            (TokenType.HEAD_CLOSE, '</head>'),
+            (TokenType.BODY_OPEN, '<body>'),
+            (TokenType.H1_OPEN, '<h1>'),
+            (TokenType.CONTENT, 'Welcome'),
+            (TokenType.H1_CLOSE, '</h1>'),
+            (TokenType.P_OPEN, '<p>'),
+            (TokenType.CONTENT, 'This is a sample page.'),
+            (TokenType.P_CLOSE, '</p>'),
+            (TokenType.BODY_CLOSE, '</body>'),
+            (TokenType.HTML_CLOSE, '</html>'),
+        ])
+
+    def test_content_is_stripped(self):
+        self.assertEqual(lexer('  <p>\n  two  words \n</p>  '), [
+            (TokenType.P_OPEN, '<p>'),
+            (TokenType.CONTENT, 'two  words'),
+            (TokenType.P_CLOSE, '</p>'),
+        ])
+        self.assertEqual(lexer(' \n '), [])
+
+    def test_generic_tags(self):
+        self.assertEqual(lexer('<DIV class="a b" hidden data-x=\'1>2\'><br><img src=x.png /></div>'), [
+            (TokenType.TAG_OPEN, Tag('div', {'class': 'a b', 'hidden': '', 'data-x': '1>2'}, False)),
+            (TokenType.TAG_OPEN, Tag('br', {}, True)),
+            (TokenType.TAG_OPEN, Tag('img', {'src': 'x.png'}, True)),
+            (TokenType.TAG_CLOSE, 'div'),
+        ])
+        self.assertEqual(lexer('<p class="x">')[0], (TokenType.TAG_OPEN, Tag('p', {'class': 'x'}, False)))
+
+    def test_unknown_tag(self):
+        with self.assertRaises(SyntaxError):
+            lexer('<html><!-- comment --></html>')
+
+    def test_stream_lexer(self):
+        expected = lexer(self.html)
+        for chunk_size in range(1, 20):
+            self.assertEqual(list(stream_lexer(io.StringIO(self.html), chunk_size)), expected)
+
+        html = '<div id="a>b"><span>x</span></div>'
+        for chunk_size in range(1, 10):
+            self.assertEqual(list(stream_lexer(io.StringIO(html), chunk_size)), lexer(html))
+
+    def test_stream_lexer_quoted_less_than(self):
+        html = '<html><a title="x<y">link</a><b data-x=\'<\'>bold</b></html>'
+        expected = lexer(html)
+        for chunk_size in range(1, len(html) + 1):
+            self.assertEqual(list(stream_lexer(io.StringIO(html), chunk_size)), expected, chunk_size)
+
+    def test_stream_lexer_unknown_tag(self):
+        with self.assertRaises(SyntaxError):
+            list(stream_lexer(io.StringIO('<html><!-- comment --></html>'), 3))
+        with self.assertRaises(SyntaxError):
+            list(stream_lexer(io.StringIO('<html><p'), 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+import Lexer
+from Lexer import metrics
+from Parser import Parser
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        metrics.enable()
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.reset()
+
+    def test_lexer_and_parser(self):
+        html = '<html><body><p>one</p><p>two</p></body></html>'
+        # Looked up on the module: the wrapper is only put there by enable()
+        tokens = Lexer.lexer(html)
+        Parser().parse(tokens)
+        Parser().parse(iter(tokens))
+        registry = metrics.snapshot()
+        self.assertEqual(registry['lexer']['tokens'], len(tokens))
+        self.assertEqual(registry['lexer']['characters'], len(html))
+        self.assertEqual(registry['Parser.parse']['calls'], 2)
+        self.assertEqual(registry['Parser.parse']['tokens'], 2 * len(tokens))
+
+    def test_enable_swaps_wrappers(self):
+        metrics.disable()
+        lexer, parse = Lexer.lexer, Parser.parse
+        self.assertFalse(hasattr(lexer, '__wrapped__'))
+        self.assertFalse(hasattr(parse, '__wrapped__'))
+        metrics.enable()
+        self.assertIs(Lexer.lexer.__wrapped__, lexer)
+        self.assertIs(Parser.parse.__wrapped__, parse)
+
+
+if __name__ == '__main__':
+    unittest.main()
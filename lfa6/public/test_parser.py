@@ -0,0 +1,114 @@
+import io
+import unittest
+
+from ASTNode import NO_CHILDREN
+from Handlers import ContentHandler, SelectiveBuilder
+from Lexer import lexer, stream_lexer
+from Parser import Parser
+from TokenType import TokenType
+
+
+class TestParser(unittest.TestCase):
+    def setUp(self):
+        self.html = """
+<html>
+<head>
+<title>Sample Page</title>
+</head>
+<body>
+<h1>Welcome</h1>
+<p>This is a sample page.</p>
+</body>
+</html>
+"""
+
+    def test_parse(self):
+        ast = Parser().parse(lexer(self.html))
+        self.assertEqual(repr(ast), "HTML_OPEN(ROOT, [HEAD_OPEN(None, [TITLE_OPEN(None, [CONTENT(Sample Page, [])])]), "
+                                    "BODY_OPEN(None, [H1_OPEN(None, [CONTENT(Welcome, [])]), "
+                                    "P_OPEN(None, [CONTENT(This is a sample page., [])])])])")
+
+    def test_parse_stream(self):
+        ast = Parser().parse(stream_lexer(io.StringIO(self.html), 7))
+        self.assertEqual(repr(ast), repr(Parser().parse(lexer(self.html))))
+
+    def test_iter_parse(self):
+        parser = Parser()
+        closed = list(parser.iter_parse(stream_lexer(io.StringIO(self.html), 7)))
+        self.assertEqual([node.type for node in closed], [
+            TokenType.TITLE_OPEN, TokenType.HEAD_OPEN, TokenType.H1_OPEN, TokenType.P_OPEN,
+            TokenType.BODY_OPEN, TokenType.HTML_OPEN
+        ])
+        self.assertEqual(repr(closed[0]), 'TITLE_OPEN(None, [CONTENT(Sample Page, [])])')
+        self.assertEqual(parser.handler.root.children, [])
+
+    def test_events(self):
+        class Recorder(ContentHandler):
+            def __init__(self):
+                self.events = []
+
+            def start_tag(self, tag, attributes):
+                self.events.append(('start', tag.name))
+
+            def end_tag(self, tag):
+                self.events.append(('end', tag.name))
+
+            def content(self, value):
+                self.events.append(('content', value))
+
+            def close(self):
+                return self.events
+
+        events = Parser().parse(lexer('<html><p>a</p><h1>b</h1></html>'), Recorder())
+        self.assertEqual(events, [
+            ('start', 'P_OPEN'), ('content', 'a'), ('end', 'P_OPEN'),
+            ('start', 'H1_OPEN'), ('content', 'b'), ('end', 'H1_OPEN'),
+            ('end', 'HTML_OPEN'),
+        ])
+
+    def test_mismatched_close_has_no_event(self):
+        class Ends(ContentHandler):
+            def __init__(self):
+                self.ends = []
+
+            def end_tag(self, tag):
+                self.ends.append(tag)
+
+        handler = Ends()
+        Parser().parse(lexer('<html><p>a</h1></p></html>'), handler)
+        self.assertEqual(handler.ends, [TokenType.P_OPEN, TokenType.HTML_OPEN])
+
+    def test_selective(self):
+        html = '<html><body><p>one</p><h1>title<p>two</p></h1><p>three</p></body></html>'
+        subtrees = Parser().parse(lexer(html), SelectiveBuilder([TokenType.H1_OPEN]))
+        self.assertEqual(repr(subtrees), '[H1_OPEN(None, [CONTENT(title, []), P_OPEN(None, [CONTENT(two, [])])])]')
+
+        subtrees = Parser().parse(lexer(html), SelectiveBuilder([TokenType.P_OPEN]))
+        self.assertEqual([node.children[0].value for node in subtrees], ['one', 'two', 'three'])
+
+    def test_generic_tags(self):
+        html = '<html lang="en"><body><div class="card"><a href="/x">link</a><br>text</div><p id="last">end</p></body></html>'
+        ast = Parser().parse(lexer(html))
+        self.assertEqual(repr(ast), "HTML_OPEN(ROOT, [BODY_OPEN(None, [div(None, [a(None, [CONTENT(link, [])]), "
+                                    "br(None, []), CONTENT(text, [])]), P_OPEN(None, [CONTENT(end, [])])])])")
+        body = ast.children[0]
+        self.assertEqual(body.children[0].attributes, {'class': 'card'})
+        self.assertEqual(body.children[0].children[0].attributes, {'href': '/x'})
+        self.assertEqual(body.children[1].attributes, {'id': 'last'})
+
+    def test_content_leaves_share_children(self):
+        ast = Parser().parse(lexer(self.html))
+        title = ast.children[0].children[0]
+        paragraph = ast.children[1].children[1]
+        self.assertIs(title.children[0].children, NO_CHILDREN)
+        self.assertIs(paragraph.children[0].children, NO_CHILDREN)
+        self.assertEqual(title.children, [title.children[0]])
+
+    def test_selective_generic(self):
+        html = '<html><div><span>a</span><p><span>b</span></p></div></html>'
+        subtrees = Parser().parse(lexer(html), SelectiveBuilder(['span']))
+        self.assertEqual(repr(subtrees), '[span(None, [CONTENT(a, [])]), span(None, [CONTENT(b, [])])]')
+
+
+if __name__ == '__main__':
+    unittest.main()
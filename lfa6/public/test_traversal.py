@@ -0,0 +1,53 @@
+import io
+import unittest
+
+from Handlers import CompactTreeBuilder
+from Lexer import lexer
+from Parser import Parser
+from traversal import post_order, pre_order, write_dot
+
+
+class TestTraversal(unittest.TestCase):
+    def setUp(self):
+        self.ast = Parser().parse(lexer('<html><h1>Welcome</h1><p>a "quoted" word</p></html>'))
+
+    def test_orders(self):
+        self.assertEqual([node.value or node.type.name for node in pre_order(self.ast)],
+                         ['ROOT', 'H1_OPEN', 'Welcome', 'P_OPEN', 'a "quoted" word'])
+        self.assertEqual([node.value or node.type.name for node in post_order(self.ast)],
+                         ['Welcome', 'H1_OPEN', 'a "quoted" word', 'P_OPEN', 'ROOT'])
+
+    def test_write_dot(self):
+        file = io.StringIO()
+        write_dot(self.ast, file)
+        self.assertEqual(file.getvalue(), 'digraph {\n'
+                                          '\t0 [label="HTML_OPEN\\nROOT"]\n'
+                                          '\t1 [label="H1_OPEN\\nNone"]\n'
+                                          '\t0 -> 1\n'
+                                          '\t2 [label="CONTENT\\nWelcome"]\n'
+                                          '\t1 -> 2\n'
+                                          '\t3 [label="P_OPEN\\nNone"]\n'
+                                          '\t0 -> 3\n'
+                                          '\t4 [label="CONTENT\\na \\"quoted\\" word"]\n'
+                                          '\t3 -> 4\n'
+                                          '}\n')
+
+    def test_deep_tree(self):
+        depth = 20000
+        html = '<html>' + '<div>' * depth + 'leaf' + '</div>' * depth + '</html>'
+        ast = Parser().parse(lexer(html))
+
+        self.assertEqual(sum(1 for _ in pre_order(ast)), depth + 2)
+        self.assertEqual(next(post_order(ast)).value, 'leaf')
+        text = repr(ast)
+        self.assertTrue(text.startswith('HTML_OPEN(ROOT, [div(None, [div(None, '))
+        self.assertTrue(text.endswith('CONTENT(leaf, [])' + '])' * (depth + 1)))
+        self.assertEqual(repr(Parser().parse(lexer(html), CompactTreeBuilder())), text)
+
+        file = io.StringIO()
+        write_dot(ast, file)
+        self.assertEqual(file.getvalue().count('->'), depth + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
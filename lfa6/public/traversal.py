@@ -0,0 +1,53 @@
+from ASTNode import type_name
+
+# Lines collected by write_dot before each write to the file
+DOT_BATCH = 4096
+
+
+def pre_order(node):
+    """Nodes of the tree at node, each before its children."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(current.children))
+
+
+def post_order(node):
+    """Nodes of the tree at node, each after its children."""
+    stack = [(node, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if expanded:
+            yield current
+        else:
+            stack.append((current, True))
+            stack.extend((child, False) for child in reversed(current.children))
+
+
+def _dot_label(node):
+    label = f"{type_name(node.type)}\n{node.value}"
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_dot(node, file):
+    """
+    Writes the tree at node to a text file in Graphviz DOT format, one line per
+    node and per edge, numbering the nodes in pre-order.
+    """
+    lines = ["digraph {\n"]
+    count = 0
+    stack = [(node, None)]
+    while stack:
+        current, parent = stack.pop()
+        lines.append(f'\t{count} [label="{_dot_label(current)}"]\n')
+        if parent is not None:
+            lines.append(f"\t{parent} -> {count}\n")
+        for child in reversed(current.children):
+            stack.append((child, count))
+        count += 1
+        if len(lines) >= DOT_BATCH:
+            file.writelines(lines)
+            lines.clear()
+    lines.append("}\n")
+    file.writelines(lines)
@@ -0,0 +1,110 @@
+"""
+Opt-in instrumentation of the main entry points of every lab, which all
+record into the registry of this module. While disabled, an instrumented
+function is the undecorated function itself and costs nothing: enable()
+puts the recording wrappers in place of the functions on their modules and
+classes, and disable() puts the functions back. A reference taken from a
+module before enable() (from Lexer import lexer) keeps the function it got,
+so code that is measured from the start enables metrics before importing.
+
+Enable it with metrics.enable(), or by setting LFA_METRICS to a file name:
+the registry is then written there as JSON when the program exits.
+
+The labs import this module by bare name. pyproject.toml puts the root of
+the repository on the path of the tests and bench.py runs from it; a lab
+script run on its own needs it on PYTHONPATH.
+"""
+import atexit
+import json
+import os
+import sys
+import time
+from functools import wraps
+
+enabled = False
+
+# {name: {'calls': int, 'seconds': float, measure: amount, ...}}
+registry = {}
+
+# (undecorated function, recording wrapper) of every instrumented function
+_instrumented = []
+
+
+def enable():
+    global enabled
+    enabled = True
+    _install(True)
+
+
+def disable():
+    global enabled
+    enabled = False
+    _install(False)
+
+
+def _install(instrument):
+    """Binds the wrapper or the undecorated function of every instrumented function where it was defined."""
+    for function, wrapper in _instrumented:
+        owner = sys.modules.get(function.__module__)
+        for name in function.__qualname__.split('.')[:-1]:
+            owner = getattr(owner, name, None)
+        current = getattr(owner, '__dict__', {}).get(function.__name__)
+        if current is function or current is wrapper:
+            setattr(owner, function.__name__, wrapper if instrument else function)
+
+
+def reset():
+    registry.clear()
+
+
+def record(name, seconds, amounts=()):
+    entry = registry.get(name)
+    if entry is None:
+        entry = registry[name] = {'calls': 0, 'seconds': 0.0}
+    entry['calls'] += 1
+    entry['seconds'] += seconds
+    for measure, amount in amounts:
+        entry[measure] = entry.get(measure, 0) + amount
+
+
+def instrumented(name=None, **measures):
+    """
+    Decorator recording the calls and time of a function under name (its
+    qualified name by default). Each measure is a function of the result and
+    the arguments of a call, whose value is added up under its keyword. The
+    function is returned as is while metrics are disabled.
+    """
+    def decorator(function):
+        key = name or function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = function(*args, **kwargs)
+            seconds = time.perf_counter() - started
+            record(key, seconds, [(measure, amount(result, *args, **kwargs)) for measure, amount in measures.items()])
+            return result
+
+        _instrumented.append((function, wrapper))
+        return wrapper if enabled else function
+
+    return decorator
+
+
+def snapshot():
+    """Copy of the registry."""
+    return {name: dict(entry) for name, entry in registry.items()}
+
+
+def dump(file):
+    json.dump(registry, file, indent=2, sort_keys=True)
+
+
+def _dump_at_exit(path):
+    with open(path, 'w') as file:
+        dump(file)
+
+
+if os.environ.get('LFA_METRICS'):
+    enable()
+    atexit.register(_dump_at_exit, os.environ['LFA_METRICS'])